@@ -0,0 +1,253 @@
+# ============================================================
+#  Slimey - PRE-SCALED ASSET CACHE
+# ------------------------------------------------------------
+# Cold start used to decode every PNG and rescale it to the
+# current resolution. This cache stores the already-scaled
+# pixels as raw RGBA files under config.ASSET_CACHE_DIR:
+#
+#   <sha1(source sha1, scale, size, mode, variant)>.px
+#     = "SLPX" + width + height (little-endian u32)
+#       + format class (u8, asset_manager.FORMAT_CLASSES)
+#       + storage mode (u8, asset_manager.STORAGE_MODES)
+#       + payload: RGBA bytes ("full"/"half"), or a 256-entry RGB
+#         palette + colorkey index (i16, -1 = none) + one byte per
+#         pixel ("palette"), or nothing ("empty")
+#
+# A hit is one file read plus pygame.image.frombuffer; no PNG
+# decode, no transform. Keys are content addressed, so a
+# changed PNG or a new resolution simply misses and writes a
+# fresh entry. index.json remembers each source's sha1 by
+# (mtime, size) so unchanged files are not re-hashed every
+# launch. Old entries are pruned oldest-first once the cache
+# grows past config.ASSET_CACHE_MAX_MB.
+# ============================================================
+
+import os
+import json
+import struct
+import hashlib
+import threading
+
+import pygame
+
+import config
+from asset_pack import asset_digest
+
+
+_MAGIC = b"SLPX"
+_HEADER = struct.Struct("<4sIIBB")
+_PALETTE = struct.Struct("<768sh")
+
+# Format classes by header code (mirrors asset_manager.FORMAT_CLASSES)
+_FORMATS = ("opaque", "colorkey", "alpha")
+# Storage modes by header code (mirrors asset_manager.STORAGE_MODES)
+_STORAGES = ("full", "palette", "half", "empty")
+_INDEX_FILE = "index.json"
+
+
+class AssetCache:
+    """
+    Content-addressed store of scaled RGBA pixels. Thread-safe: the
+    asset loader threads call get()/put() concurrently.
+    """
+
+    def __init__(self, root=None, max_bytes=None):
+        self.root = root or config.ASSET_CACHE_DIR
+        if max_bytes is None:
+            max_bytes = int(config.ASSET_CACHE_MAX_MB * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index = {}
+        self._index_dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.total_bytes = 0
+
+        try:
+            os.makedirs(self.root, exist_ok=True)
+        except OSError as e:
+            print(f"[asset_cache] Disabled, cannot create {self.root}: {e}")
+            self.root = None
+            return
+
+        try:
+            with open(os.path.join(self.root, _INDEX_FILE), "r", encoding="utf-8") as f:
+                self._index = json.load(f)
+        except (OSError, ValueError):
+            self._index = {}
+
+        self.total_bytes = sum(size for _, size, _ in self._entries())
+
+    # --------------------------------------------------------
+    # Keys
+    # --------------------------------------------------------
+    def source_hash(self, path):
+        """
+        sha1 of a source file: from the asset pack index when packed,
+        else hashed and reused while its mtime and size match.
+        """
+        digest = asset_digest(path)
+        if digest is not None:
+            return digest
+
+        st = os.stat(path)
+        stamp = [st.st_mtime_ns, st.st_size]
+        with self._lock:
+            entry = self._index.get(path)
+        if entry and entry[:2] == stamp:
+            return entry[2]
+
+        with open(path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        with self._lock:
+            self._index[path] = stamp + [digest]
+            self._index_dirty = True
+        return digest
+
+    def key(self, path, scale, size, smooth, variant=""):
+        mode = "smooth" if smooth else "scale"
+        raw = f"{self.source_hash(path)}|{scale}|{tuple(size) if size else None}|{mode}|{variant}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.root, key + ".px")
+
+    # --------------------------------------------------------
+    # Get / put
+    # --------------------------------------------------------
+    def get(self, key):
+        """
+        (surface, format class, storage mode) for `key`, or None.
+        The surface is 32-bit RGBA and not yet converted, except for
+        "palette" entries (8-bit, palette and colorkey restored) and
+        "empty" entries (None).
+        """
+        if self.root is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        if len(data) < _HEADER.size:
+            return None
+        magic, w, h, fmt, storage = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC or fmt >= len(_FORMATS) or storage >= len(_STORAGES):
+            return None
+        storage = _STORAGES[storage]
+        if storage == "empty":
+            expected = 0
+        elif storage == "palette":
+            expected = _PALETTE.size + w * h
+        else:
+            expected = w * h * 4
+        if len(data) != _HEADER.size + expected:
+            return None
+
+        try:
+            # Mark as recently used for pruning
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        if storage == "empty":
+            return None, _FORMATS[fmt], storage
+        pixels = memoryview(data)[_HEADER.size:]
+        if storage != "palette":
+            return pygame.image.frombuffer(pixels, (w, h), "RGBA"), _FORMATS[fmt], storage
+
+        palette, colorkey = _PALETTE.unpack_from(pixels, 0)
+        # Copy out of the file buffer: the surface outlives `data`
+        img = pygame.image.frombuffer(bytes(pixels[_PALETTE.size:]), (w, h), "P")
+        img.set_palette([palette[i:i + 3] for i in range(0, 768, 3)])
+        if colorkey >= 0:
+            img.set_colorkey(colorkey, pygame.RLEACCEL)
+        return img, _FORMATS[fmt], storage
+
+    def put(self, key, surface, fmt, storage="full"):
+        """Store a scaled surface's pixels, format class and storage mode under `key`."""
+        if self.root is None:
+            return
+        if storage == "empty":
+            w = h = 0
+            payload = b""
+        elif storage == "palette":
+            w, h = surface.get_size()
+            palette = bytes(c for color in surface.get_palette() for c in color[:3])
+            # asset_manager.palettize() always puts the colorkey at index 0
+            index = 0 if surface.get_colorkey() is not None else -1
+            payload = _PALETTE.pack(palette.ljust(768, b"\0"), index) + pygame.image.tobytes(surface, "P")
+        else:
+            w, h = surface.get_size()
+            payload = pygame.image.tobytes(surface, "RGBA")
+        data = _HEADER.pack(_MAGIC, w, h, _FORMATS.index(fmt), _STORAGES.index(storage)) + payload
+        path = self._path(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[asset_cache] Write failed for {path}: {e}")
+            return
+        with self._lock:
+            self.total_bytes += len(data)
+
+    # --------------------------------------------------------
+    # Maintenance
+    # --------------------------------------------------------
+    def _entries(self):
+        """[(mtime, size, path), ...] for every cached pixel file."""
+        out = []
+        try:
+            for entry in os.scandir(self.root):
+                if entry.name.endswith(".px"):
+                    st = entry.stat()
+                    out.append((st.st_mtime, st.st_size, entry.path))
+        except OSError:
+            pass
+        return out
+
+    def flush(self):
+        """Write the hash index and prune past the size cap (main thread)."""
+        if self.root is None:
+            return
+        with self._lock:
+            index = dict(self._index) if self._index_dirty else None
+            self._index_dirty = False
+        if index is not None:
+            try:
+                with open(os.path.join(self.root, _INDEX_FILE), "w", encoding="utf-8") as f:
+                    json.dump(index, f)
+            except OSError as e:
+                print(f"[asset_cache] Could not write index: {e}")
+
+        if self.total_bytes > self.max_bytes:
+            self.prune()
+
+    def prune(self):
+        """Delete least recently used entries until under 90% of the cap."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        with self._lock:
+            self.total_bytes = total
+
+    def telemetry(self):
+        return (
+            f"disk cache {self.total_bytes / (1024 * 1024):6.1f} MB  "
+            f"hits {self.hits}  misses {self.misses}"
+        )
@@ -0,0 +1,750 @@
+# ============================================================
+#  Slimey - ASSET MANAGER
+# ------------------------------------------------------------
+# Background sets are the heavy assets (three full-screen
+# SRCALPHA layers each), so they are no longer loaded up front
+# for every world in WORLD_PACKS:
+#  - a world's sets load the first time a level in that world
+#    needs them; worlds without their own art derive theirs from
+#    the global sets in assets/backgrounds and their WORLD_PACKS
+#    "tint" (blended in by the loader and kept in the disk cache),
+#    or share the global sets untinted when they have no tint
+#  - loaded sets sit in an LRU bounded by
+#    config.ASSET_MEMORY_BUDGET_MB; the least recently drawn
+#    sets are dropped first, the set on screen never is
+#  - every resident surface is accounted in asset_memory.py;
+#    memory_report() gives resident bytes per asset group
+#
+# Decoding and scaling run on a thread pool (pygame releases
+# the GIL in image.load and transform.scale). Only
+# convert_alpha(), which needs the display, runs on the main
+# thread: pump() finishes a few layers per frame so a world
+# prefetched in the background installs without a hitch.
+# With config.ASSET_CACHE_ENABLED, workers read already-scaled
+# pixels from the on-disk cache (asset_cache.py) instead.
+#
+# Each image is classified once (in the worker) and finished in
+# the cheapest blit format that looks the same:
+#  - opaque   -> convert()                   (no blending)
+#  - colorkey -> convert() + colorkey + RLEACCEL (1-bit alpha)
+#  - alpha    -> convert_alpha()             (real translucency)
+# The class is stored with the cached pixels.
+#
+# With "compact" background storage (config.BACKGROUND_STORAGE,
+# or BACKGROUND_STORAGE_BY_TIER on a low-memory device), far layers
+# (and mid ones with BACKGROUND_COMPACT_MID) are stored in the
+# smallest form whose error against the full layer stays under
+# BACKGROUND_COMPACT_MAX_ERROR: dropped when fully transparent,
+# 8-bit palettized, or half resolution (upscaled into a shared
+# scratch surface when drawn, see expand_layer(); the upscale is
+# redone only when a different layer needs the scratch).
+#
+# Eager assets (skins, sprites, FX) are accounted too, so the
+# report covers everything the loader keeps resident.
+#
+# When a sprite atlas is built for the current scale tier
+# (tools/build_atlas.py, see atlas.py), image() serves skins,
+# sprites and enemies as views into its page and skips the
+# decode entirely.
+# ============================================================
+
+import os
+import weakref
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import config
+from asset_cache import AssetCache
+from asset_pack import get_pack, asset_exists, asset_isdir, load_image_file
+from asset_memory import registry, surface_bytes, device_tier
+from atlas import load_atlas
+
+
+# ------------------------------------------------------------
+#  Worker-side decode (no display access)
+# ------------------------------------------------------------
+def decode_scaled(path, scale=1.0, size=None, smooth=False):
+    """
+    Decode an image and scale it by `scale` or to `size`.
+    Safe to call from a worker thread: the result is not converted
+    to the display format yet (see finish_surface).
+    """
+    img = load_image_file(path)
+    if img.get_bitsize() != 32 or smooth:
+        # smoothscale needs 32-bit pixels; palette PNGs get expanded here
+        full = pygame.Surface(img.get_size(), pygame.SRCALPHA, 32)
+        full.blit(img, (0, 0))
+        img = full
+
+    if size is None and scale != 1.0:
+        size = (max(1, int(img.get_width() * scale)), max(1, int(img.get_height() * scale)))
+    if size is not None and tuple(size) != img.get_size():
+        if smooth:
+            img = pygame.transform.smoothscale(img, size)
+        else:
+            img = pygame.transform.scale(img, size)
+    return img
+
+
+FORMAT_OPAQUE = "opaque"
+FORMAT_COLORKEY = "colorkey"
+FORMAT_ALPHA = "alpha"
+FORMAT_CLASSES = (FORMAT_OPAQUE, FORMAT_COLORKEY, FORMAT_ALPHA)
+
+# Key colour for 1-bit alpha sprites (only used if no visible pixel has it)
+COLORKEY = (255, 0, 255)
+
+
+def classify_surface(img):
+    """
+    Pick the cheapest format that keeps `img` looking the same, using two
+    alpha masks: alpha == 255 everywhere -> opaque; every pixel either
+    fully transparent or fully solid -> colorkey; otherwise alpha.
+    """
+    w, h = img.get_size()
+    solid = pygame.mask.from_surface(img, 254).count()
+    if solid == w * h:
+        return FORMAT_OPAQUE
+    visible = pygame.mask.from_surface(img, 0).count()
+    if visible == solid:
+        clash = pygame.mask.from_threshold(img, COLORKEY + (255,), (1, 1, 1, 1)).count()
+        if clash == 0:
+            return FORMAT_COLORKEY
+    return FORMAT_ALPHA
+
+
+def finish_surface(img, fmt=FORMAT_ALPHA):
+    """Main-thread half of a load: convert to the display pixel format."""
+    if fmt == FORMAT_OPAQUE:
+        return img.convert()
+    if fmt == FORMAT_COLORKEY:
+        out = pygame.Surface(img.get_size()).convert()
+        out.fill(COLORKEY)
+        out.blit(img, (0, 0))
+        out.set_colorkey(COLORKEY, pygame.RLEACCEL)
+        return out
+    return img.convert_alpha()
+
+
+# ------------------------------------------------------------
+#  Compact background layers
+# ------------------------------------------------------------
+STORAGE_FULL = "full"
+STORAGE_PALETTE = "palette"
+STORAGE_HALF = "half"
+STORAGE_EMPTY = "empty"
+STORAGE_MODES = (STORAGE_FULL, STORAGE_PALETTE, STORAGE_HALF, STORAGE_EMPTY)
+
+
+def layer_error(a, b):
+    """
+    Mean absolute error per channel (0-255) between two same-sized
+    32-bit SRCALPHA surfaces, on premultiplied colour so differences
+    under transparent pixels do not count.
+    """
+    pa = a.premul_alpha()
+    pb = b.premul_alpha()
+    if numpy is not None:
+        ca = numpy.dstack((pygame.surfarray.array3d(pa), pygame.surfarray.array_alpha(pa)))
+        cb = numpy.dstack((pygame.surfarray.array3d(pb), pygame.surfarray.array_alpha(pb)))
+        return float(numpy.abs(ca.astype(numpy.int16) - cb).mean())
+
+    # |a - b| per channel from two saturating subtractions
+    d1 = pa.copy()
+    d1.blit(pb, (0, 0), special_flags=pygame.BLEND_RGBA_SUB)
+    pb.blit(pa, (0, 0), special_flags=pygame.BLEND_RGBA_SUB)
+    d1.blit(pb, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+    return sum(pygame.transform.average_color(d1)) / 4.0
+
+
+def _expanded(img):
+    """32-bit SRCALPHA copy of a (palettized) surface, for comparisons."""
+    out = pygame.Surface(img.get_size(), pygame.SRCALPHA, 32)
+    out.blit(img, (0, 0))
+    return out
+
+
+def _unpack_rgb(packed):
+    """(..., 3) int32 channels of 0xRRGGBB words."""
+    return numpy.stack(((packed >> 16) & 255, (packed >> 8) & 255, packed & 255), -1).astype(numpy.int32)
+
+
+def palettize(img, fmt):
+    """
+    8-bit copy of an opaque or colorkey layer, or None. With numpy the
+    palette holds the layer's own most frequent colours (exact when it
+    has at most 256); without it SDL's default palette is used.
+    """
+    if fmt == FORMAT_ALPHA:
+        return None
+    keyed = fmt == FORMAT_COLORKEY
+
+    if numpy is None:
+        if keyed:
+            return None
+        out = pygame.Surface(img.get_size(), 0, 8)
+        out.blit(img, (0, 0))
+        return out
+
+    rgb = pygame.surfarray.array3d(img).astype(numpy.uint32)
+    packed = (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+    solid = pygame.surfarray.array_alpha(img) > 0 if keyed else numpy.ones(packed.shape, bool)
+    colors, inverse, counts = numpy.unique(packed[solid], return_inverse=True, return_counts=True)
+
+    slots = 255 if keyed else 256
+    if len(colors) > slots:
+        if len(colors) > 4096:
+            return None
+        palette = colors[numpy.argsort(counts)[::-1][:slots]]
+        dist = ((_unpack_rgb(colors)[:, None, :] - _unpack_rgb(palette)[None, :, :]) ** 2).sum(-1)
+        lookup = dist.argmin(axis=1)
+    else:
+        palette = colors
+        lookup = numpy.arange(len(colors))
+
+    first = 1 if keyed else 0
+    indices = numpy.zeros(packed.shape, numpy.uint8)
+    indices[solid] = lookup[inverse] + first
+
+    out = pygame.Surface(img.get_size(), 0, 8)
+    entries = [COLORKEY] if keyed else []
+    entries += [((c >> 16) & 255, (c >> 8) & 255, c & 255) for c in palette.tolist()]
+    out.set_palette(entries + [(0, 0, 0)] * (256 - len(entries)))
+    pygame.surfarray.pixels2d(out)[...] = indices
+    if keyed:
+        out.set_colorkey(0, pygame.RLEACCEL)
+    return out
+
+
+def compact_layer(img, fmt, max_error):
+    """
+    Worker side: smallest storage for a background layer whose error
+    stays within `max_error`. Returns (surface or None, fmt, storage).
+    """
+    if fmt != FORMAT_OPAQUE and pygame.mask.from_surface(img, 0).count() == 0:
+        return None, fmt, STORAGE_EMPTY
+
+    small = palettize(img, fmt)
+    if small is not None and layer_error(img, _expanded(small)) <= max_error:
+        return small, fmt, STORAGE_PALETTE
+
+    w, h = img.get_size()
+    half = pygame.transform.smoothscale(img, (max(1, w // 2), max(1, h // 2)))
+    if layer_error(img, pygame.transform.scale(half, (w, h))) <= max_error:
+        # Filtered edges are no longer 1-bit
+        return half, FORMAT_OPAQUE if fmt == FORMAT_OPAQUE else FORMAT_ALPHA, STORAGE_HALF
+
+    return img, fmt, STORAGE_FULL
+
+
+# ------------------------------------------------------------
+#  Tinting (generate_assets.py and derived world backgrounds)
+# ------------------------------------------------------------
+def rgba_copy(img):
+    """32-bit RGBA copy of any surface; needs no display."""
+    if img.get_bitsize() == 32 and img.get_flags() & pygame.SRCALPHA:
+        return img.copy()
+    return pygame.image.frombytes(pygame.image.tobytes(img, "RGBA"), img.get_size(), "RGBA")
+
+
+def tint_surface(img, tint):
+    """
+    Tinted 32-bit RGBA copy of `img`; alpha is kept. An (r, g, b) tint
+    multiplies each channel by c/255, an (r, g, b, a) tint blends the
+    colour over the pixels at a/255 (the WORLD_PACKS "tint" form).
+    """
+    out = rgba_copy(img)
+    r, g, b = tint[:3]
+    wash = len(tint) > 3
+    if numpy is not None:
+        px = pygame.surfarray.pixels3d(out)
+        color = numpy.array((r, g, b), numpy.uint32)
+        if wash:
+            a = int(tint[3])
+            px[...] = (px * numpy.uint32(255 - a) + color * a + 127) // 255
+        else:
+            px[...] = (px * color + 127) // 255
+        del px
+    elif wash:
+        a = int(tint[3])
+        out.fill((255 - a,) * 3, special_flags=pygame.BLEND_RGB_MULT)
+        out.fill((r * a // 255, g * a // 255, b * a // 255), special_flags=pygame.BLEND_RGB_ADD)
+    else:
+        out.fill((r, g, b), special_flags=pygame.BLEND_RGB_MULT)
+    return out
+
+
+def world_tint(world_cfg):
+    """A world's (r, g, b, a) background tint, or None when it has no effect."""
+    tint = (world_cfg or {}).get("tint")
+    if not tint or len(tint) < 4 or tint[3] <= 0:
+        return None
+    return tuple(int(c) for c in tint[:4])
+
+
+def background_series_paths(folder):
+    """
+    background{n}_far/mid/near.png paths of a folder, one dict per set.
+    Missing layers map to None.
+    """
+    if not asset_isdir(folder):
+        return []
+
+    prefix = config.BACKGROUND_AUTO_PREFIX
+    series = []
+    idx = 1
+    while True:
+        layer = {}
+        for key in ("far", "mid", "near"):
+            path = os.path.join(folder, f"{prefix}{idx}_{key}.png")
+            layer[key] = path if asset_exists(path) else None
+        if not any(layer.values()):
+            break
+        series.append(layer)
+        idx += 1
+    return series
+
+
+def _series_surfaces(series):
+    return [s for layer in series for s in layer.values() if s is not None]
+
+
+def _series_bytes(series):
+    return sum(surface_bytes(s) for layer in series for s in layer.values())
+
+
+# ============================================================
+#  MANAGER
+# ============================================================
+
+GLOBAL_BACKGROUNDS = "global"
+
+
+class AssetManager:
+    """
+    Lazy, memory-bounded store for background sets plus the thread
+    pool every image decode goes through.
+
+    Render loop: backgrounds_for(world_id) returns the world's layers
+    (finishing a pending load if needed) or the global layers for
+    worlds without their own art. Call pump() once per frame.
+    """
+
+    def __init__(self, base_path, screen_w, screen_h, world_packs, budget_bytes=None):
+        self.base_path = base_path
+        self.screen_w = screen_w
+        self.screen_h = screen_h
+        if budget_bytes is None:
+            budget_bytes = int(config.ASSET_MEMORY_BUDGET_MB * 1024 * 1024)
+        self.budget_bytes = budget_bytes
+
+        self._sets = OrderedDict()   # group id -> (series, nbytes)
+        self._pending = {}           # group id -> [[key, future or surface], ...] per set
+        self._images = {}            # (path, scale, size, smooth) -> future
+        self.formats = {}            # source path -> format class
+        self.storage = {}            # source path -> storage mode
+        self._scratch = {}           # (size, flags) -> [upscale target, weakref to the layer in it]
+        self._active = None
+        self.atlas = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.ASSET_LOADER_THREADS, thread_name_prefix="assets"
+        )
+        self.cache = AssetCache() if config.ASSET_CACHE_ENABLED else None
+        self._jobs_lock = threading.Lock()
+        self.jobs_total = 0
+        self.jobs_done = 0
+        self.loads = 0
+        self.evictions = 0
+        registry.set_evictor("backgrounds", self.trim)
+
+        # Which worlds ship their own backgrounds (cheap stat, no decode)
+        self._world_art = {world_id: self._has_art(world_id) for world_id in world_packs.keys()}
+        self._tints = {world_id: world_tint(cfg) for world_id, cfg in world_packs.items()}
+
+    def _art_folder(self, world_id):
+        return os.path.join(self.base_path, "worlds", world_id, "backgrounds")
+
+    def _has_art(self, world_id):
+        prefix = config.BACKGROUND_AUTO_PREFIX
+        folder = self._art_folder(world_id)
+        return any(
+            asset_exists(os.path.join(folder, f"{prefix}1_{k}.png"))
+            for k in ("far", "mid", "near")
+        )
+
+    def _folder(self, group):
+        """Source folder of a group: the world's own art or the global sets."""
+        if group != GLOBAL_BACKGROUNDS and self._world_art.get(group):
+            return self._art_folder(group)
+        return os.path.join(self.base_path, "backgrounds")
+
+    def _tint(self, group):
+        """Tint applied to a group's layers (derived worlds only), or None."""
+        if group == GLOBAL_BACKGROUNDS or self._world_art.get(group):
+            return None
+        return self._tints.get(group)
+
+    def _decode(self, path, scale, size, smooth, compact=False, tint=None):
+        """
+        Worker side: (surface, format class, storage) from the cache, or
+        decode, scale, tint, classify (and compact, for background
+        layers) and store.
+        """
+        max_error = config.BACKGROUND_COMPACT_MAX_ERROR
+        cache = self.cache
+        key = None
+        if cache is not None:
+            variant = f"compact{max_error}" if compact else ""
+            if tint is not None:
+                variant += f"|tint{list(tint)}"
+            key = cache.key(path, scale, size, smooth, variant)
+            hit = cache.get(key)
+            if hit is not None:
+                return hit
+
+        img = decode_scaled(path, scale, size, smooth)
+        if tint is not None:
+            img = tint_surface(img, tint)
+        fmt = classify_surface(img)
+        storage = STORAGE_FULL
+        if compact:
+            img, fmt, storage = compact_layer(img, fmt, max_error)
+        if cache is not None:
+            cache.put(key, img, fmt, storage)
+        return img, fmt, storage
+
+    def _finish(self, path, decoded):
+        img, fmt, storage = decoded
+        self.formats[path] = fmt
+        self.storage[path] = storage
+        if storage == STORAGE_EMPTY:
+            return None
+        if storage == STORAGE_PALETTE:
+            # Blits straight from 8 bits; converting would undo the saving
+            return img
+        if not config.ASSET_FORMAT_OPTIMIZE:
+            fmt = FORMAT_ALPHA
+        return finish_surface(img, fmt)
+
+    def _compact(self, layer_key):
+        """True if a background layer may use compact storage."""
+        storage = config.BACKGROUND_STORAGE_BY_TIER.get(device_tier(), config.BACKGROUND_STORAGE)
+        if storage != "compact":
+            return False
+        return layer_key == "far" or (layer_key == "mid" and config.BACKGROUND_COMPACT_MID)
+
+    def _submit(self, path, scale=1.0, size=None, smooth=False, compact=False, tint=None):
+        self.jobs_total += 1
+        future = self._executor.submit(self._decode, path, scale, size, smooth, compact, tint)
+        future.add_done_callback(self._job_done)
+        return future
+
+    def _job_done(self, _future):
+        # Runs on the worker thread
+        with self._jobs_lock:
+            self.jobs_done += 1
+
+    def background_group(self, world_id):
+        """Group id whose layers are drawn for `world_id`."""
+        if world_id is not None and (self._world_art.get(world_id) or self._tints.get(world_id)):
+            return world_id
+        return GLOBAL_BACKGROUNDS
+
+    # --------------------------------------------------------
+    # Single images (skins, sprites, FX)
+    # --------------------------------------------------------
+    def set_atlas(self, scale):
+        """Serve images from the atlas of `scale`'s tier (if one is built)."""
+        if self.atlas is None or self.atlas.scale != scale:
+            self.atlas = load_atlas(scale)
+
+    def preload_image(self, path, scale=1.0, size=None, smooth=False):
+        """Start decoding an image in the background (unless the atlas has it)."""
+        if self.atlas is not None and self.atlas.entry(path, scale, size, smooth) is not None:
+            return
+        key = (path, scale, size, smooth)
+        if key not in self._images:
+            self._images[key] = self._submit(path, scale, size, smooth)
+
+    def image(self, path, scale=1.0, size=None, smooth=False):
+        """
+        Display-ready surface for an image: a view into the atlas, the
+        preloaded result (waiting for it if still running) or an inline
+        decode.
+        """
+        if self.atlas is not None:
+            view = self.atlas.frame(path, scale, size, smooth)
+            if view is not None:
+                self.formats[path] = FORMAT_ALPHA
+                return view
+        future = self._images.pop((path, scale, size, smooth), None)
+        if future is not None:
+            raw = future.result()
+        else:
+            raw = self._decode(path, scale, size, smooth)
+        return self._finish(path, raw)
+
+    def discard_preloaded(self):
+        """Drop preloaded images nobody asked for (e.g. failed lookups)."""
+        for future in self._images.values():
+            future.cancel()
+        self._images.clear()
+        self.flush_cache()
+
+    def flush_cache(self):
+        if self.cache is not None:
+            self.cache.flush()
+
+    # --------------------------------------------------------
+    # Backgrounds
+    # --------------------------------------------------------
+    def request_backgrounds(self, world_id):
+        """Queue a world's background sets for background decoding."""
+        group = self.background_group(world_id)
+        if group in self._sets or group in self._pending:
+            return
+        size = (self.screen_w, self.screen_h)
+        tint = self._tint(group)
+        pending = []
+        for layer in background_series_paths(self._folder(group)):
+            slots = []
+            for key, path in layer.items():
+                future = self._submit(path, size=size, compact=self._compact(key), tint=tint) if path else None
+                slots.append([key, future, path])
+            pending.append(slots)
+        self._pending[group] = pending
+
+    def prepare_world(self, world_id):
+        """Prefetch a world's backgrounds ahead of its first level."""
+        self.request_backgrounds(world_id)
+
+    def backgrounds_for(self, world_id):
+        group = self.background_group(world_id)
+        entry = self._sets.get(group)
+        if entry is None:
+            # Needed right now: finish (or start and finish) the load
+            self.request_backgrounds(world_id)
+            self._finish_group(group, limit=None)
+            entry = self._sets[group]
+        else:
+            self._sets.move_to_end(group)
+        self._active = group
+        registry.touch(_series_surfaces(entry[0]))
+        return entry[0]
+
+    def expand_layer(self, img):
+        """
+        Screen-sized version of a half-resolution layer for drawing.
+        Every call reuses one scratch surface per pixel format, so only
+        the compact copy stays resident; blit the result before the
+        next expand_layer() call. The scratch is only upscaled again
+        when it holds a different layer.
+        """
+        size = (self.screen_w, self.screen_h)
+        if img.get_size() == size:
+            return img
+        key = (size, img.get_bitsize(), img.get_flags() & pygame.SRCALPHA)
+        slot = self._scratch.get(key)
+        if slot is None:
+            scratch = pygame.transform.scale(img, size)
+            registry.track(scratch, "backgrounds/scratch")
+            self._scratch[key] = [scratch, weakref.ref(img)]
+            return scratch
+        scratch, held = slot
+        if held() is not img:
+            pygame.transform.scale(img, size, scratch)
+            slot[1] = weakref.ref(img)
+        return scratch
+
+    def _finish_group(self, group, limit):
+        """
+        Convert finished layers of a pending group on the main thread.
+        With a `limit`, only that many layers are converted and only
+        layers whose decode is done; returns the number converted.
+        """
+        converted = 0
+        for slots in self._pending[group]:
+            for slot in slots:
+                value = slot[1]
+                if value is None or isinstance(value, pygame.Surface):
+                    continue
+                if limit is not None and (converted >= limit or not value.done()):
+                    return converted
+                try:
+                    slot[1] = self._finish(slot[2], value.result())
+                except Exception as e:
+                    print(f"[assets] Failed loading background layer: {e}")
+                    slot[1] = None
+                converted += 1
+
+        series = [{key: value for key, value, _ in slots} for slots in self._pending.pop(group)]
+        self._sets[group] = (series, _series_bytes(series))
+        registry.track_all(_series_surfaces(series), f"backgrounds/{group}")
+        self.loads += 1
+        self._evict(keep=group)
+        self.flush_cache()
+        return converted
+
+    def pump(self, limit=None):
+        """
+        Main-thread step: convert up to `limit` finished background layers
+        (default config.ASSET_CONVERTS_PER_FRAME) and install completed sets.
+        """
+        if limit is None:
+            limit = config.ASSET_CONVERTS_PER_FRAME
+        for group in list(self._pending.keys()):
+            limit -= self._finish_group(group, limit)
+            if limit <= 0:
+                break
+
+    def busy(self):
+        """True while any decode job or background install is outstanding."""
+        return bool(self._pending) or self.jobs_done < self.jobs_total
+
+    def progress(self):
+        """Fraction of submitted decode jobs that have finished."""
+        if self.jobs_total == 0:
+            return 1.0
+        return self.jobs_done / self.jobs_total
+
+    def _evict(self, keep):
+        total = sum(nbytes for _, nbytes in self._sets.values())
+        for group in list(self._sets.keys()):
+            if total <= self.budget_bytes:
+                break
+            if group == keep or group == self._active:
+                continue
+            total -= self._sets.pop(group)[1]
+            self.evictions += 1
+
+    def retarget(self, screen_w, screen_h):
+        """
+        Switch to a new screen size. Background sets scaled for the old
+        size are dropped (in-flight decodes cancelled) and reload lazily;
+        the disk cache keeps every size seen, so switching back is cheap.
+        Returns False when the size did not change.
+        """
+        if (screen_w, screen_h) == (self.screen_w, self.screen_h):
+            return False
+        for pending in self._pending.values():
+            for slots in pending:
+                for slot in slots:
+                    if slot[1] is not None and not isinstance(slot[1], pygame.Surface):
+                        slot[1].cancel()
+        self._pending.clear()
+        self._sets.clear()
+        self._scratch.clear()
+        self._active = None
+        self.screen_w = screen_w
+        self.screen_h = screen_h
+        return True
+
+    def reload_background(self, path):
+        """
+        Hot reload: re-decode one changed background layer of a loaded
+        set in place. A file that adds or removes a layer changes the
+        set list, so its group is dropped and loads again on next use.
+        Returns True if any background group was affected.
+        """
+        path = os.path.normpath(path)
+        folder = os.path.dirname(path)
+        affected = False
+
+        for world_id, had_art in list(self._world_art.items()):
+            if os.path.normpath(self._art_folder(world_id)) != folder:
+                continue
+            self._world_art[world_id] = self._has_art(world_id)
+            if self._world_art[world_id] != had_art:
+                # Switches between own art and the derived set
+                affected = True
+                if world_id in self._pending:
+                    self._finish_group(world_id, limit=None)
+                self._sets.pop(world_id, None)
+
+        for group in list(self._pending.keys()) + list(self._sets.keys()):
+            if os.path.normpath(self._folder(group)) != folder:
+                continue
+            affected = True
+            if group in self._pending:
+                self._finish_group(group, limit=None)
+            series, _ = self._sets[group]
+            layers = background_series_paths(self._folder(group))
+            found = [
+                (i, key) for i, layer in enumerate(layers)
+                for key, layer_path in layer.items()
+                if layer_path is not None and os.path.normpath(layer_path) == path
+            ]
+            if len(layers) != len(series) or not found:
+                # Deleted file or new set
+                del self._sets[group]
+                continue
+            size = (self.screen_w, self.screen_h)
+            tint = self._tint(group)
+            for i, key in found:
+                try:
+                    decoded = self._decode(path, 1.0, size, False, self._compact(key), tint)
+                    series[i][key] = self._finish(path, decoded)
+                except Exception as e:
+                    print(f"[assets] Failed reloading {path}: {e}")
+            self._sets[group] = (series, _series_bytes(series))
+            registry.track_all(_series_surfaces(series), f"backgrounds/{group}")
+        return affected
+
+    def is_resident(self, world_id):
+        return self.background_group(world_id) in self._sets
+
+    # --------------------------------------------------------
+    # Reporting
+    # --------------------------------------------------------
+    def trim(self):
+        """Drop every background set but the one on screen (budget evictor)."""
+        for group in list(self._sets.keys()):
+            if group != self._active:
+                del self._sets[group]
+                self.evictions += 1
+
+    def memory_report(self):
+        """Resident bytes per accounted asset group."""
+        return {group: nbytes for group, (_, nbytes, _) in registry.totals().items()}
+
+    def telemetry(self):
+        """Short lines for the debug overlay."""
+        total = sum(nbytes for _, nbytes in self._sets.values())
+        mb = 1024 * 1024
+        lines = [
+            f"backgrounds {total / mb:7.1f} MB  budget {self.budget_bytes / mb:6.0f} MB  "
+            f"loads {self.loads}  evicted {self.evictions}  pending {len(self._pending)}"
+        ]
+        lines.extend(registry.telemetry())
+        if self.atlas is not None:
+            lines.append(self.atlas.telemetry())
+        if self.cache is not None:
+            lines.append(self.cache.telemetry())
+        pack = get_pack()
+        if pack is not None:
+            lines.append(pack.telemetry())
+        counts = {fmt: 0 for fmt in FORMAT_CLASSES}
+        for fmt in self.formats.values():
+            counts[fmt] += 1
+        lines.append("formats " + "  ".join(f"{k} {v}" for k, v in counts.items()))
+        counts = {mode: 0 for mode in STORAGE_MODES}
+        for mode in self.storage.values():
+            counts[mode] += 1
+        lines.append("storage " + "  ".join(f"{k} {v}" for k, v in counts.items()))
+        return lines
+
+    def format_report(self):
+        """One line per loaded image: format class, storage and path."""
+        base = self.base_path
+        return [
+            f"{fmt:<8} {self.storage.get(path, STORAGE_FULL):<7} {os.path.relpath(path, base)}"
+            for path, fmt in sorted(self.formats.items(), key=lambda kv: (kv[1], kv[0]))
+        ]
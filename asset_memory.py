@@ -0,0 +1,248 @@
+# ============================================================
+#  Slimey - ASSET MEMORY ACCOUNTING
+# ------------------------------------------------------------
+# Surface pixels live in SDL's C heap, so tracemalloc never
+# sees them. Every surface the loaders and runtime caches keep
+# is registered here instead:
+#
+#   track(surface, "skins")   -> bytes, owner group, last-used frame
+#
+# Entries are weak: a surface that is dropped (evicted set,
+# reloaded sprite) leaves the accounting with it. Bytes are
+# pitch x height, i.e. what SDL actually allocated, 4 bytes
+# per pixel for 32-bit surfaces and 1 for palettized layers.
+# Subsurfaces (atlas frames) share their page's pixels: a tracked
+# view is charged to its own group ("skins", "enemies", ...) at
+# its area and, when its page is tracked (the atlas tracks it
+# before cutting frames), that much is taken off the page's
+# group, so "atlas" shows only what no tracked view covers and
+# the total stays the real resident size. Dropping a view (e.g. a
+# skin evicted from SkinStore) hands its bytes back to "atlas":
+# the page stays resident, bounded by the "atlas" budget.
+#
+# Per-group totals are kept running (track() and a weakref
+# callback when a surface is freed), so registering n surfaces is
+# O(n) and the per-frame budget check only walks the groups.
+#
+# Group names are "<group>" or "<group>/<detail>" (e.g.
+# "backgrounds/forest"); budgets in config.ASSET_GROUP_BUDGETS_MB
+# apply to the part before the slash. Over budget, a group is
+# either reported once (warn) or handed to the evictor its owner
+# registered (config.ASSET_BUDGET_ACTION = "evict").
+#
+# device_tier() sorts the machine into "low" or "standard" by
+# its physical memory (config.DEVICE_TIER overrides it), for
+# settings that only pay off on low-memory devices.
+# ============================================================
+
+import os
+import weakref
+
+import config
+
+
+MB = 1024 * 1024
+
+
+def surface_bytes(surf):
+    """Resident pixel bytes of a surface (0 for None and subsurface views)."""
+    if surf is None or surf.get_parent() is not None:
+        return 0
+    return surf.get_pitch() * surf.get_height()
+
+
+_tier = None
+
+
+def device_tier():
+    """
+    "low" when physical memory is at most config.LOW_MEMORY_DEVICE_MB
+    (or config.DEVICE_TIER says so), else "standard". Where memory
+    cannot be read, the device counts as standard.
+    """
+    global _tier
+    if config.DEVICE_TIER:
+        return config.DEVICE_TIER
+    if _tier is None:
+        _tier = "standard"
+        try:
+            total = os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+        except (AttributeError, ValueError, OSError):
+            total = 0
+        if 0 < total <= config.LOW_MEMORY_DEVICE_MB * MB:
+            _tier = "low"
+    return _tier
+
+
+class SurfaceRegistry:
+    """
+    Weak registry of resident surfaces: weakref(surface) -> [group,
+    bytes, last frame, page entry of a subsurface view or None, bytes
+    of views charged off this surface]. Per-group totals are kept
+    running: updated on track() and when a surface is freed, so
+    registering and reporting never walk every entry. Only the main
+    thread registers and touches surfaces.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._groups = {}         # group -> [surface count, bytes, last-used frame]
+        self._total = 0
+        self._evictors = {}       # budget group -> callable()
+        self._warned = set()
+        self.frame = 0
+        self.peak_bytes = 0
+        self.peak_groups = {}     # group -> highest resident bytes seen
+
+    # --------------------------------------------------------
+    # Registration
+    # --------------------------------------------------------
+    def track(self, surface, group):
+        """Account `surface` to `group`; returns the surface. None is ignored."""
+        if surface is None:
+            return None
+        entry = self._entries.get(weakref.ref(surface))
+        if entry is None:
+            entry = [None, 0, 0, None, 0]
+            self._entries[weakref.ref(surface, self._freed)] = entry
+        else:
+            # Tracked again: move it, keeping what its views took off
+            self._uncount(entry)
+
+        page = None
+        if surface.get_parent() is not None:
+            # Charged here at its area instead of through its page
+            page = self._entries.get(weakref.ref(surface.get_abs_parent()))
+            nbytes = surface.get_width() * surface.get_height() * surface.get_bytesize()
+        else:
+            nbytes = surface_bytes(surface)
+        entry[:4] = group, nbytes, self.frame, page
+        self._add(group, 1, nbytes - entry[4], self.frame)
+        if page is not None:
+            page[4] += nbytes
+            self._add(page[0], 0, -nbytes, -1)
+        self._update_peaks(group)
+        return surface
+
+    def _add(self, group, count, nbytes, frame):
+        totals = self._groups.get(group)
+        if totals is None:
+            totals = self._groups[group] = [0, 0, -1]
+        totals[0] += count
+        totals[1] += nbytes
+        totals[2] = max(totals[2], frame)
+        self._total += nbytes
+        if not totals[0]:
+            del self._groups[group]
+
+    def _uncount(self, entry):
+        group, nbytes, _, page, credit = entry
+        self._add(group, -1, credit - nbytes, -1)
+        if page is not None:
+            page[4] -= nbytes
+            self._add(page[0], 0, nbytes, -1)
+
+    def _freed(self, ref):
+        # Weakref callback: the surface is gone (a view always goes
+        # before its page, which it keeps alive)
+        entry = self._entries.pop(ref, None)
+        if entry is not None:
+            self._uncount(entry)
+
+    def track_all(self, surfaces, group):
+        for surface in surfaces:
+            self.track(surface, group)
+
+    def touch(self, surfaces):
+        """Mark surfaces as used this frame."""
+        frame = self.frame
+        entries = self._entries
+        groups = self._groups
+        for surface in surfaces:
+            entry = entries.get(weakref.ref(surface)) if surface is not None else None
+            if entry is not None:
+                entry[2] = frame
+                groups[entry[0]][2] = frame
+
+    def set_evictor(self, budget_group, evict):
+        """`evict()` frees memory of `budget_group` when it is over budget."""
+        self._evictors[budget_group] = evict
+
+    # --------------------------------------------------------
+    # Frame step / budgets
+    # --------------------------------------------------------
+    def next_frame(self):
+        self.frame += 1
+
+    def reset_peaks(self):
+        """Start peak tracking over (e.g. per build job in a reused worker)."""
+        self.peak_bytes = 0
+        self.peak_groups.clear()
+
+    def _update_peaks(self, group):
+        self.peak_bytes = max(self.peak_bytes, self._total)
+        nbytes = self._groups[group][1]
+        if nbytes > self.peak_groups.get(group, 0):
+            self.peak_groups[group] = nbytes
+
+    def check_budgets(self):
+        """
+        Compare budget groups against config.ASSET_GROUP_BUDGETS_MB; warn
+        once per group or call its evictor. Returns the groups over budget.
+        """
+        budgets = config.ASSET_GROUP_BUDGETS_MB
+        if not budgets:
+            return []
+        used = {}
+        for group, (_, nbytes, _) in self.totals().items():
+            key = group.split("/", 1)[0]
+            used[key] = used.get(key, 0) + nbytes
+
+        over = []
+        for key, budget_mb in budgets.items():
+            nbytes = used.get(key, 0)
+            if nbytes <= budget_mb * MB:
+                self._warned.discard(key)
+                continue
+            over.append(key)
+            evict = self._evictors.get(key)
+            if config.ASSET_BUDGET_ACTION == "evict" and evict is not None:
+                evict()
+            elif key not in self._warned:
+                self._warned.add(key)
+                print(f"[memory] {key} uses {nbytes / MB:.1f} MB, budget {budget_mb} MB")
+        return over
+
+    # --------------------------------------------------------
+    # Reporting
+    # --------------------------------------------------------
+    def totals(self):
+        """group -> (surface count, bytes, last-used frame)."""
+        return {group: tuple(totals) for group, totals in self._groups.items()}
+
+    def report(self, peaks=False):
+        """Lines per group (sorted by size), for the CLI report and logs."""
+        totals = self.totals()
+        lines = [f"{'group':<28} {'surfaces':>8} {'MB':>8} {'idle frames':>12}"]
+        for group, (count, nbytes, last) in sorted(totals.items(), key=lambda kv: -kv[1][1]):
+            lines.append(f"{group:<28} {count:>8} {nbytes / MB:>8.1f} {self.frame - last:>12}")
+        lines.append(f"{'total':<28} {sum(c for c, _, _ in totals.values()):>8} "
+                     f"{sum(b for _, b, _ in totals.values()) / MB:>8.1f}")
+        if peaks:
+            lines.append(f"{'peak total':<28} {'':>8} {self.peak_bytes / MB:>8.1f}")
+            for group in sorted(self.peak_groups):
+                lines.append(f"  peak {group:<21} {'':>8} {self.peak_groups[group] / MB:>8.1f}")
+        return lines
+
+    def telemetry(self):
+        """Short lines for the debug overlay: total plus the largest groups."""
+        totals = self.totals()
+        lines = [f"surfaces {len(self._entries)}  {self._total / MB:7.1f} MB  peak {self.peak_bytes / MB:7.1f} MB"]
+        largest = sorted(totals.items(), key=lambda kv: -kv[1][1])[:config.ASSET_REPORT_OVERLAY_GROUPS]
+        for group, (count, nbytes, last) in largest:
+            lines.append(f"  {group:<20} {nbytes / MB:7.1f} MB  x{count:<4} idle {self.frame - last}")
+        return lines
+
+
+# Shared registry for the game process (and the offline generator)
+registry = SurfaceRegistry()
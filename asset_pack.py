@@ -0,0 +1,265 @@
+# ============================================================
+#  Slimey - ASSET PACK
+# ------------------------------------------------------------
+# Startup used to probe assets/ file by file: skin folders are
+# listed and idle_1.png, idle_2.png, ... are tried until one is
+# missing, background sets are probed the same way, every sound
+# is checked before loading. tools/build_asset_pack.py bundles
+# assets/ into one file (config.ASSET_PACK_FILE):
+#
+#   "SLPK" + version (u16) + index length (u32)
+#   index: JSON {relative path: [offset, length, w, h, format, sha1]}
+#   member bytes (offsets count from the end of the index)
+#
+# At runtime the pack is mmapped once; exists/isdir/listdir are
+# answered from the index and members are decoded on demand
+# straight from the mapping. Anything the pack does not contain
+# (mods, new files) falls back to the loose file in assets/.
+# In dev mode (`--dev` / HOT_RELOAD_ENABLED, or with
+# ASSET_PACK_LOOSE_OVERRIDES) one walk of assets/ at startup also
+# finds loose files that replace a packed member (a different size
+# or sha1); those paths are served loose instead of the stale
+# packed copy. Shipped builds skip the walk.
+# Music keeps streaming from its loose file. Members edited while
+# the game runs (hot reload) are invalidated and read loose from
+# then on.
+# ============================================================
+
+import io
+import os
+import sys
+import json
+import hashlib
+import mmap
+import struct
+import threading
+
+import pygame
+
+import config
+
+
+PACK_MAGIC = b"SLPK"
+PACK_VERSION = 1
+PACK_HEADER = struct.Struct("<4sHI")
+
+
+class AssetPack:
+    """
+    Read-only view of a built asset pack. Paths are the absolute paths
+    the loaders already use; anything outside `root` is never packed.
+    """
+
+    def __init__(self, path, root):
+        self.path = path
+        self.root = os.path.normpath(root) + os.sep
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, index_len = PACK_HEADER.unpack_from(self._mm, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            self._mm.close()
+            raise ValueError(f"not a version {PACK_VERSION} asset pack")
+        start = PACK_HEADER.size
+        self._index = json.loads(self._mm[start:start + index_len].decode("utf-8"))
+        self._data_start = start + index_len
+
+        # Directory -> child names, so listdir/isdir never hit the disk
+        self._dirs = {"": set()}
+        for name in self._index:
+            parts = name.split("/")
+            for depth in range(len(parts)):
+                parent = "/".join(parts[:depth])
+                self._dirs.setdefault(parent, set()).add(parts[depth])
+
+        self._stale = set()   # members invalidated by hot reload
+        self._overrides = set()   # members replaced by a loose file
+        self.reads = 0
+        self.loose = 0
+
+    def key(self, path):
+        """Pack member name for an absolute path, or None if outside the pack root."""
+        path = os.path.normpath(path)
+        if not path.startswith(self.root):
+            return None
+        return path[len(self.root):].replace(os.sep, "/")
+
+    def find_overrides(self):
+        """
+        Walk the pack root once and stop serving members whose loose
+        file differs in size or content (sha1). Returns how many.
+        """
+        root = self.root.rstrip(os.sep)
+        for dirpath, _, filenames in os.walk(root):
+            rel = os.path.relpath(dirpath, root).replace(os.sep, "/")
+            prefix = "" if rel == "." else rel + "/"
+            for fname in filenames:
+                name = prefix + fname
+                entry = self._index.get(name)
+                if entry is None:
+                    continue
+                path = os.path.join(dirpath, fname)
+                try:
+                    if os.path.getsize(path) == entry[1]:
+                        with open(path, "rb") as f:
+                            if hashlib.sha1(f.read()).hexdigest() == entry[5]:
+                                continue
+                except OSError:
+                    continue
+                self._overrides.add(name)
+        return len(self._overrides)
+
+    def entry(self, path):
+        """[offset, length, w, h, format, sha1] for a member, or None."""
+        name = self.key(path)
+        if name is None or name in self._overrides:
+            return None
+        return self._index.get(name)
+
+    def is_dir(self, path):
+        name = self.key(os.path.join(path, ""))
+        return name is not None and name.rstrip("/") in self._dirs
+
+    def children(self, path):
+        name = self.key(os.path.join(path, ""))
+        if name is None:
+            return set()
+        return self._dirs.get(name.rstrip("/"), set())
+
+    def invalidate(self, path):
+        """Stop serving a member whose loose file changed; True if it was packed."""
+        name = self.key(path)
+        if name is None:
+            return False
+        self._stale.add(name)
+        return self._index.pop(name, None) is not None
+
+    def is_stale(self, path):
+        name = self.key(path)
+        return name in self._stale or name in self._overrides
+
+    def read(self, entry):
+        self.reads += 1
+        offset = self._data_start + entry[0]
+        return self._mm[offset:offset + entry[1]]
+
+    def telemetry(self):
+        return (
+            f"pack {len(self._index)} files {len(self._mm) / (1024 * 1024):5.1f} MB  "
+            f"reads {self.reads}  loose {self.loose}  overrides {len(self._overrides)}"
+        )
+
+
+# ------------------------------------------------------------
+# Shared pack + filesystem-style helpers
+# ------------------------------------------------------------
+
+_pack = None
+_pack_opened = False
+_pack_lock = threading.Lock()
+
+
+def _check_overrides():
+    """Loose replacements of packed files are looked for in dev mode only."""
+    if not config.ASSET_PACK_LOOSE_FILES:
+        return False
+    return (
+        config.ASSET_PACK_LOOSE_OVERRIDES
+        or config.HOT_RELOAD_ENABLED
+        or "--dev" in sys.argv[1:]
+    )
+
+
+def get_pack():
+    """The asset pack, opened on first use; None when absent or disabled."""
+    global _pack, _pack_opened
+    if _pack_opened:
+        return _pack
+    with _pack_lock:
+        if not _pack_opened:
+            if config.ASSET_PACK_ENABLED:
+                try:
+                    _pack = AssetPack(config.ASSET_PACK_FILE, config.ASSETS_DIR)
+                    if _check_overrides():
+                        _pack.find_overrides()
+                except FileNotFoundError:
+                    _pack = None
+                except (OSError, ValueError, struct.error) as e:
+                    print(f"[asset_pack] Ignoring {config.ASSET_PACK_FILE}: {e}")
+                    _pack = None
+            _pack_opened = True
+    return _pack
+
+
+def _loose(pack, path):
+    """True if a lookup the pack missed should check the loose file."""
+    if pack is None:
+        return True
+    if not config.ASSET_PACK_LOOSE_FILES and pack.key(path) is not None and not pack.is_stale(path):
+        return False
+    pack.loose += 1
+    return True
+
+
+def asset_exists(path):
+    pack = get_pack()
+    if pack is not None and pack.entry(path) is not None:
+        return True
+    return _loose(pack, path) and os.path.exists(path)
+
+
+def asset_isdir(path):
+    pack = get_pack()
+    if pack is not None and pack.is_dir(path):
+        return True
+    return _loose(pack, path) and os.path.isdir(path)
+
+
+def asset_listdir(path):
+    """Names in a directory: packed members plus any loose additions."""
+    pack = get_pack()
+    names = set(pack.children(path)) if pack is not None else set()
+    if _loose(pack, path):
+        try:
+            names.update(os.listdir(path))
+        except OSError:
+            if not names:
+                raise
+    return sorted(names)
+
+
+def open_asset(path):
+    """Binary file object for an asset, from the pack if it has it."""
+    pack = get_pack()
+    if pack is not None:
+        entry = pack.entry(path)
+        if entry is not None:
+            return io.BytesIO(pack.read(entry))
+        if not _loose(pack, path):
+            raise FileNotFoundError(path)
+    return open(path, "rb")
+
+
+def load_image_file(path):
+    """pygame.image.load() through the pack (not converted)."""
+    with open_asset(path) as f:
+        return pygame.image.load(f, os.path.basename(path))
+
+
+def load_sound_file(path):
+    with open_asset(path) as f:
+        return pygame.mixer.Sound(file=f)
+
+
+def invalidate_asset(path):
+    """Hot reload: serve `path` from its loose file from now on."""
+    pack = get_pack()
+    return pack is not None and pack.invalidate(path)
+
+
+def asset_digest(path):
+    """sha1 hex of a packed member, or None when it is not packed."""
+    pack = get_pack()
+    entry = pack.entry(path) if pack is not None else None
+    return entry[5] if entry is not None else None
+
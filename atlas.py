@@ -0,0 +1,151 @@
+# ============================================================
+#  Slimey - SPRITE ATLAS
+# ------------------------------------------------------------
+# Skins, enemies, coins, trees and platform tiles used to be
+# separate surfaces, each decoded, scaled and converted on its
+# own. tools/build_atlas.py packs every one of them, already
+# scaled, into one page per scale tier:
+#
+#   atlas/atlas_<scale>.png    the packed frames
+#   atlas/atlas_<scale>.json   {"scale", "size", "frames": {key: {
+#                                 "rect", "trim", "sha1", "stamp"}}}
+#
+# A frame key names the source and how it was scaled (see
+# frame_key()), exactly as the loaders ask AssetManager.image()
+# for it. At runtime the page is decoded and converted once;
+# frames are subsurface() views into it, so they share its
+# pixels (no copies) and blits draw from a single source.
+#
+# "trim" is the opaque bounding rect inside the frame. Frames
+# are packed untrimmed so views keep the size gameplay code and
+# collision masks expect; trim is there for tools and culling.
+#
+# A frame whose source changed since the build (sha1 of the
+# packed member, or the loose file's stat/contents) is reported
+# stale once and loaded the normal way instead.
+# ============================================================
+
+import os
+import json
+import hashlib
+
+import pygame
+
+import config
+from asset_pack import asset_digest
+from asset_memory import registry
+
+
+def tier_name(scale):
+    """File stem of the atlas page for a scale tier."""
+    return f"atlas_{scale:.4f}"
+
+
+def frame_key(rel, scale=1.0, size=None, smooth=False):
+    """Manifest key of an image request (path relative to ASSETS_DIR)."""
+    target = f"{size[0]}x{size[1]}" if size is not None else f"x{scale:.4f}"
+    return f"{rel}@{target}{'s' if smooth else ''}"
+
+
+def file_stamp(path):
+    """[mtime_ns, size] of a file, or None when it is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def file_sha1(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+class Atlas:
+    """
+    One scale tier's atlas page and manifest. frame() returns a
+    subsurface view for an image request, or None when the atlas does
+    not hold it (or holds an outdated copy).
+    """
+
+    def __init__(self, scale, folder=None):
+        self.scale = scale
+        folder = folder or config.ATLAS_DIR
+        stem = os.path.join(folder, tier_name(scale))
+        self.page_path = stem + ".png"
+        if not os.path.exists(self.page_path):
+            raise FileNotFoundError(self.page_path)
+        with open(stem + ".json", "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        self.frames = manifest["frames"]
+        self.size = tuple(manifest["size"])
+        self._page = None
+        self._fresh = {}     # source path -> (stamp, still matches the atlas)
+        self._warned = set()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, path, scale, size, smooth):
+        rel = os.path.relpath(path, config.ASSETS_DIR).replace(os.sep, "/")
+        return frame_key(rel, scale, size, smooth)
+
+    def _is_fresh(self, path, entry):
+        digest = asset_digest(path)
+        if digest is not None:
+            return digest == entry["sha1"]
+        stamp = file_stamp(path)
+        if stamp is None:
+            return False
+        if stamp == entry["stamp"]:
+            return True
+        known = self._fresh.get(path)
+        if known is not None and known[0] == stamp:
+            return known[1]
+        # Touched (checkout, copy): only different contents make it stale
+        fresh = file_sha1(path) == entry["sha1"]
+        self._fresh[path] = (stamp, fresh)
+        return fresh
+
+    def entry(self, path, scale=1.0, size=None, smooth=False):
+        """Manifest entry for an image request, or None (missing or stale)."""
+        entry = self.frames.get(self._key(path, scale, size, smooth))
+        if entry is None:
+            return None
+        if not self._is_fresh(path, entry):
+            if path not in self._warned:
+                self._warned.add(path)
+                print(f"[atlas] {os.path.relpath(path, config.ASSETS_DIR)} changed since "
+                      f"the atlas was built; loading it separately (rerun tools/build_atlas.py)")
+            return None
+        return entry
+
+    def page(self):
+        """The converted atlas page (main thread: needs the display)."""
+        if self._page is None:
+            self._page = registry.track(pygame.image.load(self.page_path).convert_alpha(), "atlas")
+        return self._page
+
+    def frame(self, path, scale=1.0, size=None, smooth=False):
+        entry = self.entry(path, scale, size, smooth)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self.page().subsurface(pygame.Rect(entry["rect"]))
+
+    def telemetry(self):
+        w, h = self.size
+        return f"atlas {self.scale:.4f} {w}x{h}  frames {len(self.frames)}  hits {self.hits}  misses {self.misses}"
+
+
+def load_atlas(scale):
+    """The atlas for a scale tier, or None when disabled or not built."""
+    if not config.ATLAS_ENABLED:
+        return None
+    try:
+        return Atlas(scale)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        print(f"[atlas] Ignoring atlas for scale {scale:.4f}: {e}")
+        return None
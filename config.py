@@ -19,6 +19,97 @@ SAVE_FILE = os.path.join(BASE_DIR, "save_data.json")
 # Background auto prefix (for background1_far/mid/near.png etc)
 BACKGROUND_AUTO_PREFIX = "background"
 
+# Resident budget for background sets (MB). Worlds load their sets on
+# first use; least recently drawn sets are evicted past this.
+ASSET_MEMORY_BUDGET_MB = 256
+
+# Image decode/scale threads, background layers converted per frame
+# on the main thread, and how many levels ahead of a world boundary
+# the next world's backgrounds start loading.
+ASSET_LOADER_THREADS = 4
+ASSET_CONVERTS_PER_FRAME = 1
+ASSET_PREFETCH_LEVELS = 2
+
+# On-disk cache of already-scaled pixels (raw RGBA, see asset_cache.py),
+# keyed by source hash + target size, pruned oldest-first past the cap.
+ASSET_CACHE_ENABLED = True
+ASSET_CACHE_DIR = os.path.join(BASE_DIR, ".asset_cache")
+ASSET_CACHE_MAX_MB = 1024
+
+# Finish opaque images with convert() and 1-bit-alpha sprites with a
+# colorkey + RLEACCEL instead of per-pixel alpha. With
+# ASSET_FORMAT_REPORT, the chosen class of every image is printed
+# once loading finishes.
+ASSET_FORMAT_OPTIMIZE = True
+ASSET_FORMAT_REPORT = False
+
+# Single-file asset pack built by tools/build_asset_pack.py (see
+# asset_pack.py). Loaders read members from it and only fall back to
+# loose files in assets/ for anything it does not contain (mods).
+# With ASSET_PACK_LOOSE_FILES off the pack alone answers lookups, so
+# startup makes no per-file disk probes at all. Loose files that
+# replace a packed one (different size or sha1) are only looked for
+# by one walk of assets/ in dev mode (`--dev`, HOT_RELOAD_ENABLED) or
+# with ASSET_PACK_LOOSE_OVERRIDES; otherwise rebuild the pack.
+ASSET_PACK_ENABLED = True
+ASSET_PACK_FILE = os.path.join(BASE_DIR, "assets.pack")
+ASSET_PACK_LOOSE_FILES = True
+ASSET_PACK_LOOSE_OVERRIDES = False
+
+# Sprite atlases built by tools/build_atlas.py (one page per scale
+# tier, see atlas.py). Skins, sprites and enemies are served as views
+# into the page; without a built atlas they load one by one as before.
+ATLAS_ENABLED = True
+ATLAS_DIR = os.path.join(BASE_DIR, "atlas")
+
+# Background layer storage: "full" keeps every layer at screen size in
+# 32 bits; "compact" stores far layers (and mid ones with
+# BACKGROUND_COMPACT_MID) dropped when fully transparent, 8-bit
+# palettized, or at half resolution, whichever is smallest while the
+# mean error per channel (0-255) stays under BACKGROUND_COMPACT_MAX_ERROR.
+# Half-resolution layers cost an upscale whenever they are drawn after
+# another one, so "compact" is the low-memory tier's setting:
+# BACKGROUND_STORAGE_BY_TIER overrides BACKGROUND_STORAGE per
+# asset_memory.device_tier() ("low" at or under LOW_MEMORY_DEVICE_MB of
+# physical memory, or forced with DEVICE_TIER = "low" / "standard").
+BACKGROUND_STORAGE = "full"
+BACKGROUND_STORAGE_BY_TIER = {"low": "compact"}
+DEVICE_TIER = None
+LOW_MEMORY_DEVICE_MB = 4096
+BACKGROUND_COMPACT_MID = False
+BACKGROUND_COMPACT_MAX_ERROR = 1.0
+
+# Memory accounting (asset_memory.py): per-group budgets in MB for
+# surfaces outside the background sets (those use
+# ASSET_MEMORY_BUDGET_MB). Over budget a group is reported once
+# ("warn") or trimmed by its owner ("evict"). The F3 overlay lists the
+# ASSET_REPORT_OVERLAY_GROUPS largest groups; `--asset-report` loads
+# every world and skin, prints per-group totals and peaks, and exits.
+# Atlas frames count towards the group that holds them; "atlas" is the
+# rest of the page (up to 8 MB at scale 2.0), which has no evictor and
+# stays resident for its scale tier.
+ASSET_GROUP_BUDGETS_MB = {
+    "atlas": 16,
+    "skins": 32,
+    "sprites": 16,
+    "enemies": 16,
+    "fx": 32,
+    "previews": 8,
+    "platforms": 8,
+    "variants": 16,
+}
+ASSET_BUDGET_ACTION = "warn"
+ASSET_REPORT_OVERLAY_GROUPS = 6
+
+# Dev mode: watch assets/ and levels/custom/ and reload edited files
+# while the game runs (see hot_reload.py). Also enabled by `--dev`.
+# Changes are applied once the files have been quiet for
+# HOT_RELOAD_SETTLE seconds; without inotify the folders are rescanned
+# every HOT_RELOAD_POLL_INTERVAL seconds.
+HOT_RELOAD_ENABLED = False
+HOT_RELOAD_SETTLE = 0.25
+HOT_RELOAD_POLL_INTERVAL = 0.5
+
 
 # ------------------------------------------------------------
 #  DISPLAY / RESOLUTION
@@ -63,6 +154,10 @@ SCREEN_SHAKE_INTENSITY = 6
 BASE_MAX_HEALTH = 3
 LEVEL_UP_EVERY_COINS = 20
 
+# Pixel-mask collision for damage and coin pickup (rect broadphase first).
+# Stored per save as settings["precise_collision"].
+PRECISE_COLLISION_DEFAULT = True
+
 OBSTACLE_SPAWN_DELAY_BASE = 1600
 COIN_SPAWN_DELAY_BASE = 900
 PLATFORM_SPAWN_DELAY_BASE = 1400
@@ -91,6 +186,14 @@ SKY_COLOR = (60, 120, 180)
 # ------------------------------------------------------------
 SKIN_LIST = ["default", "blue", "red", "green", "purple", "gold"]
 
+# Skins resident at once (the active one plus recently previewed ones)
+SKIN_CACHE_SIZE = 2
+
+# Scaled skin previews kept for the skins menu (one per skin and card
+# size, least recently shown dropped first). Refocusing a card whose
+# preview is kept does not load the skin at all.
+SKIN_PREVIEW_CACHE_SIZE = 8
+
 SKIN_UNLOCK_LEVEL = {
     "default": 1,
     "blue": 3,
@@ -421,6 +524,13 @@ PLATFORM_TYPE_COLORS = {
     "fragile": {"mode": "add", "color": (60, 60, 0)},
 }
 
+# Platform textures (assets/platforms/platform_<type>.png, see
+# platform_art.py): end caps kept unstretched at each side (pixels at
+# 1920x1080; the shipped art tiles seamlessly, so none), and how many
+# composed platform sizes stay cached.
+PLATFORM_TEXTURE_CAP = 0
+PLATFORM_CACHE_SIZE = 64
+
 
 # ------------------------------------------------------------
 #  AUDIO CONFIG
@@ -443,11 +553,59 @@ DISPLAY_TOGGLES = ["fullscreen", "vsync"]
 FX_MODES = ["off", "scanlines", "crt", "bloom"]
 PARTICLE_DENSITY_OPTIONS = ["low", "medium", "high"]
 
+# Bloom (fx_mode "bloom", see postfx.py): settings["bloom_quality"] picks
+# the downsample factor the bright pass and blur run at. Channels above
+# BLOOM_THRESHOLD glow, scaled by BLOOM_INTENSITY, blurred
+# BLOOM_BLUR_PASSES times. Only the glowing part of the frame is
+# scaled back up and added; BLOOM_BUDGET_MS is the pass's target at
+# 1080p "medium" (see the measurements in postfx.py).
+BLOOM_QUALITY_FACTORS = {"low": 8, "medium": 6, "high": 4}
+BLOOM_THRESHOLD = 150
+BLOOM_INTENSITY = 1.6
+BLOOM_BLUR_PASSES = 2
+BLOOM_BUDGET_MS = 6.0
+
+# CRT pass (fx_mode "crt", see postfx.py; without numpy or with the pass
+# disabled, crt_mask.png is overlaid instead). CURVATURE bends the image
+# outward by that much at r^2 = 1, CHROMA_OFFSET is the red/blue fringe
+# in pixels at 1920 wide, VIGNETTE darkens towards the corners. The
+# pass runs at CRT_INTERNAL_SCALE of the frame and steps down through
+# CRT_INTERNAL_SCALES while its average time exceeds CRT_BUDGET_MS; it
+# steps back up (at most to CRT_INTERNAL_SCALE) when the next scale is
+# expected to stay under CRT_BUDGET_HEADROOM of the budget. Decisions
+# wait for CRT_BUDGET_SETTLE timed frames at the current scale, whose
+# cost is then remembered. Keep the scales at 1/2^n: fractional
+# upscales (0.75, 0.375) cost more than the pixels they save.
+CRT_PASS_ENABLED = True
+CRT_CURVATURE = 0.08
+CRT_CHROMA_OFFSET = 3
+CRT_VIGNETTE = 0.45
+CRT_INTERNAL_SCALE = 0.5
+CRT_INTERNAL_SCALES = (1.0, 0.5, 0.25)
+CRT_BUDGET_MS = 4.0
+CRT_BUDGET_HEADROOM = 0.7
+CRT_BUDGET_SETTLE = 30
+
+# Menu backdrop (menu_backdrop.py): the scene a menu opens over is frozen
+# once, darkened as a black overlay of alpha MENU_BACKDROP_DIM would, and
+# blurred through 1/MENU_BACKDROP_BLUR of the frame size (0 = no blur).
+MENU_BACKDROP_DIM = 180
+MENU_BACKDROP_BLUR = 0
+
+# Menu redraw (menu_redraw.py): the focused-button pulse advances
+# MENU_PULSE_STEPS times a second; a menu with nothing pulsing still
+# wakes every MENU_IDLE_WAIT_MS to keep background work going.
+MENU_PULSE_STEPS = 12
+MENU_IDLE_WAIT_MS = 500
+
 # Movement / level-up / hit FX tuning
 RUN_DUST_INTERVAL = 0.08         # seconds between run dust puffs
 DASH_TRAIL_INTERVAL = 0.045      # seconds between dash trail puffs
 LEVELUP_PARTICLE_BASE_COUNT = 32 # sparks per level-up burst
 HIT_FLASH_FREQUENCY = 12.0       # Hz for damage flash blink
+LAND_SQUASH_TIME = 0.12          # seconds the player frame squashes after landing
+SPRITE_SQUASH_MAX = 0.18         # width gain / height loss at full squash
+SPRITE_SQUASH_STEPS = 3          # cached squash (and stretch) steps, see sprite_variants.py
 COIN_PICKUP_PARTICLE_BASE_COUNT = 12  # sparks for coin pickups
 
 
@@ -528,6 +686,21 @@ UPGRADE_COSTS = {
 }
 
 
+# ------------------------------------------------------------
+#  CUSTOM LEVEL STREAMING
+# ------------------------------------------------------------
+# Custom levels are split into world-space chunks of this width (px)
+# and each entity only goes live once its left edge is within
+# LEVEL_STREAM_LOOKAHEAD px of the right screen edge (keep it under
+# the 200 px right-edge cull margin of world._update_enemy_behavior).
+LEVEL_CHUNK_WIDTH = 640
+LEVEL_STREAM_LOOKAHEAD = 160
+
+# Tile size (px) of the compiled occupancy grid for custom levels
+# (levels/custom/level_XX.grid). Changing it invalidates the caches.
+LEVEL_TILE_SIZE = 16
+
+
 # ------------------------------------------------------------
 #  MAIN MENU ITEMS
 # ------------------------------------------------------------
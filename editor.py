@@ -1,12 +1,13 @@
 import os
 import json
-import random
 
-from pygame import Rect
 import pygame
 
 import config
 from ui import draw_panel
+from world import release_state_entities
+from streaming import build_level_stream
+from levelgrid import LevelGrid, load_level_grid
 
 WHITE = config.WHITE
 
@@ -73,69 +74,83 @@ def apply_custom_level_to_state(
     scale_factor: float,
 ):
     """
-    Load levels/custom/level_XX.json and populate the current run state.
-    Keeps other state (health, timers) intact and only sets platforms/coins/enemies.
-    Safe if the file is missing or empty.
+    Load levels/custom/level_XX.json and attach it to the current run state
+    as a chunked level stream. Keeps other state (health, timers) intact;
+    every live entity (trees, platforms, coins, enemies, particles) goes
+    back to its pool. Safe if the file is missing or empty.
     """
     data = editor_load_level(level)
 
-    # Platforms
-    plats = []
-    for p in data.get("platforms", []):
-        rect = Rect(int(p["x"]), int(p["y"]), int(p["w"]), int(p["h"]))
-        ptype = p.get("type", "normal")
-        plats.append(
-            {
-                "rect": rect,
-                "type": ptype,
-                "vx": 0.0,
-                "vy": 0.0,
-                "fall_started": False,
-                "fall_timer": 0.0,
-                "fragile_hits": 0,
-                "depth": random.uniform(0.9, 1.1),
-            }
-        )
-    wstate["platforms"] = plats
+    # Live lists start empty; the run loop streams the level in
+    # chunk by chunk as the camera reaches it (see streaming.py).
+    release_state_entities(wstate)
 
-    # Coins
-    coins = []
     if coin_img is not None:
-        cw, ch = coin_img.get_size()
+        coin_size = coin_img.get_size()
     else:
         size = int(32 * scale_factor)
-        cw = ch = size
+        coin_size = (size, size)
 
-    for c in data.get("coins", []):
-        r = Rect(0, 0, cw, ch)
-        r.center = (int(c["x"]), int(c["y"]))
-        coins.append(r)
-    wstate["coins"] = coins
-
-    # Enemies
-    enemies = []
+    enemy_sizes = {}
     for e in data.get("enemies", []):
         kind = e.get("kind", "walker")
+        if kind in enemy_sizes:
+            continue
         img = enemy_sprites.get(kind)
         if img is not None:
-            w, h = img.get_size()
+            enemy_sizes[kind] = img.get_size()
         else:
             size = int(48 * scale_factor)
-            w = h = size
-        r = Rect(0, 0, w, h)
-        r.center = (int(e["x"]), int(e["y"]))
-        enemies.append(
-            {
-                "kind": kind,
-                "rect": r,
-                "vx": 0.0,
-                "vy": 0.0,
-                "t": 0.0,
-                "state": "idle",
-                "base_y": float(r.centery),
-            }
-        )
-    wstate["enemies"] = enemies
+            enemy_sizes[kind] = (size, size)
+
+    grid = load_level_grid(editor_level_path(level), data)
+    wstate["level_stream"] = build_level_stream(data, coin_size, enemy_sizes, grid=grid)
+
+
+# Editor overlap checks keep one grid per platform list: add, move
+# and delete patch it in place (editor_platform_added/moved/removed),
+# and a different list (load, undo/redo, reload from disk) rebuilds it
+_editor_grid = {"platforms": None, "grid": None}
+
+
+def _editor_level_grid(editor_data, build=True):
+    plats = editor_data.get("platforms", [])
+    if _editor_grid["platforms"] is not plats:
+        if not build:
+            return None
+        _editor_grid["platforms"] = plats
+        _editor_grid["grid"] = LevelGrid.from_level(editor_data)
+    return _editor_grid["grid"]
+
+
+def editor_platform_fits(editor_data, x, y, w, h, ignore=-1):
+    """
+    True if a platform at (x, y, w, h) would not overlap any platform of
+    `editor_data` (other than index `ignore`, e.g. the one being moved).
+    """
+    grid = _editor_level_grid(editor_data)
+    return grid.fits(int(x), int(y), int(w), int(h), ignore)
+
+
+def editor_platform_added(editor_data):
+    """The last platform of `editor_data` was just appended."""
+    grid = _editor_level_grid(editor_data, build=False)
+    if grid is not None:
+        grid.add(editor_data["platforms"][-1])
+
+
+def editor_platform_moved(editor_data, idx):
+    """Platform `idx` of `editor_data` was dropped at a new position."""
+    grid = _editor_level_grid(editor_data, build=False)
+    if grid is not None:
+        grid.move(idx, editor_data["platforms"][idx])
+
+
+def editor_platform_removed(editor_data, idx):
+    """Platform `idx` was just deleted from `editor_data`."""
+    grid = _editor_level_grid(editor_data, build=False)
+    if grid is not None:
+        grid.remove(idx)
 
 
 def draw_level_editor(
@@ -0,0 +1,115 @@
+# ============================================================
+#  Slimey - ENTITY RENDERER
+# ------------------------------------------------------------
+# Trees, coins, enemies and platforms used to be drawn with one
+# Python-level blit() per entity, including entities that are
+# not on screen yet (spawned at screen_w + 10..220) or already
+# scrolled off to the left (culled only past -100..-200).
+#
+# EntityRenderer draws a layer at a time:
+#  - add() / cull() skip entities outside the viewport
+#  - visible ones are queued by source page: an atlas frame
+#    (a subsurface, see atlas.py) is queued as its page plus
+#    the frame's area, so every frame of one page goes to SDL
+#    in the same Surface.blits(..., doreturn=False) call
+#  - flush() submits the layer, one blits() per page
+#
+# Nothing is allocated per entity in steady state: queue slots
+# are [page, dest, area] lists recycled between frames, and a
+# frame's area on its page is worked out once per source surface.
+# The area cache is weakly keyed and holds no surfaces, so a
+# dropped sprite or platform composite is freed as usual.
+#
+# Drawn / culled counts per kind and the number of blits()
+# submissions are kept for the debug overlay.
+# ============================================================
+
+import weakref
+
+import pygame
+
+
+class EntityRenderer:
+    """
+    Per-frame culled, batched drawing of entity layers. Call begin()
+    with the viewport once per frame, then add() (or cull() + queue())
+    for each entity of a layer and flush() after each layer, in
+    back-to-front order.
+    """
+
+    def __init__(self):
+        self.viewport = pygame.Rect(0, 0, 0, 0)
+        self.drawn = {}     # kind -> entities drawn this frame
+        self.culled = {}    # kind -> entities skipped this frame
+        self.batches = 0
+        self._areas = weakref.WeakKeyDictionary()     # surface -> its area on its page
+        self._queues = weakref.WeakKeyDictionary()   # page -> [page, dest, area] slots queued this layer
+        self._spare = []    # unused slots
+
+    def begin(self, viewport):
+        self.viewport.update(viewport)
+        for kind in self.drawn:
+            self.drawn[kind] = 0
+            self.culled[kind] = 0
+        self.batches = 0
+
+    def cull(self, kind, rect):
+        """True (and counted as drawn) if `rect` overlaps the viewport."""
+        if kind not in self.drawn:
+            self.drawn[kind] = self.culled[kind] = 0
+        if self.viewport.colliderect(rect):
+            self.drawn[kind] += 1
+            return True
+        self.culled[kind] += 1
+        return False
+
+    def _area(self, img):
+        area = self._areas.get(img)
+        if area is None:
+            x, y = img.get_abs_offset()
+            area = self._areas[img] = pygame.Rect(x, y, img.get_width(), img.get_height())
+        return area
+
+    def queue(self, img, dest):
+        """Queue `img` at `dest` (a Rect or point) for the next flush()."""
+        area = self._area(img)
+        page = img.get_abs_parent()
+        slots = self._queues.get(page)
+        if slots is None:
+            slots = self._queues[page] = []
+        if self._spare:
+            slot = self._spare.pop()
+            slot[0] = page
+            slot[1] = dest
+            slot[2] = area
+        else:
+            slot = [page, dest, area]
+        slots.append(slot)
+
+    def add(self, kind, img, rect, dest=None):
+        """
+        Cull `rect`, then queue `img` at `dest` (default: the rect). Returns
+        whether it was visible; with img None nothing is queued, so the
+        caller can draw its placeholder.
+        """
+        if not self.cull(kind, rect):
+            return False
+        if img is not None:
+            self.queue(img, rect if dest is None else dest)
+        return True
+
+    def flush(self, target):
+        """Draw the queued layer, one blits() per source page."""
+        spare = self._spare
+        for slots in self._queues.values():
+            if slots:
+                target.blits(slots, doreturn=False)
+                self.batches += 1
+                while slots:
+                    slot = slots.pop()
+                    slot[0] = slot[1] = slot[2] = None
+                    spare.append(slot)
+
+    def telemetry(self):
+        parts = [f"{kind} {self.drawn[kind]}/{self.drawn[kind] + self.culled[kind]}" for kind in self.drawn]
+        return "draw " + "  ".join(parts) + f"  blits {self.batches}"
@@ -2,17 +2,38 @@
 Utility script to generate extra game assets using pygame.
 
 Run from the project root:
-    python generate_assets.py
+    python generate_assets.py [--force] [--jobs N] [--asset-report]
 
 It will:
   - Create tinted slime skins (green, purple, gold) based on the default skin.
   - Create a few extra global background variants by tinting existing ones.
-
-Nothing existing is overwritten: files are only written if they do not exist.
+  - Create the scanlines/CRT overlays if they are missing.
+
+Every output is a node in a small build graph: its stamp is the sha1 of
+the job kind, its parameters (tint, size, ...) and the contents of its
+source files. assets/.build_stamps.json remembers the stamp and the
+output's own hash for everything this script wrote, so a rerun only
+rebuilds outputs whose stamp changed (e.g. after a tint tweak) and
+skips the rest. An existing output without a stamp is adopted when its
+pixels match a fresh build; one that differs is recorded as kept, so it
+is checked again only if the file changes. Kept outputs and outputs
+edited since they were generated are listed on every run and never
+overwritten unless --force is given.
+
+Jobs run headless (no display) in a process pool; tinting is
+vectorized with numpy when it is installed (asset_manager.tint_surface).
+
+World backgrounds are not generated: worlds without their own art are
+tinted from the global sets by the game's loader (asset_manager.py).
 """
 
 import os
 import sys
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
 
 try:
     import pygame
@@ -21,49 +42,154 @@ except ImportError:
     print("  python -m pip install pygame")
     sys.exit(1)
 
-import config
+from asset_manager import tint_surface, rgba_copy
+from asset_memory import registry
 
 
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 ASSETS_DIR = os.path.join(PROJECT_ROOT, "assets")
+STAMPS_FILE = os.path.join(ASSETS_DIR, ".build_stamps.json")
 
 
-def ensure_display():
+# ------------------------------------------------------------
+# Build graph
+# ------------------------------------------------------------
+
+def make_job(kind, output, sources=(), **params):
     """
-    Make sure pygame has a tiny display so convert_alpha() etc. work.
-    (Needed when running as an offline generator script.)
+    One output file: `kind` says how to build it (see run_job), `sources`
+    are the files it reads, `params` everything else that shapes it.
     """
-    if not pygame.get_init():
-        pygame.init()
-    if not pygame.display.get_surface():
-        pygame.display.set_mode((1, 1))
+    return {"kind": kind, "output": output, "sources": list(sources), "params": params}
 
 
-def tint_surface(surface, rgb):
-    """Return a tinted copy of a surface."""
-    tinted = surface.copy().convert_alpha()
-    # Multiply existing pixels by the tint color
-    tinted.fill((*rgb, 0), special_flags=pygame.BLEND_RGBA_MULT)
-    return tinted
+def file_hash(path, _memo={}):
+    if path not in _memo:
+        with open(path, "rb") as f:
+            _memo[path] = hashlib.sha1(f.read()).hexdigest()
+    return _memo[path]
 
 
-def ensure_dir(path: str):
-    os.makedirs(path, exist_ok=True)
+def job_stamp(job):
+    raw = json.dumps({
+        "kind": job["kind"],
+        "params": job["params"],
+        "sources": [file_hash(p) for p in job["sources"]],
+    }, sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
 
 
-def generate_tinted_skins():
+def _rel(path):
+    return os.path.relpath(path, ASSETS_DIR).replace(os.sep, "/")
+
+
+def load_stamps():
+    try:
+        with open(STAMPS_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_stamps(stamps):
+    tmp = STAMPS_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(stamps, f, indent=2, sort_keys=True)
+    os.replace(tmp, STAMPS_FILE)
+
+
+def plan(jobs, stamps, force=False):
     """
-    Create extra skins (green, purple, gold) in assets/skins/
-    based on assets/skins/default/ idle/run/jump frames.
+    Split jobs into (to build, to adopt, skipped-reason list). An existing
+    output is rebuilt only if this script wrote it (recorded output hash
+    still matches) and its stamp changed, or with `force`. Existing
+    outputs without a stamp are checked against a fresh build (adopt).
     """
-    ensure_display()
+    todo, adopt, skipped = [], [], []
+    for job in jobs:
+        out = job["output"]
+        stamp = job["stamp"] = job_stamp(job)
+        entry = stamps.get(_rel(out))
+        if not os.path.exists(out) or force:
+            todo.append(job)
+        elif entry is None:
+            adopt.append(job)
+        elif entry.get("kept"):
+            if entry["output"] == file_hash(out):
+                skipped.append((out, "not generated here, differs from a fresh build"))
+            else:
+                adopt.append(job)
+        elif entry["output"] != file_hash(out):
+            skipped.append((out, "edited since generated"))
+        elif entry["stamp"] != stamp:
+            todo.append(job)
+    return todo, adopt, skipped
+
+
+def _same_pixels(surf, path):
+    try:
+        existing = pygame.image.load(path)
+    except pygame.error:
+        return False
+    return (
+        existing.get_size() == surf.get_size()
+        and pygame.image.tobytes(existing, "RGBA") == pygame.image.tobytes(surf, "RGBA")
+    )
+
+
+def run_job(job, adopt=False):
+    """
+    Worker: build one output. Returns (output path, output sha1, peak
+    surface bytes per accounting group during this job) or raises.
+    With `adopt` nothing is written: the sha1 is the existing output's
+    when its pixels match the fresh build, else None.
+    """
+    kind = job["kind"]
+    params = job["params"]
+    group = params.get("group", "generate")
+    # Pool workers run many jobs; report this one's peaks only
+    registry.reset_peaks()
+
+    if kind == "tint":
+        src = registry.track(pygame.image.load(job["sources"][0]), "generate/sources")
+        surf = registry.track(tint_surface(src, params["tint"]), group)
+    elif kind == "copy":
+        surf = registry.track(rgba_copy(pygame.image.load(job["sources"][0])), group)
+    elif kind == "pattern":
+        surf = registry.track(draw_pattern(params["pattern"], tuple(params["size"])), group)
+    else:
+        raise ValueError(f"unknown job kind {kind!r}")
+
+    out = job["output"]
+    if adopt:
+        digest = file_hash(out) if _same_pixels(surf, out) else None
+        return out, digest, dict(registry.peak_groups)
+
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    # Dot-prefixed so the hot reloader ignores the partial file
+    tmp = os.path.join(os.path.dirname(out), "." + os.path.basename(out))
+    pygame.image.save(surf, tmp)
+    os.replace(tmp, out)
+    with open(out, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    return out, digest, dict(registry.peak_groups)
+
+
+# ------------------------------------------------------------
+# Jobs
+# ------------------------------------------------------------
 
+def generate_tinted_skins():
+    """
+    Extra skins (green, purple, gold) in assets/skins/ based on the
+    assets/skins/default/ idle/run/jump frames.
+    """
     skins_root = os.path.join(ASSETS_DIR, "skins")
     default_dir = os.path.join(skins_root, "default")
 
     if not os.path.isdir(default_dir):
         print("[skins] Default skin directory not found:", default_dir)
-        return
+        return []
 
     colors = {
         "green": (140, 255, 160),
@@ -72,70 +198,31 @@ def generate_tinted_skins():
     }
     frame_names = ["idle.png", "run.png", "jump.png"]
 
+    jobs = []
     for skin_name, rgb in colors.items():
-        dst_dir = os.path.join(skins_root, skin_name)
-        ensure_dir(dst_dir)
-        wrote_any = False
-
         for fname in frame_names:
             src_path = os.path.join(default_dir, fname)
-            dst_path = os.path.join(dst_dir, fname)
-
-            if not os.path.exists(src_path):
-                continue
-            if os.path.exists(dst_path):
-                # Keep user-modified or existing art
-                continue
-
-            try:
-                surf = pygame.image.load(src_path).convert_alpha()
-            except Exception as e:
-                print(f"[skins] Failed loading {src_path}: {e}")
-                continue
-
-            tinted = tint_surface(surf, rgb)
-            try:
-                pygame.image.save(tinted, dst_path)
-                wrote_any = True
-                print(f"[skins] Wrote {dst_path}")
-            except Exception as e:
-                print(f"[skins] Failed saving {dst_path}: {e}")
-
-        if not wrote_any:
-            print(f"[skins] No new files written for skin '{skin_name}' (they may already exist).")
+            if os.path.exists(src_path):
+                jobs.append(make_job(
+                    "tint", os.path.join(skins_root, skin_name, fname), [src_path],
+                    tint=list(rgb), group="generate/skins",
+                ))
+    return jobs
 
 
 def generate_extra_backgrounds():
     """
-    Create a couple of extra global background series by tinting background1_*.
+    A couple of extra global background series tinted from background1_*.
     Outputs to assets/backgrounds/background4_*.png, background5_*.png, etc.
     """
-    ensure_display()
-
     bg_root = os.path.join(ASSETS_DIR, "backgrounds")
     if not os.path.isdir(bg_root):
         print("[bg] Backgrounds folder not found:", bg_root)
-        return
+        return []
 
     base_idx = 1
     layers = ["far", "mid", "near"]
 
-    def load_layer(idx, layer):
-        path = os.path.join(bg_root, f"background{idx}_{layer}.png")
-        if not os.path.exists(path):
-            return None
-        try:
-            return pygame.image.load(path).convert_alpha()
-        except Exception as e:
-            print(f"[bg] Failed loading {path}: {e}")
-            return None
-
-    # Use background1_* as the template if available
-    base_layers = {layer: load_layer(base_idx, layer) for layer in layers}
-    if not any(base_layers.values()):
-        print("[bg] No base background1_far/mid/near.png found; skipping background generation.")
-        return
-
     # Define a few tints for new background indices
     new_sets = {
         4: (180, 220, 255),  # pale blue
@@ -143,160 +230,122 @@ def generate_extra_backgrounds():
         6: (200, 200, 255),  # cool night
     }
 
+    jobs = []
     for idx, tint_rgb in new_sets.items():
         for layer in layers:
-            src = base_layers.get(layer)
-            if src is None:
-                continue
-
-            dst_path = os.path.join(bg_root, f"background{idx}_{layer}.png")
-            if os.path.exists(dst_path):
-                continue  # don't overwrite
-
-            tinted = tint_surface(src, tint_rgb)
-            try:
-                pygame.image.save(tinted, dst_path)
-                print(f"[bg] Wrote {dst_path}")
-            except Exception as e:
-                print(f"[bg] Failed saving {dst_path}: {e}")
-
-
-def generate_world_backgrounds_from_global():
-    """
-    For each WORLD_PACK in config.WORLD_PACKS that doesn't already have
-    layered backgrounds, create a simple tinted set based on the global
-    background1_* layers.
-
-    Outputs to:
-        assets/worlds/<world_id>/backgrounds/background1_far|mid|near.png
-    """
-    ensure_display()
-
-    bg_root = os.path.join(ASSETS_DIR, "backgrounds")
-    worlds_root = os.path.join(ASSETS_DIR, "worlds")
-
-    if not os.path.isdir(bg_root) or not os.path.isdir(worlds_root):
-        return
-
-    layers = ["far", "mid", "near"]
-
-    # Collect a few global background sets (1..3) to use as templates.
-    indices = [1, 2, 3]
-
-    def load_global_layer(idx, layer):
-        path = os.path.join(bg_root, f"background{idx}_{layer}.png")
-        if not os.path.exists(path):
-            return None
-        try:
-            return pygame.image.load(path).convert_alpha()
-        except Exception as e:
-            print(f"[world bg] Failed loading {path}: {e}")
-            return None
-
-    global_sets = {}
-    for idx in indices:
-        layer_map = {layer: load_global_layer(idx, layer) for layer in layers}
-        if any(layer_map.values()):
-            global_sets[idx] = layer_map
-
-    if not global_sets:
-        return
-
-    for world_id, cfg in config.WORLD_PACKS.items():
-        world_folder = os.path.join(worlds_root, world_id)
-        bg_folder = os.path.join(world_folder, "backgrounds")
-
-        os.makedirs(bg_folder, exist_ok=True)
-
-        tint = cfg.get("tint") or config.DEFAULT_LEVEL_TINT
-        rgb = tuple(tint[:3])
-
-        for idx, layer_map in global_sets.items():
-            for layer in layers:
-                base = layer_map.get(layer)
-                if base is None:
-                    continue
-
-                dst_path = os.path.join(bg_folder, f"background{idx}_{layer}.png")
-                if os.path.exists(dst_path):
-                    continue
-
-                tinted = tint_surface(base, rgb)
-                try:
-                    pygame.image.save(tinted, dst_path)
-                    print(f"[world bg] Wrote {dst_path}")
-                except Exception as e:
-                    print(f"[world bg] Failed saving {dst_path}: {e}")
+            src = os.path.join(bg_root, f"background{base_idx}_{layer}.png")
+            if os.path.exists(src):
+                jobs.append(make_job(
+                    "tint", os.path.join(bg_root, f"background{idx}_{layer}.png"), [src],
+                    tint=list(tint_rgb), group="generate/backgrounds",
+                ))
+    if not jobs:
+        print("[bg] No base background1_far/mid/near.png found; skipping background generation.")
+    return jobs
 
 
 def generate_fx_overlays():
     """
-    Ensure scanlines/crt mask overlays exist where the game loader expects:
+    Scanlines/CRT mask overlays where the game loader expects them:
         assets/scanlines.png
         assets/crt_mask.png
 
-    If the user has versions in assets/fx/, copy them; otherwise generate
-    simple retro-style placeholders.
+    Versions in assets/fx/ are copied; otherwise simple retro-style
+    placeholders are drawn.
     """
-    ensure_display()
-
     fx_root = os.path.join(ASSETS_DIR, "fx")
 
-    def ensure_overlay(target_name, source_name=None, pattern="scanlines"):
+    jobs = []
+    for target_name, pattern in (("scanlines.png", "scanlines"), ("crt_mask.png", "crt")):
         target_path = os.path.join(ASSETS_DIR, target_name)
-        if os.path.exists(target_path):
-            return
-
-        src_path = None
-        if source_name is not None and os.path.isdir(fx_root):
-            candidate = os.path.join(fx_root, source_name)
-            if os.path.exists(candidate):
-                src_path = candidate
-
-        if src_path:
-            try:
-                surf = pygame.image.load(src_path).convert_alpha()
-                pygame.image.save(surf, target_path)
-                print(f"[fx] Copied {src_path} -> {target_path}")
-                return
-            except Exception as e:
-                print(f"[fx] Failed copying {src_path}: {e}")
-
-        # Fallback: generate a simple placeholder overlay
-        width, height = 1920, 1080
-        surf = pygame.Surface((width, height), pygame.SRCALPHA)
-
-        if pattern == "scanlines":
-            # Dark transparent horizontal lines
-            for y in range(0, height, 4):
-                pygame.draw.line(surf, (0, 0, 0, 60), (0, y), (width, y))
-        elif pattern == "crt":
-            # Soft vignette-style mask
-            overlay = pygame.Surface((width, height), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 0))
-            pygame.draw.rect(
-                overlay,
-                (0, 0, 0, 120),
-                overlay.get_rect().inflate(-80, -80),
-                border_radius=40,
-            )
-            surf.blit(overlay, (0, 0), special_flags=pygame.BLEND_RGBA_SUB)
-
-        try:
-            pygame.image.save(surf, target_path)
-            print(f"[fx] Generated placeholder {target_path}")
-        except Exception as e:
-            print(f"[fx] Failed saving placeholder {target_path}: {e}")
-
-    ensure_overlay("scanlines.png", "scanlines.png", pattern="scanlines")
-    ensure_overlay("crt_mask.png", "crt_mask.png", pattern="crt")
+        candidate = os.path.join(fx_root, target_name)
+        if os.path.exists(candidate):
+            jobs.append(make_job("copy", target_path, [candidate], group="generate/fx"))
+        else:
+            jobs.append(make_job(
+                "pattern", target_path, pattern=pattern, size=[1920, 1080], group="generate/fx",
+            ))
+    return jobs
+
+
+def draw_pattern(pattern, size):
+    """Placeholder overlay: dark scanlines or a soft CRT vignette."""
+    width, height = size
+    surf = pygame.Surface((width, height), pygame.SRCALPHA)
+
+    if pattern == "scanlines":
+        # Dark transparent horizontal lines
+        for y in range(0, height, 4):
+            pygame.draw.line(surf, (0, 0, 0, 60), (0, y), (width, y))
+    elif pattern == "crt":
+        # Soft vignette-style mask
+        overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 0))
+        pygame.draw.rect(
+            overlay,
+            (0, 0, 0, 120),
+            overlay.get_rect().inflate(-80, -80),
+            border_radius=40,
+        )
+        surf.blit(overlay, (0, 0), special_flags=pygame.BLEND_RGBA_SUB)
+    return surf
+
+
+# ------------------------------------------------------------
+# Entry point
+# ------------------------------------------------------------
+
+def _arg_value(name, default):
+    args = sys.argv[1:]
+    if name in args:
+        i = args.index(name)
+        if i + 1 < len(args):
+            return args[i + 1]
+    return default
 
 
 def main():
-    generate_tinted_skins()
-    generate_extra_backgrounds()
-    generate_world_backgrounds_from_global()
-    generate_fx_overlays()
+    force = "--force" in sys.argv[1:]
+    workers = max(1, int(_arg_value("--jobs", os.cpu_count() or 1)))
+
+    jobs = (
+        generate_tinted_skins()
+        + generate_extra_backgrounds()
+        + generate_fx_overlays()
+    )
+    stamps = load_stamps()
+    todo, adopt, skipped = plan(jobs, stamps, force)
+    print(f"[build] {len(todo)} to build, {len(adopt)} to check, "
+          f"{len(jobs) - len(todo) - len(adopt)} up to date or kept")
+
+    peaks = {}
+    if todo or adopt:
+        work = [(job, False) for job in todo] + [(job, True) for job in adopt]
+        with ProcessPoolExecutor(max_workers=min(workers, len(work))) as pool:
+            futures = [(job, checking, pool.submit(run_job, job, checking)) for job, checking in work]
+            for job, checking, future in futures:
+                try:
+                    out, digest, job_peaks = future.result()
+                except Exception as e:
+                    print(f"[build] Failed {_rel(job['output'])}: {e}")
+                    continue
+                for group, nbytes in job_peaks.items():
+                    peaks[group] = max(peaks.get(group, 0), nbytes)
+                if digest is None:
+                    skipped.append((out, "not generated here, differs from a fresh build"))
+                    stamps[_rel(out)] = {"stamp": job["stamp"], "output": file_hash(out), "kept": True}
+                    continue
+                stamps[_rel(out)] = {"stamp": job["stamp"], "output": digest}
+                print(f"[build] {'Adopted' if checking else 'Wrote'} {_rel(out)}")
+        save_stamps(stamps)
+
+    for path, reason in skipped:
+        print(f"[build] Kept {_rel(path)} ({reason}); --force replaces it")
+
+    if "--asset-report" in sys.argv[1:]:
+        # Largest resident size any single job reached, per group
+        for group in sorted(peaks):
+            print(f"  peak {group:<28} {peaks[group] / (1024 * 1024):8.1f} MB")
     print("Done. Launch the game to see new skins, backgrounds, and FX overlays.")
 
 
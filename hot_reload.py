@@ -0,0 +1,238 @@
+# ============================================================
+#  Slimey - HOT RELOAD (dev mode)
+# ------------------------------------------------------------
+# With config.HOT_RELOAD_ENABLED (or `--dev` on the command
+# line) the game watches assets/ and levels/custom/ and picks
+# up edited files while it runs: an artist re-exporting a PNG
+# or re-running generate_assets.py sees the result within a
+# second, without restarting or losing the current run.
+#
+# FileWatcher uses inotify (through ctypes, Linux only) and
+# falls back to an mtime scan every HOT_RELOAD_POLL_INTERVAL
+# seconds elsewhere. Changes are collected until the tree has
+# been quiet for HOT_RELOAD_SETTLE seconds, so a tool writing
+# dozens of files triggers one reload pass, and each file is
+# reloaded once.
+#
+# HotReloader.poll() runs once per frame on the main thread and
+# hands changed asset files to resources.reload_asset_file(),
+# which swaps just that asset into the live tables. The packed
+# copy of an edited file is invalidated (asset_pack.py) and the
+# disk cache misses on its new contents by itself.
+# ============================================================
+
+import os
+import time
+import errno
+import struct
+import ctypes
+import ctypes.util
+
+import config
+from asset_pack import invalidate_asset
+from resources import reload_asset_file
+
+
+# inotify flags (linux/inotify.h)
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_ISDIR = 0x40000000
+_IN_Q_OVERFLOW = 0x4000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT = struct.Struct("iIII")
+
+# Editor temp files and the compiled level grids are never reloaded
+_IGNORED_SUFFIXES = (".tmp", ".swp", "~", ".grid")
+
+
+def _ignored(path):
+    name = os.path.basename(path)
+    return name.startswith(".") or name.endswith(_IGNORED_SUFFIXES)
+
+
+class _Inotify:
+    """Recursive inotify watch over a few directory trees."""
+
+    def __init__(self, roots):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs = {}   # watch descriptor -> directory
+        for root in roots:
+            self._watch_tree(root)
+
+    def _watch_tree(self, root):
+        for dirpath, _, _ in os.walk(root):
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(dirpath), _WATCH_MASK)
+            if wd >= 0:
+                self._dirs[wd] = dirpath
+
+    def read(self):
+        """Changed file paths since the last call (non-blocking)."""
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                if e.errno == errno.EINTR:
+                    continue
+                raise
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, name_len = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset:offset + name_len].rstrip(b"\0").decode("utf-8", "replace")
+                offset += name_len
+                if mask & _IN_Q_OVERFLOW:
+                    # Lost events: report every watched directory's files
+                    for folder in self._dirs.values():
+                        changed.update(os.path.join(folder, f) for f in os.listdir(folder))
+                    continue
+                folder = self._dirs.get(wd)
+                if folder is None or not name:
+                    continue
+                path = os.path.join(folder, name)
+                if mask & _IN_ISDIR:
+                    if mask & (_IN_CREATE | _IN_MOVED_TO):
+                        self._watch_tree(path)
+                        for dirpath, _, files in os.walk(path):
+                            changed.update(os.path.join(dirpath, f) for f in files)
+                    continue
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _Poller:
+    """mtime scan fallback for platforms without inotify."""
+
+    def __init__(self, roots, interval):
+        self.roots = roots
+        self.interval = interval
+        self._next = 0.0
+        self._stamps = self._scan()
+
+    def _scan(self):
+        stamps = {}
+        for root in self.roots:
+            for dirpath, _, files in os.walk(root):
+                for fname in files:
+                    path = os.path.join(dirpath, fname)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    stamps[path] = (st.st_mtime_ns, st.st_size)
+        return stamps
+
+    def read(self):
+        now = time.monotonic()
+        if now < self._next:
+            return set()
+        self._next = now + self.interval
+        stamps = self._scan()
+        old = self._stamps
+        self._stamps = stamps
+        changed = {p for p, stamp in stamps.items() if old.get(p) != stamp}
+        changed.update(p for p in old if p not in stamps)
+        return changed
+
+    def close(self):
+        pass
+
+
+class FileWatcher:
+    """
+    Reports files changed under `roots`, batched: changes() returns
+    nothing until no new change has arrived for `settle` seconds.
+    """
+
+    def __init__(self, roots, settle=None, interval=None):
+        self.roots = [r for r in roots if os.path.isdir(r)]
+        self.settle = config.HOT_RELOAD_SETTLE if settle is None else settle
+        interval = config.HOT_RELOAD_POLL_INTERVAL if interval is None else interval
+        try:
+            self._backend = _Inotify(self.roots)
+            self.mode = "inotify"
+        except (OSError, AttributeError):
+            self._backend = _Poller(self.roots, interval)
+            self.mode = "polling"
+        self._batch = set()
+        self._last_change = 0.0
+
+    def changes(self):
+        found = {p for p in self._backend.read() if not _ignored(p)}
+        now = time.monotonic()
+        if found:
+            self._batch |= found
+            self._last_change = now
+        if not self._batch or now - self._last_change < self.settle:
+            return []
+        batch = sorted(self._batch)
+        self._batch = set()
+        return batch
+
+    def close(self):
+        self._backend.close()
+
+
+class HotReloader:
+    """
+    Per-frame bridge between the FileWatcher and the live asset tables.
+    poll() reloads changed assets in place and returns
+    (changed asset groups, changed custom level files).
+    """
+
+    def __init__(self, assets_dir=None, levels_dir=None):
+        self.assets_dir = os.path.normpath(assets_dir or config.ASSETS_DIR)
+        self.levels_dir = os.path.normpath(levels_dir or os.path.join(config.LEVELS_DIR, "custom"))
+        self.watcher = FileWatcher([self.assets_dir, self.levels_dir])
+        self.reloads = 0
+        self.last_ms = 0.0
+        print(f"[hot_reload] Watching {len(self.watcher.roots)} folders ({self.watcher.mode})")
+
+    def poll(self, assets):
+        changed = self.watcher.changes()
+        if not changed:
+            return set(), []
+
+        start = time.perf_counter()
+        groups = set()
+        levels = []
+        for path in changed:
+            path = os.path.normpath(path)
+            if path.startswith(self.levels_dir + os.sep):
+                if path.endswith(".json"):
+                    levels.append(path)
+                    print(f"[hot_reload] {os.path.relpath(path, self.levels_dir)} -> custom level")
+                continue
+            invalidate_asset(path)
+            try:
+                group = reload_asset_file(assets, path)
+            except Exception as e:
+                print(f"[hot_reload] Failed reloading {path}: {e}")
+                continue
+            if group is not None:
+                groups.add(group)
+                self.reloads += 1
+                print(f"[hot_reload] {os.path.relpath(path, self.assets_dir)} -> {group}")
+        assets["asset_manager"].flush_cache()
+        self.last_ms = (time.perf_counter() - start) * 1000
+        return groups, levels
+
+    def telemetry(self):
+        return f"hot reload {self.watcher.mode}  reloads {self.reloads}  last {self.last_ms:.0f} ms"
+
+    def close(self):
+        self.watcher.close()
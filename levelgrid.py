@@ -0,0 +1,387 @@
+# ============================================================
+#  Slimey - STATIC LEVEL GRID
+# ------------------------------------------------------------
+# Custom levels are static platform layouts, so on load they
+# are compiled into a tile occupancy grid:
+#  - cells: one byte per tile, the platform type code (0 = empty)
+#  - index: per tile, 1 + index into `rects` (0 = empty)
+#  - more: overflow table, cell -> further platforms sharing
+#    that tile (rare: platforms meeting inside one tile)
+#  - rects: the original platform rects, for exact checks
+#
+# Landing/support lookups and the editor's overlap check then
+# touch a handful of cells instead of scanning every platform.
+# Support and fall-through are the same lookup: platforms are
+# one-way, so the player stands on (or drops through to) the
+# first platform top in the landing window under their path.
+# Compiled grids are cached next to the level JSON
+# (levels/custom/level_XX.grid), keyed by the JSON's sha1.
+# ============================================================
+
+import os
+import sys
+import struct
+import hashlib
+from array import array
+
+import config
+
+
+# Stable on-disk type codes; unknown types are stored as "normal"
+GRID_PLATFORM_TYPES = ("normal", "bounce", "fall", "fragile")
+
+_GRID_MAGIC = b"SLGR"
+_GRID_VERSION = 2
+_HEADER = struct.Struct("<4sH20siiiiiI")
+_RECT = struct.Struct("<iiiiB")
+_COUNT = struct.Struct("<I")
+_MORE = struct.Struct("<IH")
+
+
+def platform_rect(p):
+    """(x, y, w, h, type_code) grid rect of a level platform dict."""
+    ptype = p.get("type", "normal")
+    code = GRID_PLATFORM_TYPES.index(ptype) + 1 if ptype in GRID_PLATFORM_TYPES else 1
+    return (int(p["x"]), int(p["y"]), int(p["w"]), int(p["h"]), code)
+
+
+class LevelGrid:
+    """
+    Tile occupancy grid over a custom level's platforms.
+    Coordinates are level (world) pixels; cell (col, row) covers
+    [origin + col * tile, origin + (col + 1) * tile).
+    """
+
+    def __init__(self, tile, origin_x, origin_y, cols, rows, rects, cells=None, index=None, more=None):
+        self.tile = tile
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.cols = cols
+        self.rows = rows
+        self.rects = rects  # [(x, y, w, h, type_code), ...]
+        self.cells = cells if cells is not None else bytearray(cols * rows)
+        self.index = index if index is not None else array("H", bytes(2 * cols * rows))
+        self.more = more if more is not None else {}  # cell -> [platform index, ...]
+
+    # --------------------------------------------------------
+    # Build
+    # --------------------------------------------------------
+    @classmethod
+    def from_level(cls, data, tile=None):
+        if tile is None:
+            tile = config.LEVEL_TILE_SIZE
+
+        rects = [platform_rect(p) for p in data.get("platforms", [])]
+
+        if rects:
+            origin_x = min(0, min(r[0] for r in rects))
+            origin_y = min(0, min(r[1] for r in rects))
+            max_x = max(r[0] + r[2] for r in rects)
+            max_y = max(r[1] + r[3] for r in rects)
+        else:
+            origin_x = origin_y = max_x = max_y = 0
+
+        cols = (max_x - origin_x) // tile + 1
+        rows = (max_y - origin_y) // tile + 1
+        grid = cls(tile, origin_x, origin_y, cols, rows, rects)
+        for i, r in enumerate(rects):
+            grid._stamp(i, r)
+        return grid
+
+    def _cell_span(self, x, y, w, h):
+        """Clamped (c0, c1, r0, r1) cell range covered by a rect."""
+        t = self.tile
+        c0 = max(0, (x - self.origin_x) // t)
+        r0 = max(0, (y - self.origin_y) // t)
+        c1 = min(self.cols - 1, (x + w - 1 - self.origin_x) // t)
+        r1 = min(self.rows - 1, (y + h - 1 - self.origin_y) // t)
+        return c0, c1, r0, r1
+
+    def _stamp(self, i, rect):
+        x, y, w, h, code = rect
+        c0, c1, r0, r1 = self._cell_span(x, y, w, h)
+        cols = self.cols
+        for row in range(r0, r1 + 1):
+            base = row * cols
+            for col in range(c0, c1 + 1):
+                # The first platform owns the cell's type byte; later
+                # ones sharing the tile go to the overflow table
+                if not self.index[base + col]:
+                    self.cells[base + col] = code
+                    self.index[base + col] = i + 1
+                else:
+                    self.more.setdefault(base + col, []).append(i)
+
+    def _unstamp(self, i, rect):
+        x, y, w, h, _ = rect
+        c0, c1, r0, r1 = self._cell_span(x, y, w, h)
+        cols = self.cols
+        for row in range(r0, r1 + 1):
+            base = row * cols
+            for col in range(c0, c1 + 1):
+                cell = base + col
+                more = self.more.get(cell)
+                if self.index[cell] == i + 1:
+                    if more:
+                        # The next platform sharing the tile takes it over
+                        j = more.pop(0)
+                        self.cells[cell] = self.rects[j][4]
+                        self.index[cell] = j + 1
+                    else:
+                        self.cells[cell] = 0
+                        self.index[cell] = 0
+                elif more and i in more:
+                    more.remove(i)
+                if more is not None and not more:
+                    del self.more[cell]
+
+    def _cover(self, rect):
+        """
+        Grow the grid so `rect` fits in it. Growing re-stamps every
+        platform in `rects`; returns True if it did.
+        """
+        x, y, w, h, _ = rect
+        t = self.tile
+        max_x = self.origin_x + self.cols * t - 1
+        max_y = self.origin_y + self.rows * t - 1
+        if x >= self.origin_x and y >= self.origin_y and x + w - 1 <= max_x and y + h - 1 <= max_y:
+            return False
+        self.origin_x = min(self.origin_x, x)
+        self.origin_y = min(self.origin_y, y)
+        self.cols = (max(max_x, x + w - 1) - self.origin_x) // t + 1
+        self.rows = (max(max_y, y + h - 1) - self.origin_y) // t + 1
+        self.cells = bytearray(self.cols * self.rows)
+        self.index = array("H", bytes(2 * self.cols * self.rows))
+        self.more = {}
+        for i, r in enumerate(self.rects):
+            self._stamp(i, r)
+        return True
+
+    def _candidates(self, cell, out):
+        """Append the platform indices stamped on `cell` to `out`."""
+        i = self.index[cell] - 1
+        if i >= 0:
+            out.append(i)
+            more = self.more.get(cell)
+            if more:
+                out.extend(more)
+        return out
+
+    # --------------------------------------------------------
+    # Edits (level editor): touch only the cells of the platform
+    # being changed instead of recompiling the whole layout
+    # --------------------------------------------------------
+    def add(self, p):
+        """Append platform dict `p` as the last platform."""
+        rect = platform_rect(p)
+        self._cover(rect)
+        self.rects.append(rect)
+        self._stamp(len(self.rects) - 1, rect)
+
+    def move(self, i, p):
+        """Platform `i` now has the rect of platform dict `p`."""
+        rect = platform_rect(p)
+        self._unstamp(i, self.rects[i])
+        self.rects[i] = rect
+        if not self._cover(rect):
+            self._stamp(i, rect)
+
+    def remove(self, i):
+        """Drop platform `i`; later platforms shift down by one, like the list."""
+        self._unstamp(i, self.rects[i])
+        del self.rects[i]
+        cols = self.cols
+        for j in range(i, len(self.rects)):
+            x, y, w, h, _ = self.rects[j]
+            c0, c1, r0, r1 = self._cell_span(x, y, w, h)
+            for row in range(r0, r1 + 1):
+                base = row * cols
+                for col in range(c0, c1 + 1):
+                    cell = base + col
+                    if self.index[cell] == j + 2:
+                        self.index[cell] = j + 1
+                    else:
+                        more = self.more.get(cell)
+                        if more and j + 1 in more:
+                            more[more.index(j + 1)] = j
+
+    # --------------------------------------------------------
+    # Queries
+    # --------------------------------------------------------
+    def platform_at(self, x, y):
+        """Index of the platform occupying the cell at (x, y), or -1."""
+        col = (int(x) - self.origin_x) // self.tile
+        row = (int(y) - self.origin_y) // self.tile
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return self.index[row * self.cols + col] - 1
+        return -1
+
+    def type_at(self, x, y):
+        """Platform type name at (x, y), or None for an empty cell."""
+        col = (int(x) - self.origin_x) // self.tile
+        row = (int(y) - self.origin_y) // self.tile
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            code = self.cells[row * self.cols + col]
+            if code:
+                return GRID_PLATFORM_TYPES[code - 1]
+        return None
+
+    def landing_candidate(self, cx0, rdx, b0, rdy, snap_above=15, snap_below=10, usable=None):
+        """
+        Walk the cells under a falling point (feet at `b0`, center x `cx0`,
+        moving by (rdx, rdy) this frame) and return the index of the
+        platform whose top is reached first in the landing window, or -1.
+        Platforms spanning the point beat ones that only share its tiles,
+        which are kept as a fallback for a landing near an edge. `usable(i)`,
+        when given, skips platforms that are gone or no longer static.
+        """
+        lo = b0 - snap_below
+        hi = b0 + max(0, rdy) + snap_above
+        t = self.tile
+        r0 = max(0, (lo - self.origin_y) // t)
+        r1 = min(self.rows - 1, (hi - self.origin_y) // t)
+        rects = self.rects
+        found = []
+        fallback = -1
+        for row in range(r0, r1 + 1):
+            cell_top = self.origin_y + row * t
+            if rdy > 0 and cell_top > b0:
+                frac = min(1.0, (cell_top - b0) / rdy)
+            else:
+                frac = 0.0
+            x = int(cx0 + rdx * frac)
+            col = (x - self.origin_x) // t
+            if not (0 <= col < self.cols):
+                continue
+            best = -1
+            for i in self._candidates(row * self.cols + col, found):
+                px, py, pw = rects[i][0], rects[i][1], rects[i][2]
+                if not (lo <= py <= hi) or (usable is not None and not usable(i)):
+                    continue
+                if px <= x < px + pw:
+                    if best < 0 or py < rects[best][1]:
+                        best = i
+                elif fallback < 0:
+                    fallback = i
+            found.clear()
+            if best >= 0:
+                return best
+        return fallback
+
+    def fits(self, x, y, w, h, ignore=-1):
+        """
+        True if a platform rect (x, y, w, h) overlaps no platform in the
+        grid other than `ignore`. Cells only shortlist candidates.
+        """
+        c0, c1, r0, r1 = self._cell_span(x, y, w, h)
+        cols = self.cols
+        seen = set()
+        found = []
+        for row in range(r0, r1 + 1):
+            base = row * cols
+            for col in range(c0, c1 + 1):
+                for i in self._candidates(base + col, found):
+                    if i == ignore or i in seen:
+                        continue
+                    seen.add(i)
+                    px, py, pw, ph, _ = self.rects[i]
+                    if x < px + pw and px < x + w and y < py + ph and py < y + h:
+                        return False
+                found.clear()
+        return True
+
+    # --------------------------------------------------------
+    # Serialization
+    # --------------------------------------------------------
+    def to_bytes(self, digest):
+        index = array("H", self.index)
+        out = [
+            _HEADER.pack(
+                _GRID_MAGIC, _GRID_VERSION, digest, self.tile,
+                self.origin_x, self.origin_y, self.cols, self.rows, len(self.rects),
+            )
+        ]
+        out.extend(_RECT.pack(*r) for r in self.rects)
+        out.append(bytes(self.cells))
+        if sys.byteorder == "big":
+            index.byteswap()
+        out.append(index.tobytes())
+        out.append(_COUNT.pack(sum(len(v) for v in self.more.values())))
+        for cell in sorted(self.more):
+            out.extend(_MORE.pack(cell, i) for i in self.more[cell])
+        return b"".join(out)
+
+    @classmethod
+    def from_bytes(cls, blob, digest):
+        """Decode a cached grid; None if stale or malformed."""
+        if len(blob) < _HEADER.size:
+            return None
+        magic, version, stored, tile, ox, oy, cols, rows, nrects = _HEADER.unpack_from(blob, 0)
+        if magic != _GRID_MAGIC or version != _GRID_VERSION or stored != digest:
+            return None
+        if tile != config.LEVEL_TILE_SIZE:
+            return None
+
+        off = _HEADER.size
+        ncells = cols * rows
+        end = off + nrects * _RECT.size + ncells * 3
+        if len(blob) < end + _COUNT.size:
+            return None
+        (nmore,) = _COUNT.unpack_from(blob, end)
+        if len(blob) != end + _COUNT.size + nmore * _MORE.size:
+            return None
+
+        rects = [_RECT.unpack_from(blob, off + i * _RECT.size) for i in range(nrects)]
+        off += nrects * _RECT.size
+        cells = bytearray(blob[off:off + ncells])
+        off += ncells
+        index = array("H")
+        index.frombytes(blob[off:off + ncells * 2])
+        if sys.byteorder == "big":
+            index.byteswap()
+        off = end + _COUNT.size
+        more = {}
+        for n in range(nmore):
+            cell, i = _MORE.unpack_from(blob, off + n * _MORE.size)
+            more.setdefault(cell, []).append(i)
+        return cls(tile, ox, oy, cols, rows, rects, cells, index, more)
+
+
+# ------------------------------------------------------------
+# Disk cache
+# ------------------------------------------------------------
+
+def grid_cache_path(level_path):
+    return os.path.splitext(level_path)[0] + ".grid"
+
+
+def load_level_grid(level_path, data):
+    """
+    Return the compiled LevelGrid for a level JSON file, reading the
+    cached .grid when its hash matches and rebuilding (and rewriting
+    the cache) otherwise. `data` is the already-parsed level dict.
+    """
+    digest = None
+    try:
+        with open(level_path, "rb") as f:
+            digest = hashlib.sha1(f.read()).digest()
+    except OSError:
+        # No file on disk (new level): compile, nothing to cache
+        return LevelGrid.from_level(data)
+
+    cache_path = grid_cache_path(level_path)
+    try:
+        with open(cache_path, "rb") as f:
+            grid = LevelGrid.from_bytes(f.read(), digest)
+        if grid is not None:
+            return grid
+    except (OSError, struct.error):
+        pass
+
+    grid = LevelGrid.from_level(data)
+    try:
+        with open(cache_path, "wb") as f:
+            f.write(grid.to_bytes(digest))
+    except OSError as e:
+        print(f"[levelgrid] Could not write cache {cache_path}: {e}")
+    return grid
@@ -0,0 +1,62 @@
+# ============================================================
+#  Slimey - MENU BACKDROP
+# ------------------------------------------------------------
+# Pause, game over, the main menu and the settings screens used
+# to scroll and blit every parallax layer each frame, then
+# allocate a full-screen SRCALPHA overlay, fill it with
+# (0, 0, 0, 180) and blit it before drawing the widgets.
+#
+# MenuBackdrop freezes the frame instead: on the first frame of
+# a menu the finished scene (the last gameplay frame when
+# coming from a run) is captured once, darkened as the overlay
+# did (MENU_BACKDROP_DIM), optionally blurred by a smoothscale
+# round trip through 1/MENU_BACKDROP_BLUR of the size, and
+# converted to the display format. Menu frames then start with
+# one opaque blit of it and only draw their widgets.
+#
+# The backdrop is dropped when a menu hands over to gameplay or
+# the editor, and rebuilt when the frame size changes.
+# ============================================================
+
+import pygame
+
+import config
+from asset_memory import registry
+
+
+class MenuBackdrop:
+    """The captured, pre-darkened scene shown behind menu screens."""
+
+    def __init__(self):
+        self.surface = None
+        self.captures = 0
+
+    def ready(self, size):
+        return self.surface is not None and self.surface.get_size() == tuple(size)
+
+    def capture(self, frame):
+        """Freeze `frame` (a finished scene, before FX) as the backdrop."""
+        w, h = frame.get_size()
+        out = frame.convert()
+        blur = config.MENU_BACKDROP_BLUR
+        if blur > 1:
+            small = pygame.transform.smoothscale(out, (max(1, w // blur), max(1, h // blur)))
+            pygame.transform.smoothscale(small, (w, h), out)
+        # Same result as blitting a black overlay of alpha DIM on top
+        k = 255 - config.MENU_BACKDROP_DIM
+        out.fill((k, k, k), special_flags=pygame.BLEND_RGB_MULT)
+        self.surface = registry.track(out, "fx")
+        self.captures += 1
+        return out
+
+    def draw(self, target):
+        target.blit(self.surface, (0, 0))
+
+    def clear(self):
+        self.surface = None
+
+    def telemetry(self):
+        if self.surface is None:
+            return f"backdrop none  captures {self.captures}"
+        w, h = self.surface.get_size()
+        return f"backdrop {w}x{h}  captures {self.captures}"
@@ -0,0 +1,92 @@
+# ============================================================
+#  Slimey - MENU REDRAW
+# ------------------------------------------------------------
+# Menu screens used to be rendered and flipped at the full
+# frame rate even when nothing on them changed; the only
+# animation is the focused-button pulse (ui.draw_button).
+#
+# While a menu sits on its frozen backdrop (menu_backdrop.py)
+# the main loop asks MenuRedraw for its events instead of
+# polling: pygame.event.wait() blocks until input arrives or
+# the next pulse step is due (ui.pulse_step, MENU_PULSE_STEPS
+# per second), or MENU_IDLE_WAIT_MS when nothing pulses.
+#
+# Each menu frame logs its widgets (ui.start_widget_log) and
+# dirty_rects() compares them with the last presented frame:
+#  - a new state or frame size, input other than mouse motion,
+#    or a pass that touches the whole frame -> full flip
+#  - otherwise only the widgets that look different (hover,
+#    pulse) are copied to the screen and display.update()d
+#  - nothing changed -> nothing is presented
+# ============================================================
+
+import time
+
+import pygame
+
+import config
+
+
+# Events that cannot change what a menu shows by themselves
+_QUIET_EVENTS = (pygame.NOEVENT, pygame.MOUSEMOTION)
+
+
+class MenuRedraw:
+    """Blocking event waits and per-widget dirty rects for menu frames."""
+
+    def __init__(self):
+        self._key = None       # (state, frame size) last presented
+        self._widgets = {}     # rect tuple -> signature last presented
+        self.pulsing = False
+        self.waits = 0
+        self.presents = {"full": 0, "rects": 0, "none": 0}
+
+    def events(self, idle):
+        """This frame's events; when `idle`, blocks until one arrives or a pulse step is due."""
+        if not idle:
+            return pygame.event.get()
+        self.waits += 1
+        first = pygame.event.wait(self.timeout_ms())
+        if first.type == pygame.NOEVENT:
+            return []
+        return [first] + pygame.event.get()
+
+    def timeout_ms(self):
+        if not self.pulsing:
+            return config.MENU_IDLE_WAIT_MS
+        step_ms = 1000.0 / config.MENU_PULSE_STEPS
+        return max(1, int(step_ms - (time.time() * 1000.0) % step_ms) + 1)
+
+    def quiet(self, events):
+        """True if none of `events` can change a menu beyond its widgets."""
+        return all(event.type in _QUIET_EVENTS for event in events)
+
+    def dirty_rects(self, key, widgets, full=False):
+        """
+        Rects to present for a menu frame drawn with `widgets` (from
+        ui.stop_widget_log), or None when the whole frame must be flipped.
+        """
+        current = {}
+        for rect, signature in widgets:
+            current[(rect.x, rect.y, rect.w, rect.h)] = signature
+        previous, self._widgets = self._widgets, current
+        self.pulsing = any(sig[0] == "button" and sig[-1] is not None for sig in current.values())
+        if full or key != self._key:
+            self._key = key
+            self.presents["full"] += 1
+            return None
+
+        rects = [pygame.Rect(r) for r, sig in current.items() if previous.get(r) != sig]
+        rects.extend(pygame.Rect(r) for r in previous if r not in current)
+        self.presents["rects" if rects else "none"] += 1
+        return rects
+
+    def reset(self):
+        """Forget the last menu frame (gameplay took over the screen)."""
+        self._key = None
+        self._widgets = {}
+        self.pulsing = False
+
+    def telemetry(self):
+        p = self.presents
+        return f"menu redraw waits {self.waits}  full {p['full']}  rects {p['rects']}  none {p['none']}"
@@ -0,0 +1,107 @@
+# ============================================================
+#  Slimey - PLATFORM ART
+# ------------------------------------------------------------
+# Platforms are drawn from assets/platforms/platform_<type>.png
+# instead of two draw.rect() calls per platform per frame.
+#
+# A platform of any width is composed once from its texture:
+# the left/right caps (config.PLATFORM_TEXTURE_CAP pixels each
+# at 1920x1080) are kept as they are, the part between them is
+# tiled across the width, and the texture is stretched to the
+# platform's height when it differs. The type's
+# PLATFORM_TYPE_COLORS entry is then applied ("add" mode adds
+# its colour). Types without a texture get the flat base
+# colour with a white outline.
+#
+# Composites are cached by (type, width, height, scale), so
+# every platform of a given size (all custom-level platforms
+# from the editor share a handful) is one blit. Random widths
+# from spawn_platform() churn through an LRU of
+# config.PLATFORM_CACHE_SIZE entries.
+# ============================================================
+
+from collections import OrderedDict
+
+import pygame
+
+import config
+from asset_manager import classify_surface, finish_surface
+from asset_memory import registry
+
+
+class PlatformArt:
+    """
+    Platform type -> texture, plus the LRU of composed platform
+    surfaces. surface(ptype, w, h) is the only call the draw loop needs.
+    """
+
+    def __init__(self, textures, scale_factor, capacity=None):
+        self.textures = dict(textures)
+        self.scale_factor = scale_factor
+        self.capacity = capacity or config.PLATFORM_CACHE_SIZE
+        self._cache = OrderedDict()   # (type, w, h, scale) -> surface
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def set_texture(self, ptype, img):
+        """Swap one type's texture (hot reload) and drop its composites."""
+        self.textures[ptype] = img
+        for key in [k for k in self._cache if k[0] == ptype]:
+            del self._cache[key]
+
+    def clear(self):
+        self._cache.clear()
+
+    def surface(self, ptype, w, h):
+        key = (ptype, w, h, self.scale_factor)
+        img = self._cache.get(key)
+        if img is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return img
+
+        self.misses += 1
+        img = registry.track(self._compose(ptype, w, h), "platforms")
+        self._cache[key] = img
+        if len(self._cache) > self.capacity:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+        return img
+
+    def _compose(self, ptype, w, h):
+        out = pygame.Surface((w, h), pygame.SRCALPHA)
+        tex = self.textures.get(ptype)
+        if tex is None:
+            out.fill(config.PLATFORM_BASE_COLOR)
+        else:
+            self._tile(out, tex, w, h)
+
+        style = config.PLATFORM_TYPE_COLORS.get(ptype, {"mode": "base"})
+        if style["mode"] == "add":
+            out.fill(style["color"], special_flags=pygame.BLEND_RGB_ADD)
+        if tex is None:
+            pygame.draw.rect(out, config.WHITE, out.get_rect(), 2)
+        return finish_surface(out, classify_surface(out))
+
+    def _tile(self, out, tex, w, h):
+        tw, th = tex.get_size()
+        if th != h:
+            tex = pygame.transform.scale(tex, (tw, h))
+        cap = int(config.PLATFORM_TEXTURE_CAP * self.scale_factor * h / th)
+        cap = min(cap, w // 2, (tw - 1) // 2)
+        if cap > 0:
+            out.blit(tex, (0, 0), (0, 0, cap, h))
+            out.blit(tex, (w - cap, 0), (tw - cap, 0, cap, h))
+        mid = tw - 2 * cap
+        x = cap
+        while x < w - cap:
+            span = min(mid, w - cap - x)
+            out.blit(tex, (x, 0), (cap, 0, span, h))
+            x += span
+
+    def telemetry(self):
+        return (
+            f"platforms cached {len(self._cache)}/{self.capacity}  hits {self.hits}  "
+            f"misses {self.misses}  evicted {self.evictions}"
+        )
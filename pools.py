@@ -0,0 +1,167 @@
+# ============================================================
+#  Slimey - ENTITY POOLS
+# ------------------------------------------------------------
+# Free-list pools for the short-lived things the run loop
+# spawns and culls every few frames:
+#  - trees / coins      (pygame.Rect)
+#  - platforms / enemies (dicts, see world.spawn_*)
+#  - dust / spark particles (dicts)
+#
+# Spawners acquire a recycled object and overwrite every field;
+# culling loops swap-remove in place and hand the object back.
+# Once the pools have grown to the peak entity count, a run
+# allocates no new entity objects or lists per frame.
+# ============================================================
+
+import pygame
+
+
+class EntityPool:
+    """
+    Free-list pool for a single entity kind.
+    `factory` builds a blank entity when the free list is empty.
+    """
+
+    def __init__(self, kind, factory, prealloc=0):
+        self.kind = kind
+        self._factory = factory
+        self._free = []
+        self.created = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+
+        for _ in range(prealloc):
+            self._free.append(factory())
+            self.created += 1
+
+    def acquire(self):
+        if self._free:
+            obj = self._free.pop()
+        else:
+            obj = self._factory()
+            self.created += 1
+        self.in_use += 1
+        if self.in_use > self.peak_in_use:
+            self.peak_in_use = self.in_use
+        return obj
+
+    def release(self, obj):
+        self.in_use -= 1
+        self._free.append(obj)
+
+    def release_all(self, items):
+        """Release every object in `items` and empty the list in place."""
+        for obj in items:
+            self.release(obj)
+        items.clear()
+
+    def stats(self):
+        return {
+            "kind": self.kind,
+            "in_use": self.in_use,
+            "free": len(self._free),
+            "created": self.created,
+            "peak": self.peak_in_use,
+        }
+
+
+# ------------------------------------------------------------
+# Blank entity factories
+# ------------------------------------------------------------
+
+def _new_rect():
+    return pygame.Rect(0, 0, 0, 0)
+
+
+def _new_platform():
+    return {
+        "rect": pygame.Rect(0, 0, 0, 0),
+        "type": "normal",
+        "vx": 0.0,
+        "vy": 0.0,
+        "fall_started": False,
+        "fall_timer": 0.0,
+        "fragile_hits": 0,
+        "depth": 1.0,
+        "grid_id": -1,
+    }
+
+
+def _new_enemy():
+    return {
+        "kind": "walker",
+        "rect": pygame.Rect(0, 0, 0, 0),
+        "vx": 0.0,
+        "vy": 0.0,
+        "t": 0.0,
+        "state": "idle",
+        "base_y": 0.0,
+        "remove": False,
+    }
+
+
+def _new_particle():
+    return {
+        "x": 0.0,
+        "y": 0.0,
+        "vx": 0.0,
+        "vy": 0.0,
+        "size": 1,
+        "color": (255, 255, 255),
+        "life": 0.0,
+        "max_life": 1.0,
+    }
+
+
+# Rough steady-state counts at 60 FPS on late levels; pools still
+# grow on demand past these.
+POOL_PREALLOC = {
+    "tree": 16,
+    "coin": 32,
+    "platform": 16,
+    "enemy": 48,
+    "particle": 256,
+}
+
+
+def make_entity_pools():
+    """
+    Build one pool per entity kind. Created once in main() and
+    shared by every run so recycled objects survive restarts.
+    """
+    return {
+        "tree": EntityPool("tree", _new_rect, POOL_PREALLOC["tree"]),
+        "coin": EntityPool("coin", _new_rect, POOL_PREALLOC["coin"]),
+        "platform": EntityPool("platform", _new_platform, POOL_PREALLOC["platform"]),
+        "enemy": EntityPool("enemy", _new_enemy, POOL_PREALLOC["enemy"]),
+        "particle": EntityPool("particle", _new_particle, POOL_PREALLOC["particle"]),
+    }
+
+
+# ------------------------------------------------------------
+# In-place culling
+# ------------------------------------------------------------
+
+def swap_remove(items, idx):
+    """
+    Remove items[idx] in O(1) by moving the last element into its slot.
+    Order is not preserved; callers must not advance their index after
+    removing (the slot now holds an unvisited element).
+    """
+    last = items.pop()
+    if idx < len(items):
+        items[idx] = last
+
+
+def pool_telemetry(pools):
+    """
+    One short line per pool for the debug overlay.
+    """
+    lines = []
+    for pool in pools.values():
+        s = pool.stats()
+        lines.append(
+            f"{s['kind']:<8} live {s['in_use']:4d}  free {s['free']:4d}  "
+            f"peak {s['peak']:4d}  created {s['created']:4d}"
+        )
+    return lines
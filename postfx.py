@@ -0,0 +1,361 @@
+# ============================================================
+#  Slimey - POST-PROCESSING
+# ------------------------------------------------------------
+# Full-frame passes applied to the finished frame before the
+# debug overlay, selected by settings["fx_mode"] (FX_MODES).
+# "scanlines" is a plain mask overlay (resources.py); "bloom"
+# and "crt" are computed here. Bloom:
+#
+#   frame --nearest--> pre (2/N) --smoothscale--> small (1/N)
+#   small: bright pass (keep what is above BLOOM_THRESHOLD,
+#          times BLOOM_INTENSITY) + separable blur
+#   small --smoothscale--> half --nearest x2--> glow
+#   frame += glow (BLEND_RGB_ADD)
+#
+# N comes from settings["bloom_quality"] (BLOOM_QUALITY_FACTORS);
+# the blur and bright pass run at that resolution, so the cost
+# is dominated by the scale passes. The bright pass and the
+# [1 2 1] blur use numpy on surfarray views when it is
+# installed; without it they fall back to blend fills and
+# extra down/up scale passes. With numpy the blur also yields
+# the bounding box of the glow, and only that box is scaled up
+# and added (nothing at all on a frame with nothing bright).
+#
+# Measured at 1920x1080 "medium" on a slow single core: 3 ms
+# with nothing bright, 5.5 ms with glow over half the frame,
+# 6.5 ms when all of it glows (8-10.5 ms before the glow box and
+# the cheaper downsample). "low" stays at 2-5 ms, "high" takes
+# 6-13 ms. BLOOM_BUDGET_MS states the "medium" budget; F3 shows
+# the pass time next to it.
+#
+# CRT (config.CRT_PASS_ENABLED, needs numpy; otherwise the
+# static crt_mask.png overlay is used) runs at
+# CRT_INTERNAL_SCALE of the frame: one gather through a
+# precomputed barrel-distortion index table on the packed
+# pixels (surfarray.pixels2d), a red/blue horizontal fringe
+# from shifted slices, and a precomputed vignette blitted with
+# BLEND_RGB_MULT. While its running average exceeds
+# CRT_BUDGET_MS it steps down through CRT_INTERNAL_SCALES, and
+# back up towards CRT_INTERNAL_SCALE once there is headroom; a
+# new frame size starts again from CRT_INTERNAL_SCALE. Still
+# over budget at the lowest scale shows as OVER BUDGET on F3.
+#
+# Intermediate surfaces and tables are allocated once per frame
+# size and quality (or internal scale) and reused every frame.
+# ============================================================
+
+import time
+
+import pygame
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import config
+
+
+class Bloom:
+    """Bright-pass + blur glow added back onto the frame, with reused buffers."""
+
+    def __init__(self):
+        self._key = None
+        self._pre = None
+        self._half = None
+        self._small = None
+        self._tiny = None
+        self._glow = None
+        self._work = None     # two uint16 (h, w, 4) arrays for the numpy blur
+        self._lit = None      # (h, w) uint32 scratch for the glow bounding box
+        self._luts = None     # ((threshold, intensity), bright-pass LUT, gain LUT)
+
+    def _buffers(self, frame, factor):
+        w, h = frame.get_size()
+        key = (w, h, factor, frame.get_bitsize(), frame.get_flags() & pygame.SRCALPHA)
+        if key != self._key:
+            flags = frame.get_flags() & pygame.SRCALPHA
+            small = (max(1, w // factor), max(1, h // factor))
+            half = (max(1, w // 2), max(1, h // 2))
+            pre = (min(half[0], small[0] * 2), min(half[1], small[1] * 2))
+            self._pre = pygame.Surface(pre, flags, frame)
+            self._half = pygame.Surface(half, flags, frame)
+            self._small = pygame.Surface(small, flags, frame)
+            self._tiny = pygame.Surface((max(1, small[0] // 2), max(1, small[1] // 2)), flags, frame)
+            self._glow = pygame.Surface((w, h), flags, frame)
+            if numpy is not None:
+                shape = (small[1], small[0], 4)
+                self._work = (numpy.empty(shape, numpy.uint16), numpy.empty(shape, numpy.uint16))
+                self._lit = numpy.empty((small[1], small[0]), numpy.uint32)
+            self._key = key
+
+    def apply(self, frame, quality="medium"):
+        """Add the bloom of `frame` onto it in place."""
+        factor = config.BLOOM_QUALITY_FACTORS.get(quality, config.BLOOM_QUALITY_FACTORS["medium"])
+        self._buffers(frame, factor)
+        pre, half, small, glow = self._pre, self._half, self._small, self._glow
+
+        pygame.transform.scale(frame, pre.get_size(), pre)
+        pygame.transform.smoothscale(pre, small.get_size(), small)
+        if numpy is not None and small.get_bytesize() == 4:
+            box = self._bright_blur_numpy(small)
+            if box is None:
+                return
+        else:
+            self._bright_blur_blend(small)
+            box = small.get_rect()
+
+        # The glow box in each buffer (its own edges rounded outward)
+        sw, sh = small.get_size()
+        hw, hh = half.get_size()
+        x0, y0, x1, y1 = box.left, box.top, box.right, box.bottom
+        hbox = pygame.Rect(x0 * hw // sw, y0 * hh // sh, 0, 0)
+        hbox.w = -(-x1 * hw // sw) - hbox.x
+        hbox.h = -(-y1 * hh // sh) - hbox.y
+        gbox = pygame.Rect(hbox.x * 2, hbox.y * 2, hbox.w * 2, hbox.h * 2).clip(glow.get_rect())
+
+        pygame.transform.smoothscale(small.subsurface(box), hbox.size, half.subsurface(hbox))
+        pygame.transform.scale(half.subsurface(hbox), gbox.size, glow.subsurface(gbox))
+        frame.blit(glow, gbox, gbox, special_flags=pygame.BLEND_RGB_ADD)
+
+    def _bright_blur_numpy(self, small):
+        """
+        Bright pass + blur of `small` in place. Returns the bounding Rect
+        of the glow (one pixel of margin for the upscale filter), or None
+        when nothing glows.
+        """
+        t = config.BLOOM_THRESHOLD
+        if self._luts is None or self._luts[0] != (t, config.BLOOM_INTENSITY):
+            levels = numpy.arange(256)
+            bright = numpy.maximum(levels - t, 0).astype(numpy.uint16)
+            gain = numpy.minimum(levels * config.BLOOM_INTENSITY, 255).astype(numpy.uint8)
+            self._luts = ((t, config.BLOOM_INTENSITY), bright, gain)
+        _, bright, gain = self._luts
+
+        # Bytes of the packed pixels as a contiguous (h, w, 4) view; alpha goes
+        # through the same math, the glow is added with BLEND_RGB_ADD anyway.
+        # Everything below writes into the reused work arrays (no temporaries).
+        w, h = small.get_size()
+        packed = pygame.surfarray.pixels2d(small)
+        px = packed.T.view(numpy.uint8).reshape(h, w, 4)
+        a, b = self._work
+        numpy.take(bright, px, out=a, mode="clip")
+        add, shift = numpy.add, numpy.right_shift
+        for _ in range(config.BLOOM_BLUR_PASSES):
+            # [1 2 1] / 4 along y, then along x (edges clamped)
+            mid = b[1:-1]
+            add(a[:-2], a[2:], out=mid)
+            add(mid, a[1:-1], out=mid)
+            add(mid, a[1:-1], out=mid)
+            shift(mid, 2, out=mid)
+            b[0], b[-1] = a[0], a[-1]
+            mid = a[:, 1:-1]
+            add(b[:, :-2], b[:, 2:], out=mid)
+            add(mid, b[:, 1:-1], out=mid)
+            add(mid, b[:, 1:-1], out=mid)
+            shift(mid, 2, out=mid)
+            a[:, 0], a[:, -1] = b[:, 0], b[:, -1]
+        numpy.take(gain, a, out=px, mode="clip")
+        del px
+
+        # Alpha went through the math too: only colour channels count
+        rmask, gmask, bmask, _ = small.get_masks()
+        lit = self._lit
+        numpy.bitwise_and(packed.T, numpy.uint32(rmask | gmask | bmask), out=lit)
+        del packed
+        rows = numpy.flatnonzero(lit.any(axis=1))
+        if not len(rows):
+            return None
+        cols = numpy.flatnonzero(lit.any(axis=0))
+        return pygame.Rect(
+            int(cols[0]), int(rows[0]), int(cols[-1] - cols[0]) + 1, int(rows[-1] - rows[0]) + 1
+        ).inflate(2, 2).clip(small.get_rect())
+
+    def _bright_blur_blend(self, small):
+        t = config.BLOOM_THRESHOLD
+        small.fill((t, t, t), special_flags=pygame.BLEND_RGB_SUB)
+        gain = config.BLOOM_INTENSITY
+        if gain > 1.0:
+            # Multiplies cannot go above 1: double by self-adds, then scale down
+            while gain > 2.0:
+                small.blit(small, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+                gain /= 2.0
+            small.blit(small, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+            gain /= 2.0
+        k = int(255 * gain)
+        small.fill((k, k, k), special_flags=pygame.BLEND_RGB_MULT)
+        tiny = self._tiny
+        for _ in range(config.BLOOM_BLUR_PASSES):
+            pygame.transform.smoothscale(small, tiny.get_size(), tiny)
+            pygame.transform.smoothscale(tiny, small.get_size(), small)
+
+
+class CRT:
+    """
+    Barrel distortion + chromatic fringe + vignette, remapped through
+    lookup tables built once per frame size and internal scale.
+    """
+
+    def __init__(self):
+        self.scale = config.CRT_INTERNAL_SCALE
+        self.avg_ms = 0.0
+        self.samples = 0          # frames timed at the current scale
+        self.over_budget = False  # no cheaper scale left and still over budget
+        self._cost = {}           # scale -> settled average ms at this frame size
+        self._size = None
+        self._key = None
+
+    @staticmethod
+    def available():
+        return numpy is not None and config.CRT_PASS_ENABLED
+
+    def _build(self, frame):
+        fw, fh = frame.get_size()
+        w, h = max(1, int(fw * self.scale)), max(1, int(fh * self.scale))
+        flags = frame.get_flags() & pygame.SRCALPHA
+        self._src = pygame.Surface((w, h), flags, frame)
+        self._dst = pygame.Surface((w, h), flags, frame)
+        self._vignette = pygame.Surface((w, h), 0, 32)
+        self._tmp = numpy.empty((h, w), numpy.uint32)
+        self._fringe = numpy.empty((h, w), numpy.uint32)
+
+        # Source pixel for every output pixel: u, v in [-1, 1], pushed
+        # outward by CRT_CURVATURE * r^2 (barrel)
+        v = numpy.linspace(-1.0, 1.0, h)[:, None]
+        u = numpy.linspace(-1.0, 1.0, w)[None, :]
+        r2 = u * u + v * v
+        bend = 1.0 + config.CRT_CURVATURE * r2
+        su, sv = u * bend, v * bend
+        inside = (numpy.abs(su) <= 1.0) & (numpy.abs(sv) <= 1.0)
+        sx = numpy.clip(numpy.rint((su + 1.0) * 0.5 * (w - 1)), 0, w - 1).astype(numpy.int32)
+        sy = numpy.clip(numpy.rint((sv + 1.0) * 0.5 * (h - 1)), 0, h - 1).astype(numpy.int32)
+        self._index = (sy * w + sx).ravel()
+
+        # Darkening towards the corners; black outside the curved screen
+        shade = numpy.clip(1.0 - config.CRT_VIGNETTE * r2 * 0.5, 0.0, 1.0) * inside
+        px = pygame.surfarray.pixels3d(self._vignette)
+        px[...] = (shade.T * 255).astype(numpy.uint8)[:, :, None]
+        del px
+
+        self._shift = max(0, int(round(config.CRT_CHROMA_OFFSET * w / 1920)))
+        self._key = (fw, fh, frame.get_bitsize(), flags, self.scale)
+
+    def _set_scale(self, scale):
+        self.scale = scale
+        self.avg_ms = 0.0
+        self.samples = 0
+
+    def apply(self, frame):
+        """Warp `frame` in place; returns the time it took in ms (tables excluded)."""
+        fw, fh = frame.get_size()
+        if self._size != (fw, fh):
+            # New frame size: start again from the configured quality
+            self._size = (fw, fh)
+            self._set_scale(config.CRT_INTERNAL_SCALE)
+            self._cost.clear()
+            self.over_budget = False
+        if self._key != (fw, fh, frame.get_bitsize(), frame.get_flags() & pygame.SRCALPHA, self.scale):
+            self._build(frame)
+        start = time.perf_counter()
+        src, dst, tmp = self._src, self._dst, self._tmp
+
+        # Pixels as packed 32-bit words, row-major (h, w) views
+        pygame.transform.scale(frame, src.get_size(), src)
+        flat = pygame.surfarray.pixels2d(src).T.reshape(-1)
+        out = pygame.surfarray.pixels2d(dst).T
+        numpy.take(flat, self._index, out=tmp.reshape(-1))
+        out[...] = tmp
+        k = self._shift
+        if k:
+            # Chromatic fringe: red sampled k pixels to the right, blue to the left
+            rmask, _, bmask, _ = dst.get_masks()
+            fringe = self._fringe
+            numpy.bitwise_and(out, ~numpy.uint32(rmask | bmask), out=out)
+            numpy.bitwise_and(tmp, numpy.uint32(rmask), out=fringe)
+            numpy.bitwise_or(out[:, :-k], fringe[:, k:], out=out[:, :-k])
+            numpy.bitwise_and(tmp, numpy.uint32(bmask), out=fringe)
+            numpy.bitwise_or(out[:, k:], fringe[:, :-k], out=out[:, k:])
+        del flat, out
+
+        dst.blit(self._vignette, (0, 0), special_flags=pygame.BLEND_RGB_MULT)
+        pygame.transform.scale(dst, (fw, fh), frame)
+
+        ms = (time.perf_counter() - start) * 1000
+        self.avg_ms = ms if not self.samples else self.avg_ms * 0.95 + ms * 0.05
+        self.samples += 1
+        self._fit_budget()
+        return ms
+
+    def _fit_budget(self):
+        """
+        Once CRT_BUDGET_SETTLE frames are timed at the current scale, its
+        cost is recorded. Over CRT_BUDGET_MS, step down to the next lower
+        scale not measured to be slower; under it, step back up (never
+        past CRT_INTERNAL_SCALE) when the higher scale's measured cost, or
+        before it was measured its pixel-count estimate, stays under
+        CRT_BUDGET_HEADROOM of the budget.
+        """
+        if self.samples < config.CRT_BUDGET_SETTLE:
+            return
+        cost = self._cost
+        cost[self.scale] = self.avg_ms
+        budget = config.CRT_BUDGET_MS
+        if self.avg_ms > budget:
+            lower = [
+                s for s in config.CRT_INTERNAL_SCALES
+                if s < self.scale and cost.get(s, 0.0) < self.avg_ms
+            ]
+            if lower:
+                self._set_scale(max(lower))
+            else:
+                self.over_budget = True
+            return
+        self.over_budget = False
+        higher = [s for s in config.CRT_INTERNAL_SCALES if self.scale < s <= config.CRT_INTERNAL_SCALE]
+        if higher:
+            up = min(higher)
+            expected = cost.get(up, self.avg_ms * (up / self.scale) ** 2)
+            if expected < budget * config.CRT_BUDGET_HEADROOM:
+                self._set_scale(up)
+
+
+class PostFX:
+    """The full-frame passes of the FX modes, with per-pass timings."""
+
+    def __init__(self):
+        self.bloom = Bloom()
+        self.crt = CRT()
+        self.last_ms = {}   # pass name -> ms spent last time it ran
+
+    def computed(self, settings):
+        """Whether apply() has a pass for `settings["fx_mode"]` (else the mode's mask is used)."""
+        mode = settings.get("fx_mode", "off")
+        return mode == "bloom" or (mode == "crt" and self.crt.available())
+
+    def apply(self, frame, settings):
+        """
+        Run the pass `settings["fx_mode"]` selects. Returns False when the
+        mode has no computed pass here (the caller blits its mask instead).
+        """
+        mode = settings.get("fx_mode", "off")
+        if mode == "bloom":
+            start = time.perf_counter()
+            self.bloom.apply(frame, settings.get("bloom_quality", "medium"))
+            self.last_ms["bloom"] = (time.perf_counter() - start) * 1000
+            return True
+        if mode == "crt" and self.crt.available():
+            self.last_ms["crt"] = self.crt.apply(frame)
+            return True
+        return False
+
+    def telemetry(self):
+        parts = [f"{name} {ms:.1f} ms" for name, ms in self.last_ms.items()]
+        if "bloom" in self.last_ms:
+            parts.append(f"bloom budget {config.BLOOM_BUDGET_MS:.1f} ms")
+        if "crt" in self.last_ms:
+            crt = self.crt
+            parts.append(
+                f"crt scale {crt.scale:.2f} avg {crt.avg_ms:.1f}/{config.CRT_BUDGET_MS:.1f} ms"
+                + ("  OVER BUDGET" if crt.over_budget else "")
+            )
+        return "postfx " + ("  ".join(parts) if parts else "idle")
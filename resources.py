@@ -1,5 +1,8 @@
 import os
 import json
+from collections import OrderedDict
+from collections.abc import Mapping
+
 import pygame
 
 from config import (
@@ -8,10 +11,11 @@ from config import (
     REFERENCE_WIDTH,
     REFERENCE_HEIGHT,
     SUPPORTED_RESOLUTIONS,
-    BACKGROUND_AUTO_PREFIX,
     SKIN_LIST,
+    SKIN_CACHE_SIZE,
     WORLD_PACKS,
     ENEMY_VISUAL_CONFIG,
+    PLATFORM_TYPE_CONFIG,
     SOUND_JUMP_FILE,
     SOUND_COIN_FILE,
     SOUND_HIT_FILE,
@@ -19,7 +23,13 @@ from config import (
     MUSIC_FILE,
     SAVE_FILE,
     ASSETS_DIR,
+    PRECISE_COLLISION_DEFAULT,
 )
+from collision import build_mask
+from asset_manager import AssetManager
+from asset_pack import asset_exists, asset_isdir, asset_listdir, load_image_file, load_sound_file
+from asset_memory import registry
+from platform_art import PlatformArt
 
 
 # ============================================================
@@ -36,6 +46,8 @@ def _default_save():
             "fullscreen": DEFAULT_FULLSCREEN,
             "vsync": True,
             "fx_mode": "scanlines",
+            "bloom_quality": "medium",
+            "precise_collision": PRECISE_COLLISION_DEFAULT,
             "particles_enabled": True,
             "particle_density": "medium",
             "difficulty": "Normal",
@@ -146,156 +158,256 @@ def compute_scale_factor(res_str: str) -> float:
 #  ASSET HELPERS
 # ============================================================
 
-def _load_image(path, scale_factor=1.0):
-    if not os.path.exists(path):
+def _load_image(path, scale_factor=1.0, size=None, smooth=False, loader=None):
+    """
+    Load an image scaled by `scale_factor` (or to `size`). With a `loader`
+    (the AssetManager), the decode/scale comes from its thread pool.
+    """
+    if not asset_exists(path):
         return None
     try:
-        img = pygame.image.load(path).convert_alpha()
-        if scale_factor != 1.0:
-            w = max(1, int(img.get_width() * scale_factor))
-            h = max(1, int(img.get_height() * scale_factor))
-            img = pygame.transform.scale(img, (w, h))
+        if loader is not None:
+            return loader.image(path, scale_factor, size, smooth)
+        img = load_image_file(path).convert_alpha()
+        if size is None and scale_factor != 1.0:
+            size = (max(1, int(img.get_width() * scale_factor)),
+                    max(1, int(img.get_height() * scale_factor)))
+        if size is not None:
+            if smooth:
+                img = pygame.transform.smoothscale(img, size)
+            else:
+                img = pygame.transform.scale(img, size)
         return img
     except Exception as e:
         print(f"[assets] Error loading {path}: {e}")
         return None
 
 
-# ------------------------------------------------------------
-#  Background loader (supports layers)
-# ------------------------------------------------------------
-def _load_background_series(folder, screen_w, screen_h):
+class _PrefetchLoader:
     """
-    Loads background{n}_far/mid/near.png into structured layers.
-    Returns: [ {"far":surf,"mid":surf,"near":surf}, ... ]
+    Loader used by queue_startup_assets(): runs the normal loaders but
+    only queues each decode on the AssetManager's pool.
     """
-    if not os.path.isdir(folder):
-        return []
-
-    backgrounds = []
-    idx = 1
-
-    while True:
-        far_p  = os.path.join(folder, f"{BACKGROUND_AUTO_PREFIX}{idx}_far.png")
-        mid_p  = os.path.join(folder, f"{BACKGROUND_AUTO_PREFIX}{idx}_mid.png")
-        near_p = os.path.join(folder, f"{BACKGROUND_AUTO_PREFIX}{idx}_near.png")
-
-        if not (os.path.exists(far_p) or os.path.exists(mid_p) or os.path.exists(near_p)):
-            break
-
-        layer = {}
-
-        for key, path in (("far", far_p), ("mid", mid_p), ("near", near_p)):
-            if os.path.exists(path):
-                try:
-                    img = pygame.image.load(path).convert_alpha()
-                    img = pygame.transform.scale(img, (screen_w, screen_h))
-                    layer[key] = img
-                except Exception as e:
-                    print(f"[assets] Failed loading {path}: {e}")
-                    layer[key] = None
-            else:
-                layer[key] = None
 
-        backgrounds.append(layer)
-        idx += 1
+    def __init__(self, manager):
+        self.manager = manager
 
-    return backgrounds
+    def image(self, path, scale=1.0, size=None, smooth=False):
+        self.manager.preload_image(path, scale, size, smooth)
+        return None
 
 
 # ------------------------------------------------------------
 #  Skins loader
 # ------------------------------------------------------------
-def _load_skins(base_path, scale_factor):
-    skins = {}
+def _skin_dirs(base_path):
+    """Skin name -> directory for every skin folder (no decoding)."""
+    dirs = {}
     root = os.path.join(base_path, "skins")
+    if not asset_isdir(root):
+        return dirs
 
-    if not os.path.isdir(root):
-        return skins
-
-    for entry in os.listdir(root):
+    for entry in asset_listdir(root):
         skin_dir = os.path.join(root, entry)
-        if not os.path.isdir(skin_dir):
-            continue
-
-        def load_frames(prefix):
-            frames = []
-            idx = 1
-            while True:
-                candidate = os.path.join(skin_dir, f"{prefix}_{idx}.png")
-                if not os.path.exists(candidate):
-                    break
-                img = _load_image(candidate, scale_factor)
-                if img:
-                    frames.append(img)
-                idx += 1
-
-            # fallback: prefix.png
-            if not frames:
-                path = os.path.join(skin_dir, f"{prefix}.png")
-                if os.path.exists(path):
-                    img = _load_image(path, scale_factor)
-                    if img:
-                        frames.append(img)
-            return frames
-
-        idle_frames = load_frames("idle")
-        run_frames = load_frames("run")
-        jump_img   = _load_image(os.path.join(skin_dir, "jump.png"), scale_factor)
-
-        skins[entry] = {
-            "idle": idle_frames,
-            "run": run_frames,
-            "jump": jump_img,
-        }
+        if asset_isdir(skin_dir):
+            dirs[entry] = skin_dir
 
     # Ensure default fallback for missing skins
-    if "default" in skins:
+    if "default" in dirs:
         for s in SKIN_LIST:
-            if s not in skins:
-                skins[s] = skins["default"]
+            dirs.setdefault(s, dirs["default"])
+    return dirs
+
+
+def _load_skin(skin_dir, scale_factor, masks=None, loader=None):
+    """
+    Load one skin directory. When `masks` is given, a collision mask
+    is built for each scaled frame and stored as masks[frame].
+    """
+    def load_frames(prefix):
+        paths = []
+        idx = 1
+        while True:
+            candidate = os.path.join(skin_dir, f"{prefix}_{idx}.png")
+            if not asset_exists(candidate):
+                break
+            paths.append(candidate)
+            idx += 1
+
+        # fallback: prefix.png
+        if not paths:
+            path = os.path.join(skin_dir, f"{prefix}.png")
+            if asset_exists(path):
+                paths.append(path)
+
+        frames = []
+        for path in paths:
+            img = _load_image(path, scale_factor, loader=loader)
+            if img:
+                frames.append(img)
+        return frames
+
+    idle_frames = load_frames("idle")
+    run_frames = load_frames("run")
+    jump_img   = _load_image(os.path.join(skin_dir, "jump.png"), scale_factor, loader=loader)
+
+    if masks is not None:
+        for frame in idle_frames + run_frames + [jump_img]:
+            if frame is not None:
+                masks[frame] = build_mask(frame)
+
+    return {
+        "idle": idle_frames,
+        "run": run_frames,
+        "jump": jump_img,
+    }
+
+
+def _skin_frames(skin):
+    return [f for f in skin["idle"] + skin["run"] + [skin["jump"]] if f is not None]
+
+
+class SkinStore(Mapping):
+    """
+    Skin name -> {"idle", "run", "jump"}, decoded on first access.
+
+    Only the active skin (pinned) and the most recently used others
+    stay resident, config.SKIN_CACHE_SIZE skins in total: the skins
+    menu previews one skin at a time, play only needs the active one.
+    Names sharing a folder (missing skins fall back to "default")
+    share one loaded entry.
+    """
 
-    return skins
+    def __init__(self, base_path, scale_factor, masks=None, loader=None, capacity=None):
+        self.base_path = base_path
+        self.scale_factor = scale_factor
+        self.masks = masks
+        self.loader = loader
+        self.capacity = capacity if capacity is not None else SKIN_CACHE_SIZE
+        self._dirs = _skin_dirs(base_path)
+        self._loaded = OrderedDict()   # skin dir -> skin dict
+        self._active = None
+        self.loads = 0
+
+    def __getitem__(self, name):
+        skin_dir = self._dirs[name]
+        skin = self._loaded.get(skin_dir)
+        if skin is None:
+            skin = self._loaded[skin_dir] = _load_skin(
+                skin_dir, self.scale_factor, self.masks, self.loader
+            )
+            registry.track_all(_skin_frames(skin), "skins")
+            self.loads += 1
+            self._evict()
+        else:
+            self._loaded.move_to_end(skin_dir)
+        registry.touch(_skin_frames(skin))
+        return skin
+
+    def __iter__(self):
+        return iter(self._dirs)
+
+    def __len__(self):
+        return len(self._dirs)
+
+    def set_active(self, name):
+        """Pin the skin used in play (falls back to "default") and return it."""
+        if name not in self._dirs:
+            name = "default"
+        self._active = self._dirs.get(name)
+        return self[name]
+
+    def reload(self, skin_dir):
+        """
+        Hot reload: rescan the skin folders and decode `skin_dir` again
+        if it is loaded. Returns True if the skin was resident.
+        """
+        self._dirs = _skin_dirs(self.base_path)
+        skin_dir = os.path.normpath(skin_dir)
+        for loaded_dir in list(self._loaded.keys()):
+            if os.path.normpath(loaded_dir) != skin_dir:
+                continue
+            old = self._loaded.pop(loaded_dir)
+            if self.masks is not None:
+                for frame in _skin_frames(old):
+                    self.masks.pop(frame, None)
+            self._loaded[loaded_dir] = _load_skin(loaded_dir, self.scale_factor, self.masks, self.loader)
+            registry.track_all(_skin_frames(self._loaded[loaded_dir]), "skins")
+            self._evict()
+            return True
+        return False
+
+    def _evict(self):
+        for skin_dir in list(self._loaded.keys()):
+            if len(self._loaded) <= self.capacity:
+                break
+            if skin_dir == self._active:
+                continue
+            skin = self._loaded.pop(skin_dir)
+            if self.masks is not None:
+                for frame in _skin_frames(skin):
+                    self.masks.pop(frame, None)
+
+    def trim(self):
+        """Keep only the active skin resident (budget evictor)."""
+        capacity = self.capacity
+        self.capacity = 1
+        self._evict()
+        self.capacity = capacity
+
+    def telemetry(self):
+        return f"skins resident {len(self._loaded)}/{len(set(self._dirs.values()))}  loads {self.loads}"
 
 
 # ------------------------------------------------------------
 #  Enemy sprite loader
 # ------------------------------------------------------------
-def _load_enemies(base_path, scale_factor):
+def _load_enemies(base_path, scale_factor, masks=None, loader=None):
+    """
+    Load enemy sprites sized from ENEMY_VISUAL_CONFIG. When `masks` is
+    given, the scaled sprite's collision mask is stored as masks[sprite].
+    """
     enemy_sprites = {}
     for kind, vconf in ENEMY_VISUAL_CONFIG.items():
         fname = os.path.join(base_path, f"enemy_{kind}.png")
-        img = _load_image(fname, 1.0)
+        size = max(8, int(vconf["size"] * scale_factor))
+        img = _load_image(fname, size=(size, size), smooth=True, loader=loader)
         if img:
-            size = max(8, int(vconf["size"] * scale_factor))
-            img = pygame.transform.smoothscale(img, (size, size))
             enemy_sprites[kind] = img
+            if masks is not None:
+                masks[img] = build_mask(img)
         else:
             enemy_sprites[kind] = None
     return enemy_sprites
 
 
+# ------------------------------------------------------------
+#  Platform texture loader
+# ------------------------------------------------------------
+def _load_platforms(base_path, scale_factor, loader=None):
+    """Platform type -> texture (assets/platforms/platform_<type>.png) or None."""
+    return {
+        ptype: _load_image(os.path.join(base_path, "platforms", f"platform_{ptype}.png"),
+                           scale_factor, loader=loader)
+        for ptype in PLATFORM_TYPE_CONFIG
+    }
+
+
 # ------------------------------------------------------------
 #  FX Mask loader
 # ------------------------------------------------------------
-def _load_fx_masks(base_path, screen_w, screen_h):
+def _load_fx_masks(base_path, screen_w, screen_h, loader=None):
     fx = {}
 
     scan = os.path.join(base_path, "scanlines.png")
-    if os.path.exists(scan):
-        try:
-            img = pygame.image.load(scan).convert_alpha()
-            fx["scanlines"] = pygame.transform.scale(img, (screen_w, screen_h))
-        except Exception as e:
-            print(f"[assets] Error loading scanlines: {e}")
+    img = _load_image(scan, size=(screen_w, screen_h), loader=loader)
+    if img is not None:
+        fx["scanlines"] = img
 
     crt = os.path.join(base_path, "crt_mask.png")
-    if os.path.exists(crt):
-        try:
-            img = pygame.image.load(crt).convert_alpha()
-            fx["crt"] = pygame.transform.scale(img, (screen_w, screen_h))
-        except Exception as e:
-            print(f"[assets] Error loading CRT mask: {e}")
+    img = _load_image(crt, size=(screen_w, screen_h), loader=loader)
+    if img is not None:
+        fx["crt"] = img
 
     return fx
 
@@ -316,14 +428,14 @@ def load_sounds(base_path):
     land = os.path.join(base_path, SOUND_LAND_FILE)
 
     try:
-        if os.path.exists(jump):
-            out["jump"] = pygame.mixer.Sound(jump)
-        if os.path.exists(coin):
-            out["coin"] = pygame.mixer.Sound(coin)
-        if os.path.exists(hit):
-            out["hit"] = pygame.mixer.Sound(hit)
-        if os.path.exists(land):
-            out["land"] = pygame.mixer.Sound(land)
+        if asset_exists(jump):
+            out["jump"] = load_sound_file(jump)
+        if asset_exists(coin):
+            out["coin"] = load_sound_file(coin)
+        if asset_exists(hit):
+            out["hit"] = load_sound_file(hit)
+        if asset_exists(land):
+            out["land"] = load_sound_file(land)
     except Exception as e:
         print(f"[audio] Failed loading SFX: {e}")
 
@@ -341,52 +453,218 @@ def load_music(base_path):
 #  MAIN ASSET LOADER (called from slime_platformer.main)
 # ============================================================
 
-def reload_all_assets(scale_factor, cfg, screen_w, screen_h):
+def _load_sprites(base_path, scale_factor, loader=None):
+    return {
+        name: _load_image(os.path.join(base_path, f"{name}.png"), scale_factor, loader=loader)
+        for name in ("ground", "tree", "coin")
+    }
+
+
+def queue_startup_assets(asset_manager, scale_factor, screen_w, screen_h, active_skin="default"):
+    """
+    Queue every image reload_all_assets() will need, plus the global
+    backgrounds, on the manager's thread pool. Returns immediately;
+    poll asset_manager.busy() / progress() from a loading screen.
+    """
+    base_path = ASSETS_DIR
+    asset_manager.set_atlas(scale_factor)
+    loader = _PrefetchLoader(asset_manager)
+    dirs = _skin_dirs(base_path)
+    skin_dir = dirs.get(active_skin, dirs.get("default"))
+    if skin_dir is not None:
+        _load_skin(skin_dir, scale_factor, loader=loader)
+    _load_sprites(base_path, scale_factor, loader=loader)
+    _load_enemies(base_path, scale_factor, loader=loader)
+    _load_platforms(base_path, scale_factor, loader=loader)
+    _load_fx_masks(base_path, screen_w, screen_h, loader=loader)
+    asset_manager.request_backgrounds(None)
+
+
+def reload_all_assets(scale_factor, cfg, screen_w, screen_h, asset_manager=None, previous=None,
+                      active_skin="default"):
+    """
+    Load every eager asset group. Pass the `previous` result (after a
+    resolution change) to keep groups whose target size did not change
+    and the audio; the rest rescale, hitting the disk cache for sizes
+    seen before. Skins load lazily; only `active_skin` is loaded here.
+    """
     base_path = ASSETS_DIR
 
-    # --- Global backgrounds ---
-    backgrounds = _load_background_series(
-        os.path.join(base_path, "backgrounds"),
-        screen_w, screen_h
-    )
-
-    # --- World backgrounds ---
-    world_backgrounds = {}
-    worlds_root = os.path.join(base_path, "worlds")
-    if os.path.isdir(worlds_root):
-        for world_id in cfg.WORLD_PACKS.keys():
-            bg_folder = os.path.join(worlds_root, world_id, "backgrounds")
-            bgs = _load_background_series(bg_folder, screen_w, screen_h)
-            if bgs:
-                world_backgrounds[world_id] = bgs
-
-    # --- Skins ---
-    skins = _load_skins(base_path, scale_factor)
-
-    # --- Basic environment sprites ---
-    ground_img = _load_image(os.path.join(base_path, "ground.png"), scale_factor)
-    tree_img   = _load_image(os.path.join(base_path, "tree.png"), scale_factor)
-    coin_img   = _load_image(os.path.join(base_path, "coin.png"), scale_factor)
-
-    # --- Enemies ---
-    enemy_sprites = _load_enemies(base_path, scale_factor)
+    # --- Backgrounds (global + per world) load lazily ---
+    if asset_manager is None:
+        asset_manager = AssetManager(base_path, screen_w, screen_h, cfg.WORLD_PACKS)
+    asset_manager.set_atlas(scale_factor)
+
+    same_scale = previous is not None and previous["scale_factor"] == scale_factor
+    same_screen = previous is not None and previous["screen_size"] == (screen_w, screen_h)
+
+    if same_scale:
+        sprite_masks = previous["masks"]
+        skins = previous["skins"]
+        sprites = {k: previous[k] for k in ("ground", "tree", "coin")}
+        enemy_sprites = previous["enemy_sprites"]
+        platforms = previous["platforms"]
+    else:
+        # --- Collision masks (sprite surface -> Mask) ---
+        sprite_masks = {}
+
+        # --- Skins (on demand, see SkinStore) ---
+        skins = SkinStore(base_path, scale_factor, sprite_masks, loader=asset_manager)
+        skins.set_active(active_skin)
+
+        # --- Basic environment sprites ---
+        sprites = _load_sprites(base_path, scale_factor, loader=asset_manager)
+        if sprites["coin"] is not None:
+            sprite_masks[sprites["coin"]] = build_mask(sprites["coin"])
+
+        # --- Enemies ---
+        enemy_sprites = _load_enemies(base_path, scale_factor, sprite_masks, loader=asset_manager)
+
+        # --- Platform textures (composed per size, see PlatformArt) ---
+        platforms = PlatformArt(_load_platforms(base_path, scale_factor, loader=asset_manager), scale_factor)
+    ground_img = sprites["ground"]
+    tree_img   = sprites["tree"]
+    coin_img   = sprites["coin"]
 
     # --- FX overlays ---
-    fx_masks = _load_fx_masks(base_path, screen_w, screen_h)
+    if same_screen:
+        fx_masks = previous["fx"]
+    else:
+        fx_masks = _load_fx_masks(base_path, screen_w, screen_h, loader=asset_manager)
+    asset_manager.discard_preloaded()
+    if cfg.ASSET_FORMAT_REPORT:
+        for line in asset_manager.format_report():
+            print(f"[assets] {line}")
+
+    # --- Memory accounting (debug overlay, --asset-report) ---
+    _track_groups(sprites, enemy_sprites, fx_masks, platforms)
+    registry.set_evictor("skins", skins.trim)
+    registry.set_evictor("platforms", platforms.clear)
 
     # --- Audio ---
-    sounds = load_sounds(base_path)
-    music_path = load_music(base_path)
+    if previous is not None:
+        sounds = previous["sounds"]
+        music_path = previous["music_path"]
+    else:
+        sounds = load_sounds(base_path)
+        music_path = load_music(base_path)
 
     return {
-        "backgrounds": backgrounds,
-        "world_backgrounds": world_backgrounds,
+        "asset_manager": asset_manager,
+        "scale_factor": scale_factor,
+        "screen_size": (screen_w, screen_h),
         "skins": skins,
         "ground": ground_img,
         "tree": tree_img,
         "coin": coin_img,
         "enemy_sprites": enemy_sprites,
+        "platforms": platforms,
+        "masks": sprite_masks,
         "fx": fx_masks,
         "sounds": sounds,
         "music_path": music_path,
     }
+
+
+def _track_groups(sprites, enemy_sprites, fx_masks, platforms):
+    registry.track_all(sprites.values(), "sprites")
+    registry.track_all(platforms.textures.values(), "sprites/platforms")
+    registry.track_all(enemy_sprites.values(), "enemies")
+    registry.track_all(fx_masks.values(), "fx")
+
+
+def reload_asset_file(assets, path):
+    """
+    Hot reload one changed file under ASSETS_DIR into the live tables of
+    `assets` (a reload_all_assets() result). Single surfaces are replaced
+    in assets / enemy_sprites / fx / sounds, with their collision masks;
+    skins reload their folder; background layers go to the AssetManager.
+    Returns the name of the group that changed, or None if nothing
+    loaded uses the file.
+    """
+    base_path = ASSETS_DIR
+    asset_manager = assets["asset_manager"]
+    scale_factor = assets["scale_factor"]
+    screen_w, screen_h = assets["screen_size"]
+    masks = assets["masks"]
+    rel = os.path.relpath(path, base_path).replace(os.sep, "/")
+    parts = rel.split("/")
+    name, ext = os.path.splitext(parts[-1])
+
+    def replace(table, key, img):
+        old = table.get(key)
+        if old is not None:
+            masks.pop(old, None)
+        table[key] = img
+
+    if parts[0] == "skins" and len(parts) >= 3:
+        return "skins" if assets["skins"].reload(os.path.join(base_path, "skins", parts[1])) else None
+
+    if parts[0] == "platforms" and len(parts) == 2 and ext == ".png":
+        ptype = name[len("platform_"):]
+        if not name.startswith("platform_") or ptype not in PLATFORM_TYPE_CONFIG:
+            return None
+        img = _load_image(path, scale_factor, loader=asset_manager)
+        assets["platforms"].set_texture(ptype, img)
+        registry.track(img, "sprites/platforms")
+        return "platforms"
+
+    if "backgrounds" in parts:
+        return "backgrounds" if asset_manager.reload_background(path) else None
+
+    if len(parts) != 1:
+        return None
+
+    if ext == ".png" and name in ("ground", "tree", "coin"):
+        img = _load_image(path, scale_factor, loader=asset_manager)
+        replace(assets, name, img)
+        if name == "coin" and img is not None:
+            masks[img] = build_mask(img)
+        group = "sprites"
+    elif ext == ".png" and name.startswith("enemy_") and name[6:] in ENEMY_VISUAL_CONFIG:
+        kind = name[6:]
+        size = max(8, int(ENEMY_VISUAL_CONFIG[kind]["size"] * scale_factor))
+        img = _load_image(path, size=(size, size), smooth=True, loader=asset_manager)
+        replace(assets["enemy_sprites"], kind, img)
+        if img is not None:
+            masks[img] = build_mask(img)
+        group = "sprites"
+    elif ext == ".png" and name in ("scanlines", "crt_mask"):
+        img = _load_image(path, size=(screen_w, screen_h), loader=asset_manager)
+        fx_key = "scanlines" if name == "scanlines" else "crt"
+        if img is not None:
+            assets["fx"][fx_key] = img
+        else:
+            assets["fx"].pop(fx_key, None)
+        group = "fx"
+    else:
+        sound_keys = {
+            SOUND_JUMP_FILE: "jump", SOUND_COIN_FILE: "coin",
+            SOUND_HIT_FILE: "hit", SOUND_LAND_FILE: "land",
+        }
+        key = sound_keys.get(parts[0])
+        if key is None:
+            return None
+        try:
+            assets["sounds"][key] = load_sound_file(path) if asset_exists(path) else None
+        except Exception as e:
+            print(f"[audio] Failed reloading {path}: {e}")
+        return "sounds"
+
+    sprites = {k: assets[k] for k in ("ground", "tree", "coin")}
+    _track_groups(sprites, assets["enemy_sprites"], assets["fx"], assets["platforms"])
+    return group
+
+
+def asset_report(asset_manager, skins):
+    """
+    Lines for `--asset-report`: loads every world's backgrounds and every
+    skin once (the budgets still evict as usual) and reports what each
+    accounted group holds now and at its peak.
+    """
+    for world_id in list(WORLD_PACKS.keys()) + [None]:
+        asset_manager.backgrounds_for(world_id)
+    for name in skins:
+        skins[name]
+    w, h = asset_manager.screen_w, asset_manager.screen_h
+    return [f"Asset memory at {w}x{h}"] + registry.report(peaks=True)
@@ -6,6 +6,8 @@
 #  input handling, rendering pipeline.
 # ============================================================
 
+import os
+import sys
 import pygame
 import time
 import random
@@ -25,8 +27,14 @@ from ui import (
     center_text,
     wrap_text,
     draw_skin_preview,
+    draw_cached_skin_preview,
     draw_cycle_selector,
     draw_toggle_switch,
+    draw_debug_overlay,
+    draw_loading_screen,
+    clear_preview_cache,
+    start_widget_log,
+    stop_widget_log,
 )
 
 from world import (
@@ -42,20 +50,41 @@ from world import (
     spawn_levelup_burst,
     update_particles,
     update_enemies,
+    remap_state,
 )
 
+from pools import make_entity_pools, swap_remove, pool_telemetry
+from asset_manager import AssetManager
+from collision import MaskPairCache, sweep_aabb, sweep_landing
+from sprite_variants import SpriteVariants
+from entity_renderer import EntityRenderer
+from postfx import PostFX
+from menu_backdrop import MenuBackdrop
+from menu_redraw import MenuRedraw
+from streaming import stream_update, stream_grid_platform, stream_telemetry
+
 from resources import (
     reload_all_assets,
+    queue_startup_assets,
     load_save,
     save_save,
     parse_resolution,
     compute_scale_factor,
+    asset_report,
 )
+from asset_memory import registry as asset_registry
+from hot_reload import HotReloader
 
 from editor import (
+    editor_level_path,
     editor_load_level,
     editor_save_level,
+    editor_platform_fits,
+    editor_platform_added,
+    editor_platform_moved,
+    editor_platform_removed,
     apply_custom_level_to_state,
+    draw_level_editor,
 )
 
 pygame.init()
@@ -168,6 +197,46 @@ def sign(x):
     return -1 if x < 0 else 1 if x > 0 else 0
 
 
+# ------------------------------------------------------------
+# Sprite frame helpers (shared by drawing and precise collision)
+# ------------------------------------------------------------
+
+def pick_player_frame(on_ground, moving, now, skin_idle, skin_run, skin_jump):
+    """
+    Current animation frame for the player (shared by drawing and
+    precise collision so both see the same sprite).
+    """
+    if not on_ground:
+        return skin_jump
+    if moving:
+        return skin_run[int((now * 10) % len(skin_run))] if skin_run else skin_idle[0]
+    return skin_idle[int((now * 6) % len(skin_idle))] if skin_idle else None
+
+
+def player_squash(land_timer, on_ground, vel_y):
+    """
+    Squash (> 0) / stretch (< 0) of the player sprite: squashed right
+    after landing, stretched while rising. Shared by drawing and
+    precise collision.
+    """
+    if land_timer > 0:
+        return land_timer / config.LAND_SQUASH_TIME
+    if not on_ground and vel_y < 0:
+        return -0.5
+    return 0.0
+
+
+def enemy_variant(variants, img, enemy):
+    """
+    (surface, rect) an enemy is drawn with: mirrored when moving right,
+    stretched while jumping up, anchored at the rect's bottom centre.
+    """
+    if enemy["vy"] < 0 or enemy["vx"] > 0:
+        img = variants.get(img, flip=enemy["vx"] > 0, squash=-0.5 if enemy["vy"] < 0 else 0.0)
+        return img, img.get_rect(midbottom=enemy["rect"].midbottom)
+    return img, enemy["rect"]
+
+
 # ------------------------------------------------------------
 # Camera shake
 # ------------------------------------------------------------
@@ -406,6 +475,32 @@ def editor_push_undo(stack, editor_data):
     stack.append(snapshot)
 
 
+# ------------------------------------------------------------
+# Display
+# ------------------------------------------------------------
+
+def open_display(settings):
+    """
+    (Re)create the window from the display settings.
+    Returns (screen, screen_w, screen_h, scale_factor).
+    """
+    resolution_str = settings.get("resolution", config.DEFAULT_RESOLUTION)
+    fullscreen_flag = settings.get("fullscreen", config.DEFAULT_FULLSCREEN)
+    vsync_flag = bool(settings.get("vsync", True))
+    screen_w, screen_h = parse_resolution(resolution_str)
+    flags = pygame.FULLSCREEN if fullscreen_flag else 0
+    try:
+        screen = pygame.display.set_mode((screen_w, screen_h), flags, vsync=1 if vsync_flag else 0)
+    except TypeError:
+        # Older pygame without vsync kwarg
+        screen = pygame.display.set_mode((screen_w, screen_h), flags)
+    except pygame.error as e:
+        # Some drivers refuse to switch vsync on a live window
+        print(f"[display] {e}, retrying without vsync")
+        screen = pygame.display.set_mode((screen_w, screen_h), flags)
+    return screen, screen_w, screen_h, compute_scale_factor(resolution_str)
+
+
 # ------------------------------------------------------------
 # MAIN game loop
 # ------------------------------------------------------------
@@ -423,33 +518,44 @@ def main():
         settings["fx_mode"] = "scanlines"
         save_save(save_data)
 
-    resolution_str = settings.get("resolution", config.DEFAULT_RESOLUTION)
-    fullscreen_flag = settings.get("fullscreen", config.DEFAULT_FULLSCREEN)
-    vsync_flag = bool(settings.get("vsync", True))
-    screen_w, screen_h = parse_resolution(resolution_str)
-    flags = pygame.FULLSCREEN if fullscreen_flag else 0
-    try:
-        screen = pygame.display.set_mode((screen_w, screen_h), flags, vsync=1 if vsync_flag else 0)
-    except TypeError:
-        # Older pygame without vsync kwarg
-        screen = pygame.display.set_mode((screen_w, screen_h), flags)
+    screen, screen_w, screen_h, scale_factor = open_display(settings)
     pygame.display.set_caption("Slimey")
-
-    scale_factor = compute_scale_factor(resolution_str)
     ui_scale = scale_factor
 
+    # --------------------------------------------------------
+    # Fonts
+    # --------------------------------------------------------
+    fonts = build_fonts(ui_scale)
+
     # --------------------------------------------------------
     # Load assets (backgrounds, skins, FX, audio)
     # --------------------------------------------------------
-    assets = reload_all_assets(scale_factor, config, screen_w, screen_h)
+    # Decode/scale runs on the asset thread pool while a progress
+    # screen keeps the window responsive; conversion happens here.
+    asset_manager = AssetManager(config.ASSETS_DIR, screen_w, screen_h, config.WORLD_PACKS)
+    queue_startup_assets(asset_manager, scale_factor, screen_w, screen_h, save_data["skins"]["current_skin"])
+    loading_clock = pygame.time.Clock()
+    while asset_manager.busy():
+        if pygame.event.get(pygame.QUIT):
+            pygame.quit()
+            return
+        asset_manager.pump(limit=float("inf"))
+        draw_loading_screen(screen, asset_manager.progress(), fonts, ui_scale)
+        pygame.display.flip()
+        loading_clock.tick(config.FPS)
+
+    assets = reload_all_assets(
+        scale_factor, config, screen_w, screen_h, asset_manager,
+        active_skin=save_data["skins"]["current_skin"],
+    )
 
-    backgrounds = assets["backgrounds"]
-    world_backgrounds = assets["world_backgrounds"]
     skins_assets = assets["skins"]
     ground_img = assets["ground"]
     tree_img = assets["tree"]
     coin_img = assets["coin"]
     enemy_sprites = assets["enemy_sprites"]
+    platform_art = assets["platforms"]
+    sprite_masks = assets["masks"]
     fx_masks = assets["fx"]
     sounds = assets["sounds"]
 
@@ -467,10 +573,12 @@ def main():
     hit_snd  = sounds.get("hit")
     land_snd = sounds.get("land")
 
-    # --------------------------------------------------------
-    # Fonts
-    # --------------------------------------------------------
-    fonts = build_fonts(ui_scale)
+    # Sizing run: report resident asset memory and exit
+    if "--asset-report" in sys.argv[1:]:
+        for line in asset_report(asset_manager, skins_assets):
+            print(line)
+        pygame.quit()
+        return
 
     # --------------------------------------------------------
     # Game state variables
@@ -479,6 +587,7 @@ def main():
 
     game_state = "menu"  # menu, playing, paused, game_over, settings menus, editor
     running = True
+    show_debug_overlay = False  # F3
 
     # Menu focus indices
     menu_focus = 0
@@ -487,6 +596,7 @@ def main():
     audio_focus = 0
     game_over_focus = 0
     pause_focus = 0
+    pause_requested = False   # applied after the frame is drawn (menu_backdrop)
     level_select_focus = 0
     skins_focus = 0
     high_scores_focus = 0
@@ -503,6 +613,8 @@ def main():
     display_row_rects = []
     display_fullscreen_rect = None
     display_vsync_rect = None
+    display_apply_rect = None
+    display_apply_requested = False  # handled once per frame after input
     gameplay_row_rects = []
     audio_row_rects = []
     level_row_rects = []
@@ -553,13 +665,22 @@ def main():
 
     max_health = BASE_MAX_HEALTH + (1 if save_data["upgrades"]["extra_heart"] else 0)
 
-    wstate = reset_state(player_rect, player_h, max_health)
+    entity_pools = make_entity_pools()
+    mask_cache = MaskPairCache()
+    sprite_variants = SpriteVariants()
+    entity_renderer = EntityRenderer()
+    postfx = PostFX()
+    menu_backdrop = MenuBackdrop()
+    menu_redraw = MenuRedraw()
+    asset_registry.set_evictor("variants", sprite_variants.clear)
+    wstate = reset_state(player_rect, player_h, max_health, entity_pools)
 
     # Animation state shortcuts
     skin_name = save_data["skins"]["current_skin"]
-    skin_idle = skins_assets.get(skin_name, skins_assets["default"])["idle"]
-    skin_run  = skins_assets.get(skin_name, skins_assets["default"])["run"]
-    skin_jump = skins_assets.get(skin_name, skins_assets["default"])["jump"]
+    skin_assets = skins_assets.set_active(skin_name)
+    skin_idle = skin_assets["idle"]
+    skin_run  = skin_assets["run"]
+    skin_jump = skin_assets["jump"]
 
     # --------------------------------------------------------
     # Controls
@@ -606,14 +727,22 @@ def main():
     # Background scrolling
     # --------------------------------------------------------
     scroll_offsets = []
-    for _ in backgrounds:
-        scroll_offsets.append({"far": 0.0, "mid": 0.0, "near": 0.0})
+    prefetch_level = None
+
+    # Dev mode: reload edited assets / custom levels in place
+    hot_reloader = None
+    if config.HOT_RELOAD_ENABLED or "--dev" in sys.argv[1:]:
+        hot_reloader = HotReloader()
 
     # --------------------------------------------------------
     # Main LOOP begins here
     # --------------------------------------------------------
     last_time = time.time()
 
+    # Screen buffer, repainted in full every frame (sky fill or menu backdrop)
+    game_surface = pygame.Surface((screen_w, screen_h), pygame.SRCALPHA)
+    screen_rect = game_surface.get_rect()
+
     while running:
         now = time.time()
         dt = now - last_time
@@ -623,16 +752,23 @@ def main():
         # time-scale from settings
         dt_scaled = dt * settings.get("game_speed_mult", 1.0)
 
-        # Screen buffer
-        game_surface = pygame.Surface((screen_w, screen_h), pygame.SRCALPHA)
-
         # ----------------------------------------------------
         # Process input events
         # ----------------------------------------------------
         btn_event = None
         hat_event = None
 
-        for event in pygame.event.get():
+        # A menu on its frozen backdrop sleeps until input or its next pulse step
+        menu_idle = (
+            game_state not in ("playing", "level_editor")
+            and menu_backdrop.ready((screen_w, screen_h))
+            and not show_debug_overlay
+            and hot_reloader is None
+            and not display_apply_requested
+        )
+        frame_events = menu_redraw.events(menu_idle)
+
+        for event in frame_events:
             if event.type == pygame.QUIT:
                 running = False
                 break
@@ -664,11 +800,15 @@ def main():
                             controls_waiting_mode = None
                     continue
 
+                # Debug overlay toggle works in every state
+                if event.key == pygame.K_F3:
+                    show_debug_overlay = not show_debug_overlay
+                    continue
+
                 # ESC global handling
                 if event.key == pygame.K_ESCAPE or action_down_kb("pause", event.key, kb_cfg):
                     if game_state == "playing":
-                        game_state = "paused"
-                        pause_focus = 0
+                        pause_requested = True
                     elif game_state in (
                         "display_settings", "gameplay_settings", "audio_settings",
                         "skins_menu", "shop", "level_select", "game_over",
@@ -756,7 +896,7 @@ def main():
                     elif event.key == pygame.K_p:
                         # Quick-test the current custom level from the editor
                         editor_save_level(editor_level, editor_data)
-                        wstate = reset_state(player_rect, player_h, max_health)
+                        wstate = reset_state(player_rect, player_h, max_health, entity_pools, wstate)
                         wstate["level"] = editor_level
                         game_state = "playing"
                         apply_custom_level_to_state(editor_level, wstate, coin_img, enemy_sprites, scale_factor)
@@ -874,8 +1014,13 @@ def main():
                                 p["h"] = h
                                 p["x"] = ex - w // 2
                                 p["y"] = ey - h // 2
-                                editor_data["platforms"].append(p)
-                                editor_status_msg = "Pasted platform"
+                                if editor_platform_fits(editor_data, p["x"], p["y"], w, h):
+                                    editor_data["platforms"].append(p)
+                                    editor_platform_added(editor_data)
+                                    editor_status_msg = "Pasted platform"
+                                else:
+                                    editor_undo_stack.pop()
+                                    editor_status_msg = "Blocked: overlaps a platform"
                             elif arr == "coins":
                                 c = dict(data)
                                 c["x"] = ex
@@ -916,7 +1061,7 @@ def main():
                         if item_id == "play":
                             game_state = "playing"
                             # reset run:
-                            wstate.update(reset_state(player_rect, player_h, max_health))
+                            wstate.update(reset_state(player_rect, player_h, max_health, entity_pools, wstate))
                             # Start at level 1, load matching custom layout if present
                             wstate["level"] = 1
                             apply_custom_level_to_state(1, wstate, coin_img, enemy_sprites, scale_factor)
@@ -984,11 +1129,14 @@ def main():
                             menu_focus = 0
                 elif game_state == "display_settings":
                     res_count = len(config.SUPPORTED_RESOLUTIONS)
-                    max_focus = res_count + 1  # resolutions + fullscreen + vsync
+                    max_focus = res_count + 2  # resolutions + fullscreen + vsync + apply
                     if event.key == pygame.K_UP:
                         display_focus = max(0, display_focus - 1)
                     elif event.key == pygame.K_DOWN:
                         display_focus = min(max_focus, display_focus + 1)
+                    elif display_focus == max_focus:
+                        if event.key in (pygame.K_RETURN, pygame.K_SPACE):
+                            display_apply_requested = True
                     elif event.key in (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_RETURN, pygame.K_SPACE):
                         if display_focus < res_count:
                             delta = -1 if event.key == pygame.K_LEFT else 1
@@ -1055,7 +1203,7 @@ def main():
                                 unlocked = True
                         if unlocked:
                             save_data["skins"]["current_skin"] = skin_choice
-                            skin_assets = skins_assets.get(skin_choice, skins_assets["default"])
+                            skin_assets = skins_assets.set_active(skin_choice)
                             skin_idle = skin_assets["idle"]
                             skin_run  = skin_assets["run"]
                             skin_jump = skin_assets["jump"]
@@ -1069,7 +1217,7 @@ def main():
                         level_select_focus = min(max_idx, level_select_focus + 1)
                     elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
                         chosen_level = level_select_focus + 1
-                        wstate = reset_state(player_rect, player_h, max_health)
+                        wstate = reset_state(player_rect, player_h, max_health, entity_pools, wstate)
                         wstate["level"] = chosen_level
                         game_state = "playing"
                          # Load custom layout for this level, if defined
@@ -1128,7 +1276,7 @@ def main():
                         game_over_focus = min(2, game_over_focus + 1)
                     elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
                         if game_over_focus == 0:
-                            wstate = reset_state(player_rect, player_h, max_health)
+                            wstate = reset_state(player_rect, player_h, max_health, entity_pools, wstate)
                             game_state = "playing"
                         elif game_over_focus == 1:
                             game_state = "menu"
@@ -1296,7 +1444,12 @@ def main():
                                 "h": h,
                                 "type": editor_platform_type,
                             }
-                            editor_data["platforms"].append(plat)
+                            if editor_platform_fits(editor_data, plat["x"], plat["y"], w, h):
+                                editor_data["platforms"].append(plat)
+                                editor_platform_added(editor_data)
+                            else:
+                                editor_status_msg = "Blocked: overlaps a platform"
+                                editor_status_timer = 2.0
 
                         elif editor_tool == "coin":
                             editor_data["coins"].append({"x": ex, "y": ey})
@@ -1339,6 +1492,8 @@ def main():
                         if nearest:
                             arr, idx = nearest
                             del editor_data[arr][idx]
+                            if arr == "platforms":
+                                editor_platform_removed(editor_data, idx)
 
                     # MOUSE WHEEL = cycle assets for current tool
                     elif event.button in (4, 5):
@@ -1469,8 +1624,13 @@ def main():
                                     "h": h,
                                     "type": ptype,
                                 }
-                                editor_data["platforms"].append(plat)
-                                editor_status_msg = f"Placed platform ({ptype})"
+                                if editor_platform_fits(editor_data, plat["x"], plat["y"], w, h):
+                                    editor_data["platforms"].append(plat)
+                                    editor_platform_added(editor_data)
+                                    editor_status_msg = f"Placed platform ({ptype})"
+                                else:
+                                    editor_undo_stack.pop()
+                                    editor_status_msg = "Blocked: overlaps a platform"
                                 editor_status_timer = 2.0
 
                             elif editor_drag_kind == "coin":
@@ -1490,7 +1650,16 @@ def main():
 
                         else:
                             # Dropped an existing object after move
-                            editor_status_msg = "Moved object"
+                            arr, idx = editor_drag_target or (None, -1)
+                            p = editor_data["platforms"][idx] if arr == "platforms" else None
+                            if p and not editor_platform_fits(editor_data, p["x"], p["y"], p["w"], p["h"], ignore=idx):
+                                # Undo the move (pushed when the drag started)
+                                editor_data = editor_undo_stack.pop()
+                                editor_status_msg = "Blocked: overlaps a platform"
+                            else:
+                                if p:
+                                    editor_platform_moved(editor_data, idx)
+                                editor_status_msg = "Moved object"
                             editor_status_timer = 2.0
 
                         editor_drag_active = False
@@ -1507,7 +1676,7 @@ def main():
                                 item_id = config.MAIN_MENU_ITEMS[i]["id"]
                                 if item_id == "play":
                                     game_state = "playing"
-                                    wstate.update(reset_state(player_rect, player_h, max_health))
+                                    wstate.update(reset_state(player_rect, player_h, max_health, entity_pools, wstate))
                                 elif item_id == "level_select":
                                     game_state = "level_select"
                                     level_select_focus = 0
@@ -1547,7 +1716,7 @@ def main():
                             if r.collidepoint(mx, my):
                                 game_over_focus = i
                                 if game_over_focus == 0:
-                                    wstate = reset_state(player_rect, player_h, max_health)
+                                    wstate = reset_state(player_rect, player_h, max_health, entity_pools, wstate)
                                     game_state = "playing"
                                 elif game_over_focus == 1:
                                     game_state = "menu"
@@ -1635,6 +1804,10 @@ def main():
                                 display_focus = len(config.SUPPORTED_RESOLUTIONS) + 1
                                 settings["vsync"] = not settings.get("vsync", True)
                                 save_save(save_data)
+                            # Apply
+                            elif display_apply_rect and display_apply_rect.collidepoint(mx, my):
+                                display_focus = len(config.SUPPORTED_RESOLUTIONS) + 2
+                                display_apply_requested = True
 
                     elif game_state == "gameplay_settings":
                         for i, r in enumerate(gameplay_row_rects):
@@ -1688,7 +1861,7 @@ def main():
                                         unlocked = True
                                 if unlocked:
                                     save_data["skins"]["current_skin"] = skin_choice
-                                    skin_assets = skins_assets.get(skin_choice, skins_assets["default"])
+                                    skin_assets = skins_assets.set_active(skin_choice)
                                     skin_idle = skin_assets["idle"]
                                     skin_run  = skin_assets["run"]
                                     skin_jump = skin_assets["jump"]
@@ -1699,7 +1872,7 @@ def main():
                             if r.collidepoint(mx, my):
                                 level_select_focus = level_idx
                                 chosen_level = level_idx + 1
-                                wstate = reset_state(player_rect, player_h, max_health)
+                                wstate = reset_state(player_rect, player_h, max_health, entity_pools, wstate)
                                 wstate["level"] = chosen_level
                                 game_state = "playing"
                                 apply_custom_level_to_state(chosen_level, wstate, coin_img, enemy_sprites, scale_factor)
@@ -1770,13 +1943,13 @@ def main():
 
             elif game_state == "display_settings":
                 res_count = len(config.SUPPORTED_RESOLUTIONS)
-                max_focus = res_count + 1
+                max_focus = res_count + 2
                 if hy > 0:
                     display_focus = max(0, display_focus - 1)
                 elif hy < 0:
                     display_focus = min(max_focus, display_focus + 1)
 
-                if hx != 0:
+                if hx != 0 and display_focus < max_focus:
                     if display_focus < res_count:
                         res, _ = cycle_value(
                             config.SUPPORTED_RESOLUTIONS,
@@ -1852,15 +2025,14 @@ def main():
         if btn_event is not None:
             # Handle controller input in menus and gameplay
             if game_state == "playing" and btn_event.button == BTN_START:
-                game_state = "paused"
-                pause_focus = 0
+                pause_requested = True
 
             if game_state == "menu":
                 if btn_event.button == BTN_A:
                     item_id = config.MAIN_MENU_ITEMS[menu_focus]["id"]
                     if item_id == "play":
                         game_state = "playing"
-                        wstate = reset_state(player_rect, player_h, max_health)
+                        wstate = reset_state(player_rect, player_h, max_health, entity_pools, wstate)
                         wstate["level"] = 1
                         apply_custom_level_to_state(1, wstate, coin_img, enemy_sprites, scale_factor)
                         name, story = get_level_meta(1)
@@ -1900,7 +2072,9 @@ def main():
             elif game_state == "display_settings":
                 if btn_event.button == BTN_A:
                     res_count = len(config.SUPPORTED_RESOLUTIONS)
-                    if display_focus < res_count:
+                    if display_focus == res_count + 2:
+                        display_apply_requested = True
+                    elif display_focus < res_count:
                         res, _ = cycle_value(
                             config.SUPPORTED_RESOLUTIONS,
                             settings.get("resolution", config.DEFAULT_RESOLUTION),
@@ -1956,7 +2130,7 @@ def main():
                             unlocked = True
                     if unlocked:
                         save_data["skins"]["current_skin"] = skin_choice
-                        skin_assets = skins_assets.get(skin_choice, skins_assets["default"])
+                        skin_assets = skins_assets.set_active(skin_choice)
                         skin_idle = skin_assets["idle"]
                         skin_run  = skin_assets["run"]
                         skin_jump = skin_assets["jump"]
@@ -1976,7 +2150,7 @@ def main():
             elif game_state == "level_select":
                 if btn_event.button == BTN_A:
                     chosen_level = level_select_focus + 1
-                    wstate = reset_state(player_rect, player_h, max_health)
+                    wstate = reset_state(player_rect, player_h, max_health, entity_pools, wstate)
                     wstate["level"] = chosen_level
                     game_state = "playing"
                     apply_custom_level_to_state(chosen_level, wstate, coin_img, enemy_sprites, scale_factor)
@@ -2021,7 +2195,7 @@ def main():
             elif game_state == "game_over":
                 if btn_event.button == BTN_A:
                     if game_over_focus == 0:
-                        wstate = reset_state(player_rect, player_h, max_health)
+                        wstate = reset_state(player_rect, player_h, max_health, entity_pools, wstate)
                         game_state = "playing"
                     elif game_over_focus == 1:
                         game_state = "menu"
@@ -2075,40 +2249,138 @@ def main():
                     game_state = "menu"
                     menu_focus = 0
 
+        # =====================================================
+        #   APPLY DISPLAY SETTINGS (no restart)
+        # =====================================================
+        if display_apply_requested:
+            display_apply_requested = False
+            apply_start = time.perf_counter()
+            old_w, old_h = screen_w, screen_h
+            screen, screen_w, screen_h, scale_factor = open_display(settings)
+            ui_scale = scale_factor
+            fonts = build_fonts(ui_scale)
+
+            if asset_manager.retarget(screen_w, screen_h):
+                # Only groups whose target size changed are rescaled
+                active_skin = save_data["skins"]["current_skin"]
+                queue_startup_assets(asset_manager, scale_factor, screen_w, screen_h, active_skin)
+                assets = reload_all_assets(
+                    scale_factor, config, screen_w, screen_h, asset_manager, assets, active_skin
+                )
+                skins_assets = assets["skins"]
+                clear_preview_cache()
+                ground_img = assets["ground"]
+                tree_img = assets["tree"]
+                coin_img = assets["coin"]
+                enemy_sprites = assets["enemy_sprites"]
+                platform_art = assets["platforms"]
+                sprite_masks = assets["masks"]
+                fx_masks = assets["fx"]
+                skin_assets = skins_assets.set_active(active_skin)
+                skin_idle, skin_run, skin_jump = skin_assets["idle"], skin_assets["run"], skin_assets["jump"]
+                scroll_offsets = []
+
+                sx, sy = screen_w / old_w, screen_h / old_h
+                remap_state(wstate, sx, sy)
+                player_w = int(80 * scale_factor)
+                player_h = int(80 * scale_factor)
+                player_rect.update(
+                    round(player_rect.centerx * sx) - player_w // 2,
+                    round(player_rect.bottom * sy) - player_h,
+                    player_w, player_h,
+                )
+                editor_platform_width = max(1, round(editor_platform_width * sx))
+                editor_platform_height = max(1, round(editor_platform_height * sy))
+
+            game_surface = pygame.Surface((screen_w, screen_h), pygame.SRCALPHA)
+            screen_rect = game_surface.get_rect()
+            print(f"[display] Applied {screen_w}x{screen_h} in {(time.perf_counter() - apply_start) * 1000:.0f} ms")
+
+        # =====================================================
+        #   HOT RELOAD (dev mode)
+        # =====================================================
+        if hot_reloader is not None:
+            reloaded, changed_levels = hot_reloader.poll(assets)
+            if reloaded:
+                # Swap reloaded surfaces into the locals; gameplay state is untouched
+                ground_img = assets["ground"]
+                tree_img = assets["tree"]
+                coin_img = assets["coin"]
+                jump_snd, coin_snd = sounds.get("jump"), sounds.get("coin")
+                hit_snd, land_snd = sounds.get("hit"), sounds.get("land")
+                if "skins" in reloaded:
+                    clear_preview_cache()
+                    skin_assets = skins_assets.set_active(save_data["skins"]["current_skin"])
+                    skin_idle, skin_run, skin_jump = skin_assets["idle"], skin_assets["run"], skin_assets["jump"]
+            if os.path.normpath(editor_level_path(editor_level)) in changed_levels:
+                reloaded_level = editor_load_level(editor_level)
+                if reloaded_level != editor_data:
+                    # Edited outside the game; the editor's copy stays one undo away
+                    editor_push_undo(editor_undo_stack, editor_data)
+                    editor_redo_stack.clear()
+                    editor_data = reloaded_level
+                    editor_status_msg = f"Level {editor_level:02d} reloaded from disk"
+                    editor_status_timer = 2.0
+
         # =====================================================
         #   RENDER BACKGROUND
         # =====================================================
-        game_surface.fill(config.SKY_COLOR)
+        # Menus show the frozen scene they were opened over (menu_backdrop.py)
+        menu_frozen = game_state not in ("playing", "level_editor")
+        if not menu_frozen:
+            menu_backdrop.clear()
+        backdrop_shown = menu_frozen and menu_backdrop.ready(game_surface.get_size())
 
         # Pick world theme based on current level
         cur_level = wstate.get("level", 1)
         world_id, world_cfg = get_world_for_level(cur_level, config.WORLD_PACKS)
         world_scroll_mult = world_cfg.get("scroll_speed_mult", 1.0) if world_cfg else 1.0
 
-        active_backgrounds = world_backgrounds.get(world_id) or backgrounds
-
-        # Scroll backgrounds
-        base_scroll_speed = GAME_SPEED_BASE * settings["game_speed_mult"] * world_scroll_mult
-
-        for i, layer_set in enumerate(active_backgrounds):
-            offs = scroll_offsets[i]
-
-            near_speed = base_scroll_speed * 1.0
-            mid_speed  = base_scroll_speed * 0.4
-            far_speed  = base_scroll_speed * 0.2
-
-            offs["near"] += near_speed * dt_scaled
-            offs["mid"]  += mid_speed  * dt_scaled
-            offs["far"]  += far_speed  * dt_scaled
-
-            for key in ("far", "mid", "near"):
-                img = layer_set.get(key)
-                if img:
-                    w = img.get_width()
-                    x1 = -offs[key] % w
-                    x2 = x1 - w
-                    game_surface.blit(img, (x1, 0))
-                    game_surface.blit(img, (x2, 0))
+        # Start loading the next world's backgrounds a couple of levels
+        # before its first level so the transition does not stall
+        if cur_level != prefetch_level:
+            prefetch_level = cur_level
+            for ahead in range(1, config.ASSET_PREFETCH_LEVELS + 1):
+                next_id, _ = get_world_for_level(cur_level + ahead, config.WORLD_PACKS)
+                if next_id != world_id:
+                    asset_manager.prepare_world(next_id)
+                    break
+        asset_manager.pump()
+
+        active_backgrounds = asset_manager.backgrounds_for(world_id)
+        while len(scroll_offsets) < len(active_backgrounds):
+            scroll_offsets.append({"far": 0.0, "mid": 0.0, "near": 0.0})
+
+        if backdrop_shown:
+            menu_backdrop.draw(game_surface)
+        else:
+            game_surface.fill(config.SKY_COLOR)
+
+            # Scroll backgrounds
+            base_scroll_speed = GAME_SPEED_BASE * settings["game_speed_mult"] * world_scroll_mult
+
+            for i, layer_set in enumerate(active_backgrounds):
+                offs = scroll_offsets[i]
+
+                near_speed = base_scroll_speed * 1.0
+                mid_speed  = base_scroll_speed * 0.4
+                far_speed  = base_scroll_speed * 0.2
+
+                offs["near"] += near_speed * dt_scaled
+                offs["mid"]  += mid_speed  * dt_scaled
+                offs["far"]  += far_speed  * dt_scaled
+
+                for key in ("far", "mid", "near"):
+                    img = layer_set.get(key)
+                    if img:
+                        if img.get_width() != screen_w:
+                            # Half-resolution compact layer
+                            img = asset_manager.expand_layer(img)
+                        w = img.get_width()
+                        x1 = -offs[key] % w
+                        x2 = x1 - w
+                        game_surface.blit(img, (x1, 0))
+                        game_surface.blit(img, (x2, 0))
 
         # =====================================================
         #   GAMESTATE: PLAYING
@@ -2129,6 +2401,9 @@ def main():
             dust_particles = wstate["dust_particles"]
             spark_particles = wstate["spark_particles"]
 
+            pools = wstate["pools"]
+            particle_pool = pools["particle"]
+
             health = wstate["health"]
             max_health = wstate["max_health"]
 
@@ -2149,6 +2424,8 @@ def main():
             dash_timer = wstate["dash_timer"]
             dash_cooldown = wstate["dash_cooldown"]
             dash_dir = wstate["dash_dir"]
+            facing = wstate["facing"]
+            land_timer = wstate["land_timer"]
 
             shake_timer = wstate["shake_timer"]
             run_dust_timer = wstate.get("run_dust_timer", 0.0)
@@ -2164,6 +2441,7 @@ def main():
                 move_x += 1
 
             if move_x != 0:
+                facing = 1 if move_x > 0 else -1
                 move_x *= PLAYER_MOVE_SPEED * settings["move_speed_mult"] * dt_scaled
 
             # Jump
@@ -2183,14 +2461,21 @@ def main():
 
             # Gravity
             player_vel_y += GRAVITY * settings["gravity_mult"] * dt_scaled
-            player_rect.y += int(player_vel_y * dt_scaled)
+
+            # ------------------------------------------------
+            # Frame displacement (resolved by the sweep below)
+            # ------------------------------------------------
+            start_x = player_rect.x
+            start_y = player_rect.y
+            step_dy = int(player_vel_y * dt_scaled)
+            step_dx = 0
 
             # ------------------------------------------------
             # DASH
             # ------------------------------------------------
             dash_active = dash_timer > 0.0
             if dash_active:
-                player_rect.x += int(dash_dir * DASH_SPEED * dt_scaled)
+                step_dx += int(dash_dir * DASH_SPEED * dt_scaled)
                 dash_timer -= dt_scaled
             else:
                 if dash_down and dash_cooldown <= 0.0:
@@ -2203,38 +2488,41 @@ def main():
                 dash_cooldown = 0
 
             # Regular x-movement (outside dash)
-            player_rect.x += int(move_x)
+            step_dx += int(move_x)
+
+            # Knockback
+            if knock_timer > 0:
+                step_dx += int(knock_dx * dt_scaled)
+                knock_timer -= dt_scaled
 
             # Clamp x
-            player_rect.x = clamp(player_rect.x, int(40 * scale_factor), screen_w - player_rect.width)
+            step_dx = clamp(start_x + step_dx, int(40 * scale_factor), screen_w - player_rect.width) - start_x
 
-            # ------------------------------------------------
-            # Collision with ground
-            # ------------------------------------------------
-            ground_y = int(screen_h * config.GROUND_Y_RATIO) - player_rect.height
-            if player_rect.y >= ground_y:
-                player_rect.y = ground_y
-                if not on_ground:
-                    if land_snd:
-                        land_snd.play()
-                    dust_particles.extend(spawn_dust_particles(
-                        player_rect.centerx, player_rect.bottom, scale_factor,
-                        settings["particle_density"]
-                    ))
-                on_ground = True
-                player_vel_y = 0
-            else:
-                on_ground = False
+            # Custom level chunks entering the viewport
+            plat_scroll = int((GAME_SPEED_BASE * settings["game_speed_mult"]) * dt_scaled)
+            level_stream = wstate.get("level_stream")
+            if level_stream is not None:
+                stream_update(level_stream, wstate, screen_w, plat_scroll)
 
             # ------------------------------------------------
-            # Platforms update
+            # Platforms update + swept landing
             # ------------------------------------------------
-            new_plats = []
-            for p in plats_list:
+            # Each platform moves first, then the player's whole frame
+            # displacement is swept against it (relative motion), so a
+            # dash, a bounce launch or a long fall at low FPS cannot
+            # step over a thin platform between two frames.
+            land_t = None
+            land_plat = None
+            plat_pool = pools["platform"]
+            i = 0
+            while i < len(plats_list):
+                p = plats_list[i]
                 r = p["rect"]
+                old_px = r.x
+                old_py = r.y
 
                 # Move platforms
-                r.x -= int((GAME_SPEED_BASE * settings["game_speed_mult"]) * dt_scaled)
+                r.x -= plat_scroll
                 r.x += int(p["vx"] * dt_scaled)
 
                 # Update falling
@@ -2247,40 +2535,88 @@ def main():
                 # Fragile logic
                 if p["type"] == "fragile":
                     if p["fragile_hits"] >= config.PLATFORM_TYPE_CONFIG["fragile"]["hits_to_break"]:
+                        p["grid_id"] = -1
+                        plat_pool.release(p)
+                        swap_remove(plats_list, i)
                         continue
 
                 if r.right < -200 or r.top > screen_h + 200:
+                    p["grid_id"] = -1
+                    plat_pool.release(p)
+                    swap_remove(plats_list, i)
                     continue
-                new_plats.append(p)
-            plats_list = new_plats
 
-            # Stand on platform?
-            for p in plats_list:
-                r = p["rect"]
-                if (
-                    player_rect.bottom <= r.top + 10 and
-                    player_rect.bottom >= r.top - 15 and
-                    r.left < player_rect.centerx < r.right and
-                    player_vel_y >= 0
-                ):
-                    player_rect.bottom = r.top
-                    player_vel_y = 0
-                    if not on_ground:
-                        dust_particles.extend(spawn_dust_particles(
-                            player_rect.centerx, player_rect.bottom, scale_factor,
-                            settings["particle_density"]
-                        ))
-                    on_ground = True
-
-                    # Bounce platforms
-                    if p["type"] == "bounce":
-                        player_vel_y = JUMP_STRENGTH * config.PLATFORM_TYPE_CONFIG["bounce"]["bounce_mult"]
-                    # Fall platforms
-                    elif p["type"] == "fall":
-                        p["fall_started"] = True
-                    # Fragile
-                    elif p["type"] == "fragile":
-                        p["fragile_hits"] += 1
+                # Earliest one-way landing this frame (static custom-level
+                # platforms are looked up in the level grid below instead)
+                if player_vel_y >= 0 and (p["grid_id"] < 0 or p["fall_started"]):
+                    t = sweep_landing(player_rect, step_dx, step_dy, r, r.x - old_px, r.y - old_py)
+                    if t is not None and (land_t is None or t < land_t):
+                        land_t = t
+                        land_plat = p
+                i += 1
+
+            if level_stream is not None and player_vel_y >= 0:
+                p = stream_grid_platform(level_stream, player_rect, step_dx, step_dy, plat_scroll)
+                if p is not None:
+                    t = sweep_landing(player_rect, step_dx, step_dy, p["rect"], -plat_scroll, 0)
+                    if t is not None and (land_t is None or t < land_t):
+                        land_t = t
+                        land_plat = p
+
+            # ------------------------------------------------
+            # Collision with ground (swept: the ground is a half-space)
+            # ------------------------------------------------
+            ground_top = int(screen_h * config.GROUND_Y_RATIO)
+            ground_t = None
+            if player_rect.bottom + step_dy >= ground_top:
+                if step_dy > 0 and player_rect.bottom < ground_top:
+                    ground_t = (ground_top - player_rect.bottom) / step_dy
+                else:
+                    ground_t = 0.0
+
+            player_rect.x = start_x + step_dx
+            player_rect.y = start_y + step_dy
+
+            # Stand on platform? (only if it is reached before the ground)
+            if land_plat is not None and (ground_t is None or land_t <= ground_t):
+                p = land_plat
+                player_rect.bottom = p["rect"].top
+                player_vel_y = 0
+                if not on_ground:
+                    land_timer = config.LAND_SQUASH_TIME
+                    spawn_dust_particles(
+                        player_rect.centerx, player_rect.bottom, scale_factor,
+                        settings["particle_density"], pool=particle_pool, out=dust_particles
+                    )
+                on_ground = True
+
+                # Bounce platforms
+                if p["type"] == "bounce":
+                    player_vel_y = JUMP_STRENGTH * config.PLATFORM_TYPE_CONFIG["bounce"]["bounce_mult"]
+                # Fall platforms
+                elif p["type"] == "fall":
+                    p["fall_started"] = True
+                # Fragile
+                elif p["type"] == "fragile":
+                    p["fragile_hits"] += 1
+            elif ground_t is not None:
+                player_rect.bottom = ground_top
+                if not on_ground:
+                    land_timer = config.LAND_SQUASH_TIME
+                    if land_snd:
+                        land_snd.play()
+                    spawn_dust_particles(
+                        player_rect.centerx, player_rect.bottom, scale_factor,
+                        settings["particle_density"], pool=particle_pool, out=dust_particles
+                    )
+                on_ground = True
+                player_vel_y = 0
+            else:
+                on_ground = False
+
+            # Actual displacement after landing, for the enemy sweep
+            moved_dx = player_rect.x - start_x
+            moved_dy = player_rect.y - start_y
 
             # ------------------------------------------------
             # RUN / DASH DUST TRAILS
@@ -2291,25 +2627,25 @@ def main():
 
                 # Light dust while running on the ground
                 if on_ground and move_x != 0 and run_dust_timer <= 0.0:
-                    dust_particles.extend(
-                        spawn_dust_particles(
-                            player_rect.centerx,
-                            player_rect.bottom,
-                            scale_factor,
-                            density="low",
-                        )
+                    spawn_dust_particles(
+                        player_rect.centerx,
+                        player_rect.bottom,
+                        scale_factor,
+                        density="low",
+                        pool=particle_pool,
+                        out=dust_particles,
                     )
                     run_dust_timer = RUN_DUST_INTERVAL
 
                 # Heavier trail while dashing on the ground
                 if dash_active and on_ground and dash_trail_timer <= 0.0:
-                    dust_particles.extend(
-                        spawn_dust_particles(
-                            player_rect.centerx,
-                            player_rect.bottom,
-                            scale_factor,
-                            density=settings.get("particle_density", "medium"),
-                        )
+                    spawn_dust_particles(
+                        player_rect.centerx,
+                        player_rect.bottom,
+                        scale_factor,
+                        density=settings.get("particle_density", "medium"),
+                        pool=particle_pool,
+                        out=dust_particles,
                     )
                     dash_trail_timer = DASH_TRAIL_INTERVAL
 
@@ -2324,19 +2660,19 @@ def main():
 
             # TREE SPAWN
             if now_ms - wstate["last_tree_spawn"] >= config.OBSTACLE_SPAWN_DELAY_BASE / settings["game_speed_mult"]:
-                t = spawn_tree(tree_img, screen_w, screen_h, scale_factor)
+                t = spawn_tree(tree_img, screen_w, screen_h, scale_factor, pool=pools["tree"])
                 trees_list.append(t)
                 wstate["last_tree_spawn"] = now_ms
 
             # COIN SPAWN
             if now_ms - wstate["last_coin_spawn"] >= config.COIN_SPAWN_DELAY_BASE / settings["game_speed_mult"]:
-                c = spawn_coin(screen_w, screen_h, coin_img, scale_factor)
+                c = spawn_coin(screen_w, screen_h, coin_img, scale_factor, pool=pools["coin"])
                 coins_list.append(c)
                 wstate["last_coin_spawn"] = now_ms
 
             # PLATFORM SPAWN
             if now_ms - wstate["last_platform_spawn"] >= config.PLATFORM_SPAWN_DELAY_BASE / settings["game_speed_mult"]:
-                p = spawn_platform(screen_w, screen_h, scale_factor)
+                p = spawn_platform(screen_w, screen_h, scale_factor, pool=plat_pool)
                 plats_list.append(p)
                 wstate["last_platform_spawn"] = now_ms
 
@@ -2346,7 +2682,8 @@ def main():
                         p["rect"],
                         enemy_sprites["walker"],
                         scale_factor,
-                        kind="walker"
+                        kind="walker",
+                        pool=pools["enemy"],
                     )
                     if enemy:
                         enemies_list.append(enemy)
@@ -2358,13 +2695,15 @@ def main():
                 if cfg_e["spawn_type"] == "air":
                     if random.random() < cfg_e["spawn_chance"] * settings["enemy_spawn_mult"] * world_enemy_spawn_mult * dt_scaled:
                         e = spawn_air_enemy(kind, enemy_sprites, screen_w, screen_h,
-                                            settings["enemy_spawn_mult"] * world_enemy_spawn_mult, scale_factor)
+                                            settings["enemy_spawn_mult"] * world_enemy_spawn_mult, scale_factor,
+                                            pool=pools["enemy"])
                         if e:
                             enemies_list.append(e)
 
                 elif cfg_e["spawn_type"] == "ground":
                     if random.random() < cfg_e["spawn_chance"] * settings["enemy_spawn_mult"] * world_enemy_spawn_mult * dt_scaled:
-                        e = spawn_ground_enemy(kind, enemy_sprites, screen_w, screen_h, scale_factor)
+                        e = spawn_ground_enemy(kind, enemy_sprites, screen_w, screen_h, scale_factor,
+                                               pool=pools["enemy"])
                         if e:
                             enemies_list.append(e)
 
@@ -2374,12 +2713,14 @@ def main():
             if level in BOSS_LEVELS and not wstate.get("boss_wave_spawned", False):
                 # Spawn a small crowd of tougher enemies as a mini-boss wave
                 for i in range(config.BOSS_WAVE_GROUND_COUNT):
-                    e = spawn_ground_enemy("jumper", enemy_sprites, screen_w, screen_h, scale_factor)
+                    e = spawn_ground_enemy("jumper", enemy_sprites, screen_w, screen_h, scale_factor,
+                                           pool=pools["enemy"])
                     if e:
                         e["rect"].x += i * int(config.BOSS_WAVE_GROUND_SPACING * scale_factor)
                         enemies_list.append(e)
                 for i in range(config.BOSS_WAVE_FLYER_COUNT):
-                    e = spawn_air_enemy("flyer", enemy_sprites, screen_w, screen_h, world_enemy_spawn_mult * 1.5, scale_factor)
+                    e = spawn_air_enemy("flyer", enemy_sprites, screen_w, screen_h, world_enemy_spawn_mult * 1.5, scale_factor,
+                                        pool=pools["enemy"])
                     if e:
                         base_y = int(screen_h * config.BOSS_WAVE_FLYER_BASE_Y_RATIO)
                         e["rect"].y = base_y + i * int(config.BOSS_WAVE_FLYER_SPACING * scale_factor)
@@ -2391,22 +2732,48 @@ def main():
             # ------------------------------------------------
 
             # Trees (decor collisions not harmful)
-            new_trees = []
-            for t in trees_list:
+            tree_pool = pools["tree"]
+            i = 0
+            while i < len(trees_list):
+                t = trees_list[i]
                 t.x -= int((GAME_SPEED_BASE * settings["game_speed_mult"] * world_scroll_mult) * dt_scaled)
-                if t.right > -100:
-                    new_trees.append(t)
-            trees_list = new_trees
+                if t.right <= -100:
+                    tree_pool.release(t)
+                    swap_remove(trees_list, i)
+                    continue
+                i += 1
+
+            # Precise collision: rect broadphase, then sprite masks.
+            # Masks and rects are those of the drawn (mirrored / squashed) variants.
+            mask_cache.begin_frame()
+            player_hit_rect = player_rect
+            if settings.get("precise_collision", True):
+                base = pick_player_frame(on_ground, move_x != 0, now, skin_idle, skin_run, skin_jump)
+                player_mask = sprite_masks.get(base)
+                if player_mask is not None:
+                    img = sprite_variants.get(
+                        base, flip=facing < 0, squash=player_squash(land_timer, on_ground, player_vel_y)
+                    )
+                    player_mask = sprite_variants.mask(img, base, player_mask)
+                    player_hit_rect = img.get_rect(midbottom=base.get_rect(topleft=player_rect.topleft).midbottom)
+                coin_mask = sprite_masks.get(coin_img)
+            else:
+                player_mask = None
+                coin_mask = None
 
             # Coins
-            new_coins = []
-            for c in coins_list:
+            coin_pool = pools["coin"]
+            i = 0
+            while i < len(coins_list):
+                c = coins_list[i]
                 c.x -= int((GAME_SPEED_BASE * settings["game_speed_mult"] * world_scroll_mult) * dt_scaled)
                 if c.right < -50:
+                    coin_pool.release(c)
+                    swap_remove(coins_list, i)
                     continue
 
                 # Collect
-                if c.colliderect(player_rect):
+                if mask_cache.collide(player_hit_rect, player_mask, c, coin_mask):
                     coins_collected_run += 1
                     # Achievement: 100 coins in one run
                     if coins_collected_run >= 100:
@@ -2417,22 +2784,23 @@ def main():
                     # Coin pickup feedback: sound + spark burst
                     if coin_snd:
                         coin_snd.play()
-                    spark_particles.extend(
-                        spawn_spark_burst(
-                            c.centerx,
-                            c.centery,
-                            scale_factor,
-                            density=settings.get("particle_density", "medium"),
-                        )
+                    spawn_spark_burst(
+                        c.centerx,
+                        c.centery,
+                        scale_factor,
+                        density=settings.get("particle_density", "medium"),
+                        pool=particle_pool,
+                        out=spark_particles,
                     )
+                    coin_pool.release(c)
+                    swap_remove(coins_list, i)
                     continue
-                new_coins.append(c)
-            coins_list = new_coins
+                i += 1
 
             # Enemy update
             enemies_list = update_enemies(
                 enemies_list, dt_scaled, GAME_SPEED_BASE * settings["game_speed_mult"] * world_scroll_mult,
-                scale_factor, player_rect, screen_w, screen_h
+                scale_factor, player_rect, screen_w, screen_h, pool=pools["enemy"]
             )
 
             # ------------------------------------------------
@@ -2442,7 +2810,24 @@ def main():
                 inv_timer -= dt_scaled
             else:
                 for e in enemies_list:
-                    if e["rect"].colliderect(player_rect):
+                    er = e["rect"]
+                    enemy_hit_rect = er
+                    enemy_mask = None
+                    base = enemy_sprites.get(e["kind"]) if player_mask else None
+                    if base is not None:
+                        enemy_mask = sprite_masks.get(base)
+                        if enemy_mask is not None:
+                            img, enemy_hit_rect = enemy_variant(sprite_variants, base, e)
+                            enemy_mask = sprite_variants.mask(img, base, enemy_mask)
+                    hit = mask_cache.collide(player_hit_rect, player_mask, enemy_hit_rect, enemy_mask)
+                    if not hit and not player_rect.colliderect(er) and (moved_dx or moved_dy):
+                        # Passed clean through it this frame?
+                        t = sweep_aabb(
+                            start_x, start_y, player_rect.width, player_rect.height,
+                            moved_dx, moved_dy, er
+                        )
+                        hit = t is not None and t > 0.0
+                    if hit:
                         dmg = config.ENEMY_CONFIG[e["kind"]]["damage"]
                         dmg = int(dmg * settings["enemy_damage_mult"] * world_enemy_damage_mult)
                         health -= dmg
@@ -2450,18 +2835,13 @@ def main():
                         inv_timer = INVINCIBLE_TIME
 
                         knock_timer = KNOCKBACK_TIME
-                        knock_dx = -KNOCKBACK_SPEED * scale_factor * sign(player_rect.centerx - e["rect"].centerx)
+                        knock_dx = -KNOCKBACK_SPEED * scale_factor * sign(player_rect.centerx - er.centerx)
 
                         # Hit feedback: brief, punchy shake
                         shake_timer = SCREEN_SHAKE_HIT
                         if hit_snd:
                             hit_snd.play()
 
-            # Knockback
-            if knock_timer > 0:
-                player_rect.x += int(knock_dx * dt_scaled)
-                knock_timer -= dt_scaled
-
             # ------------------------------------------------
             # LEVEL UP
             # ------------------------------------------------
@@ -2473,12 +2853,14 @@ def main():
 
                 # Level up bursts
                 for _ in range(diff):
-                    spark_particles.extend(spawn_levelup_burst(
+                    spawn_levelup_burst(
                         player_rect.centerx,
                         player_rect.centery,
                         scale_factor,
-                        settings["particle_density"]
-                    ))
+                        settings["particle_density"],
+                        pool=particle_pool,
+                        out=spark_particles,
+                    )
 
                 shake_timer = SCREEN_SHAKE_KILL
                 wstate["boss_wave_spawned"] = False
@@ -2569,8 +2951,8 @@ def main():
             # ------------------------------------------------
             # UPDATE PARTICLES
             # ------------------------------------------------
-            dust_particles = update_particles(dust_particles, dt_scaled, GRAVITY, scale_factor)
-            spark_particles = update_particles(spark_particles, dt_scaled, GRAVITY, scale_factor)
+            dust_particles = update_particles(dust_particles, dt_scaled, GRAVITY, scale_factor, pool=particle_pool)
+            spark_particles = update_particles(spark_particles, dt_scaled, GRAVITY, scale_factor, pool=particle_pool)
 
             # Save updated world state
             wstate["player_vel_y"] = player_vel_y
@@ -2593,6 +2975,8 @@ def main():
             wstate["dash_timer"] = dash_timer
             wstate["dash_cooldown"] = dash_cooldown
             wstate["dash_dir"] = dash_dir
+            wstate["facing"] = facing
+            wstate["land_timer"] = max(0.0, land_timer - dt_scaled)
             wstate["shake_timer"] = shake_timer
             wstate["run_dust_timer"] = run_dust_timer
             wstate["dash_trail_timer"] = dash_trail_timer
@@ -2610,34 +2994,36 @@ def main():
                     (0, int(screen_h * config.GROUND_Y_RATIO), screen_w, screen_h)
                 )
 
-            # Trees
+            # Trees, platforms, coins, enemies: culled to the screen and
+            # batched per source surface (see entity_renderer.py)
+            entity_renderer.begin(screen_rect)
             for t in trees_list:
-                if tree_img:
-                    game_surface.blit(tree_img, t)
-                else:
+                if entity_renderer.add("trees", tree_img, t) and tree_img is None:
                     pygame.draw.rect(game_surface, (40, 120, 40), t)
+            entity_renderer.flush(game_surface)
 
-            # Platforms
+            # Platforms (composed once per type and size, see platform_art.py)
             for p in plats_list:
                 r = p["rect"]
-                c = (140, 180, 220)
-                pygame.draw.rect(game_surface, c, r)
-                pygame.draw.rect(game_surface, WHITE, r, 2)
+                if entity_renderer.cull("platforms", r):
+                    entity_renderer.queue(platform_art.surface(p["type"], r.width, r.height), r)
+            entity_renderer.flush(game_surface)
 
             # Coins
             for c in coins_list:
-                if coin_img:
-                    game_surface.blit(coin_img, c)
-                else:
+                if entity_renderer.add("coins", coin_img, c) and coin_img is None:
                     pygame.draw.circle(game_surface, (240, 200, 40), c.center, c.width // 2)
+            entity_renderer.flush(game_surface)
 
-            # Enemies
+            # Enemies (stretched while jumping up, mirrored when moving right)
             for e in enemies_list:
                 img = enemy_sprites.get(e["kind"])
                 if img:
-                    game_surface.blit(img, e["rect"])
-                else:
+                    img, dest = enemy_variant(sprite_variants, img, e)
+                    entity_renderer.add("enemies", img, dest)
+                elif entity_renderer.add("enemies", None, e["rect"]):
                     pygame.draw.rect(game_surface, (200, 40, 40), e["rect"])
+            entity_renderer.flush(game_surface)
 
             # Particles
             for p in dust_particles:
@@ -2648,22 +3034,22 @@ def main():
             # ------------------------------------------------
             # Player drawing (animations + damage flash)
             # ------------------------------------------------
-            if not on_ground:
-                img = skin_jump
-            elif move_x != 0:
-                img = skin_run[int((now * 10) % len(skin_run))] if skin_run else skin_idle[0]
-            else:
-                img = skin_idle[int((now * 6) % len(skin_idle))] if skin_idle else None
+            img = pick_player_frame(on_ground, move_x != 0, now, skin_idle, skin_run, skin_jump)
 
             if img:
-                game_surface.blit(img, player_rect)
+                # Squash on landing, stretch while rising, mirror when facing left;
+                # variants keep the frame's bottom centre where the base frame has it
+                base_rect = img.get_rect(topleft=player_rect.topleft)
+                img = sprite_variants.get(
+                    img, flip=facing < 0, squash=player_squash(land_timer, on_ground, player_vel_y)
+                )
+                pos = img.get_rect(midbottom=base_rect.midbottom)
+                game_surface.blit(img, pos)
                 # Damage flash while invincible: white overlay blink
                 if inv_timer > 0:
                     # Blink at configurable frequency during i-frames
                     if int(inv_timer * HIT_FLASH_FREQUENCY) % 2 == 0:
-                        flash = img.copy()
-                        flash.fill((255, 255, 255, 0), None, pygame.BLEND_RGBA_MULT)
-                        game_surface.blit(flash, player_rect)
+                        game_surface.blit(sprite_variants.flash(img), pos)
             else:
                 base_color = (80, 200, 80)
                 if inv_timer > 0 and int(inv_timer * HIT_FLASH_FREQUENCY) % 2 == 0:
@@ -2757,6 +3143,12 @@ def main():
                         story_surf = fonts["small"].render(level_intro_story, True, (220, 220, 220))
                         game_surface.blit(story_surf, story_surf.get_rect(center=(screen_w // 2, int(190 * ui_scale))))
 
+            # Pausing waits for the frame to be drawn so the pause menu can freeze it
+            if pause_requested and game_state == "playing":
+                game_state = "paused"
+                pause_focus = 0
+            pause_requested = False
+
         # =====================================================
         #  GAMESTATE: LEVEL EDITOR (RENDER)
         # =====================================================
@@ -2807,11 +3199,14 @@ def main():
         #  GAMESTATE: MENUS (PAUSE, SETTINGS, GAME OVER, etc.)
         # =====================================================
 
+        menu_widgets = None
         if game_state != "playing" and game_state != "level_editor":
 
-            overlay = pygame.Surface((screen_w, screen_h), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 180))
-            game_surface.blit(overlay, (0, 0))
+            # First menu frame: freeze what was drawn (darkened) as the backdrop
+            if not menu_backdrop.ready(game_surface.get_size()):
+                menu_backdrop.capture(game_surface)
+                menu_backdrop.draw(game_surface)
+            start_widget_log()
 
             midx = screen_w // 2
             midy = screen_h // 2
@@ -2954,8 +3349,17 @@ def main():
                     focused=focused
                 )
 
-                # Note about when VSync takes effect
-                note_text = "Note: VSync changes apply on next restart"
+                # Apply row
+                focused = (display_focus == len(opts) + 2)
+                display_apply_rect = Rect(
+                    panel.left + int(40 * ui_scale),
+                    y + int(140 * ui_scale),
+                    panel.width - int(80 * ui_scale),
+                    int(60 * ui_scale),
+                )
+                draw_button(game_surface, display_apply_rect, "Apply", fonts["normal"], primary=True, focused=focused)
+
+                note_text = "Changes take effect when you select Apply"
                 note_surf = fonts["tiny"].render(note_text, True, WHITE)
                 note_rect = note_surf.get_rect(
                     center=(panel.centerx, panel.bottom - int(30 * ui_scale))
@@ -3090,8 +3494,9 @@ def main():
                 rarity = meta.get("rarity", "Common")
                 desc = meta.get("description", "")
 
-                preview_skin = skins_assets.get(skin_name, skins_assets["default"])
-                draw_skin_preview(game_surface, card, preview_skin, ui_scale)
+                if not draw_cached_skin_preview(game_surface, card, ui_scale, skin_name):
+                    preview_skin = skins_assets.get(skin_name) or skins_assets["default"]
+                    draw_skin_preview(game_surface, card, preview_skin, ui_scale, cache_key=skin_name)
 
                 name_surf = fonts["large"].render(display_name, True, WHITE)
                 game_surface.blit(name_surf, name_surf.get_rect(center=(midx, card.top + int(40 * ui_scale))))
@@ -3425,6 +3830,7 @@ def main():
                     game_over_option_rects.append(rect)
                     y += int(60 * ui_scale)
 
+            menu_widgets = stop_widget_log()
 
         # =====================================================
         #  APPLY SCREEN SHAKE
@@ -3440,15 +3846,65 @@ def main():
         # =====================================================
         #  FX OVERLAYS
         # =====================================================
+        # Computed passes (bloom, CRT) first, see postfx.py; otherwise the mask
         fx_mode = settings.get("fx_mode", "off")
-        if fx_mode in fx_masks and fx_masks[fx_mode]:
-            final_surface.blit(fx_masks[fx_mode], (0, 0))
+        fx_computed = postfx.computed(settings)
+
+        # Menus present only the widgets that changed (menu_redraw.py);
+        # a computed pass changes the whole frame
+        present_rects = None
+        if menu_widgets is not None:
+            present_rects = menu_redraw.dirty_rects(
+                (game_state, final_surface.get_size()),
+                menu_widgets,
+                full=fx_computed or show_debug_overlay or not menu_redraw.quiet(frame_events),
+            )
+        else:
+            menu_redraw.reset()
+
+        if fx_computed:
+            postfx.apply(final_surface, settings)
+        elif fx_masks.get(fx_mode):
+            if present_rects is None:
+                final_surface.blit(fx_masks[fx_mode], (0, 0))
+            else:
+                for rect in present_rects:
+                    final_surface.blit(fx_masks[fx_mode], rect, rect)
+
+        # =====================================================
+        #  DEBUG OVERLAY
+        # =====================================================
+        if show_debug_overlay:
+            debug_lines = [f"FPS {clock.get_fps():5.1f}  state {game_state}"]
+            debug_lines.extend(pool_telemetry(entity_pools))
+            if wstate.get("level_stream") is not None:
+                debug_lines.append(stream_telemetry(wstate["level_stream"]))
+            debug_lines.append(mask_cache.telemetry())
+            debug_lines.extend(asset_manager.telemetry())
+            debug_lines.append(skins_assets.telemetry())
+            debug_lines.append(platform_art.telemetry())
+            debug_lines.append(sprite_variants.telemetry())
+            debug_lines.append(entity_renderer.telemetry())
+            debug_lines.append(postfx.telemetry())
+            debug_lines.append(menu_backdrop.telemetry())
+            debug_lines.append(menu_redraw.telemetry())
+            if hot_reloader is not None:
+                debug_lines.append(hot_reloader.telemetry())
+            draw_debug_overlay(final_surface, debug_lines, fonts["tiny"], ui_scale)
 
         # =====================================================
         #  BLIT TO SCREEN
         # =====================================================
-        screen.blit(final_surface, (0, 0))
-        pygame.display.flip()
+        if present_rects is None:
+            screen.blit(final_surface, (0, 0))
+            pygame.display.flip()
+        elif present_rects:
+            for rect in present_rects:
+                screen.blit(final_surface, rect, rect)
+            pygame.display.update(present_rects)
+        asset_registry.next_frame()
+        if asset_registry.frame % FPS == 0:
+            asset_registry.check_budgets()
         clock.tick(FPS)
 
     pygame.quit()
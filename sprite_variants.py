@@ -0,0 +1,99 @@
+# ============================================================
+#  Slimey - SPRITE VARIANTS
+# ------------------------------------------------------------
+# Frames derived from a loaded sprite at draw time used to be
+# rebuilt every frame (the hit flash copied and filled the
+# player frame on each blink). SpriteVariants builds them on
+# first use and keeps them with their base frame:
+#
+#   get(img, flip=True)       mirrored horizontally
+#   get(img, squash=0.5)      squash (>0) / stretch (<0), the
+#                             amount quantized to
+#                             SPRITE_SQUASH_STEPS per side
+#   flash(img)                white silhouette for hit blinks
+#   mask(variant, base, m)    collision mask of a variant, so
+#                             precise collision tests the pixels
+#                             that are drawn
+#
+# Variants are keyed weakly on the base surface: when a skin is
+# evicted or a sprite hot-reloaded, its variants go with it.
+# Variants of variants (the flash of a flipped frame) hang off
+# the variant, so they are dropped together too. Variant masks
+# are keyed weakly on the variant surface in the same way.
+# ============================================================
+
+import weakref
+
+import pygame
+
+import config
+from asset_manager import classify_surface, finish_surface
+from asset_memory import registry
+from collision import build_mask
+
+
+class SpriteVariants:
+    """Lazily built, weakly cached flip / squash / flash variants of sprite frames."""
+
+    def __init__(self):
+        self._variants = weakref.WeakKeyDictionary()   # base -> {variant key: surface}
+        self._masks = weakref.WeakKeyDictionary()      # variant -> collision mask
+        self.builds = 0
+
+    def _cached(self, img, key, build):
+        table = self._variants.get(img)
+        if table is None:
+            table = self._variants[img] = {}
+        out = table.get(key)
+        if out is None:
+            out = table[key] = registry.track(build(), "variants")
+            self.builds += 1
+        return out
+
+    def squash_step(self, amount):
+        """Quantized squash step for an amount in [-1, 1]."""
+        steps = config.SPRITE_SQUASH_STEPS
+        return max(-steps, min(steps, round(amount * steps)))
+
+    def get(self, img, flip=False, squash=0.0):
+        """`img` mirrored and/or squashed (the base itself when neither applies)."""
+        step = self.squash_step(squash)
+        if step:
+            img = self._cached(img, ("squash", step), lambda: self._squash(img, step))
+        if flip:
+            img = self._cached(img, ("flip",), lambda: pygame.transform.flip(img, True, False))
+        return img
+
+    def flash(self, img):
+        """White silhouette of `img` (same size), drawn over it while blinking."""
+        return self._cached(img, ("flash",), lambda: self._flash(img))
+
+    def mask(self, variant, base, base_mask):
+        """
+        Collision mask of `variant` (a get() result for `base`, whose own
+        mask is `base_mask`); None when the base has no mask either.
+        """
+        if variant is base or base_mask is None:
+            return base_mask
+        out = self._masks.get(variant)
+        if out is None:
+            out = self._masks[variant] = build_mask(variant)
+        return out
+
+    def _squash(self, img, step):
+        k = step / config.SPRITE_SQUASH_STEPS * config.SPRITE_SQUASH_MAX
+        w, h = img.get_size()
+        return pygame.transform.scale(img, (max(1, round(w * (1 + k))), max(1, round(h * (1 - k)))))
+
+    def _flash(self, img):
+        # From the mask so colorkey and per-pixel alpha frames both work
+        mask = pygame.mask.from_surface(img)
+        out = mask.to_surface(setcolor=(255, 255, 255, 255), unsetcolor=(0, 0, 0, 0))
+        return finish_surface(out, classify_surface(out))
+
+    def clear(self):
+        self._variants.clear()
+        self._masks.clear()
+
+    def telemetry(self):
+        return f"variants bases {len(self._variants)}  built {self.builds}"
@@ -0,0 +1,207 @@
+# ============================================================
+#  Slimey - CUSTOM LEVEL STREAMING
+# ------------------------------------------------------------
+# Custom levels (levels/custom/level_XX.json) are authored in
+# world space and usually run far past the right screen edge.
+# On load they are split into fixed-width chunks, each keeping
+# its platforms / coins / enemies sorted by left edge; a
+# camera_x scrolls with the platforms and every entity is
+# acquired from the entity pools once its own left edge comes
+# within LEVEL_STREAM_LOOKAHEAD of the viewport (screen x =
+# world x - camera_x), a cursor per list marking how far the
+# current chunk has gone live. Activating per entity rather
+# than per chunk keeps new enemies inside the run loop's
+# right-edge cull margin. That culling retires them again, so
+# the live entity count depends on the screen width, not level
+# length.
+#
+# Chunk entries stay in authored level pixels; `scale` maps them
+# to the screen (1.0 until a resolution change, see
+# world.remap_state, which also rescales camera_x and the sizes).
+#
+# Platforms still at their authored spot are also indexed by the
+# level's static tile grid (levelgrid.py): the run loop asks the
+# grid for the one platform under the player instead of sweeping
+# every live custom platform.
+# ============================================================
+
+from pygame import Rect
+
+import config
+from world import make_platform, make_enemy
+
+
+def build_level_stream(data, coin_size, enemy_sizes, grid=None, chunk_w=None):
+    """
+    Split a custom level dict into world-space chunks.
+    `coin_size` is (w, h) and `enemy_sizes` maps kind -> (w, h),
+    resolved once here so activation never touches sprites.
+    `grid` is the level's LevelGrid (platform indices match `data`).
+    """
+    if chunk_w is None:
+        chunk_w = config.LEVEL_CHUNK_WIDTH
+
+    by_index = {}
+
+    def chunk_for(left_x):
+        idx = max(0, int(left_x) // chunk_w)
+        chunk = by_index.get(idx)
+        if chunk is None:
+            chunk = by_index[idx] = {"platforms": [], "coins": [], "enemies": [], "cursor": [0, 0, 0]}
+        return chunk
+
+    # Bucket by left edge so nothing can pop in already on screen;
+    # every entry starts with that left edge
+    platforms = data.get("platforms", [])
+    for i, p in enumerate(platforms):
+        x = int(p["x"])
+        chunk_for(x)["platforms"].append(
+            (x, i, int(p["y"]), int(p["w"]), int(p["h"]), p.get("type", "normal"))
+        )
+
+    cw = coin_size[0]
+    for c in data.get("coins", []):
+        x = int(c["x"])
+        chunk_for(x - cw // 2)["coins"].append((x - cw // 2, x, int(c["y"])))
+
+    for e in data.get("enemies", []):
+        x = int(e["x"])
+        kind = e.get("kind", "walker")
+        ew = enemy_sizes.get(kind, coin_size)[0]
+        chunk_for(x - ew // 2)["enemies"].append((x - ew // 2, x, int(e["y"]), kind))
+
+    for chunk in by_index.values():
+        for key in ("platforms", "coins", "enemies"):
+            chunk[key].sort(key=lambda entry: entry[0])
+
+    return {
+        "chunks": [(idx * chunk_w, by_index[idx]) for idx in sorted(by_index)],
+        "next_chunk": 0,
+        "camera_x": 0,
+        "chunk_w": chunk_w,
+        "coin_size": coin_size,
+        "enemy_sizes": enemy_sizes,
+        "grid": grid,
+        "live_platforms": [None] * len(platforms),
+        "scale": [1.0, 1.0],   # authored level px -> screen px (x, y)
+    }
+
+
+def _activate_until(chunk, edge, stream, wstate):
+    """
+    Activate the chunk's entities whose left edge is <= `edge` (world x).
+    Returns True once every entity of the chunk is live.
+    """
+    pools = wstate.get("pools") or {}
+    cam = stream["camera_x"]
+    sx, sy = stream["scale"]
+    cursor = chunk["cursor"]
+
+    plat_pool = pools.get("platform")
+    plats = wstate["platforms"]
+    live = stream["live_platforms"]
+    entries = chunk["platforms"]
+    n = cursor[0]
+    while n < len(entries) and entries[n][0] <= edge:
+        x, i, y, w, h, ptype = entries[n]
+        p = make_platform(
+            round(x * sx) - cam, round(y * sy), max(1, round(w * sx)), max(1, round(h * sy)),
+            ptype, pool=plat_pool,
+        )
+        p["grid_id"] = i
+        live[i] = p
+        plats.append(p)
+        n += 1
+    cursor[0] = n
+
+    coin_pool = pools.get("coin")
+    coins = wstate["coins"]
+    cw, ch = stream["coin_size"]
+    entries = chunk["coins"]
+    n = cursor[1]
+    while n < len(entries) and entries[n][0] <= edge:
+        _, x, y = entries[n]
+        r = coin_pool.acquire() if coin_pool else Rect(0, 0, 0, 0)
+        r.update(0, 0, cw, ch)
+        r.center = (round(x * sx) - cam, round(y * sy))
+        coins.append(r)
+        n += 1
+    cursor[1] = n
+
+    enemy_pool = pools.get("enemy")
+    enemies = wstate["enemies"]
+    entries = chunk["enemies"]
+    n = cursor[2]
+    while n < len(entries) and entries[n][0] <= edge:
+        _, x, y, kind = entries[n]
+        w, h = stream["enemy_sizes"].get(kind, stream["coin_size"])
+        enemy = make_enemy(kind, w, h, 0.0, "idle", pool=enemy_pool)
+        r = enemy["rect"]
+        r.center = (round(x * sx) - cam, round(y * sy))
+        enemy["base_y"] = float(r.centery)
+        enemies.append(enemy)
+        n += 1
+    cursor[2] = n
+
+    return (
+        cursor[0] == len(chunk["platforms"])
+        and cursor[1] == len(chunk["coins"])
+        and cursor[2] == len(chunk["enemies"])
+    )
+
+
+def stream_update(stream, wstate, screen_w, scroll_px):
+    """
+    Activate every entity whose left edge is within the lookahead of
+    the right screen edge, then advance the camera by this frame's
+    platform scroll (`scroll_px`, the same int step the platforms use).
+    Call before the entity update so new entities scroll this frame.
+    """
+    chunks = stream["chunks"]
+    # Screen edge back in authored level px, where the chunks live
+    edge = (stream["camera_x"] + screen_w + config.LEVEL_STREAM_LOOKAHEAD) / stream["scale"][0]
+    # Only the first not-fully-live chunk can be partly activated: later
+    # chunks start past the left edge of everything still pending in it
+    while stream["next_chunk"] < len(chunks) and chunks[stream["next_chunk"]][0] <= edge:
+        if not _activate_until(chunks[stream["next_chunk"]][1], edge, stream, wstate):
+            break
+        stream["next_chunk"] += 1
+    stream["camera_x"] += scroll_px
+
+
+def stream_grid_platform(stream, player_rect, dx, dy, scroll_px):
+    """
+    Grid lookup for the custom platform the player could land on this
+    frame. `dx`/`dy` is the player's frame displacement and `scroll_px`
+    the platform scroll that was applied this frame. Returns the live
+    platform dict (still static, i.e. not falling) or None.
+    """
+    grid = stream["grid"]
+    if grid is None:
+        return None
+
+    live = stream["live_platforms"]
+    sx, sy = stream["scale"]
+
+    def usable(i):
+        p = live[i]
+        return p is not None and p["grid_id"] == i and not p["fall_started"]
+
+    # Player position relative to where the platforms started this
+    # frame, in the grid's authored level px
+    cam_prev = stream["camera_x"] - scroll_px
+    i = grid.landing_candidate(
+        (player_rect.centerx + cam_prev) / sx, (dx + scroll_px) / sx,
+        round(player_rect.bottom / sy), round(dy / sy), usable=usable,
+    )
+    return live[i] if i >= 0 else None
+
+
+def stream_telemetry(stream):
+    """
+    One short line for the debug overlay.
+    """
+    return (
+        f"stream chunk {stream['next_chunk']:3d}/{len(stream['chunks']):3d}  "
+        f"camera {int(stream['camera_x']):6d}"
+    )
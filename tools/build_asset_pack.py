@@ -0,0 +1,69 @@
+import os
+import sys
+import json
+import hashlib
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from asset_pack import PACK_MAGIC, PACK_VERSION, PACK_HEADER
+
+
+# Extensions packed, and the ones whose dimensions go into the index
+PACK_EXTENSIONS = (".png", ".jpg", ".bmp", ".svg", ".wav", ".ogg")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".bmp", ".svg")
+
+
+def collect(root):
+    """Relative member names under `root`, sorted so packs are reproducible."""
+    names = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for fname in sorted(filenames):
+            if fname.lower().endswith(PACK_EXTENSIONS):
+                rel = os.path.relpath(os.path.join(dirpath, fname), root)
+                names.append(rel.replace(os.sep, "/"))
+    return names
+
+
+def image_size(path):
+    try:
+        return pygame.image.load(path).get_size()
+    except pygame.error:
+        return 0, 0
+
+
+def build(root, out_path):
+    blobs = []
+    index = {}
+    offset = 0  # relative to the end of the index
+    for name in collect(root):
+        path = os.path.join(root, name)
+        with open(path, "rb") as f:
+            data = f.read()
+        ext = os.path.splitext(name)[1].lower()
+        w, h = image_size(path) if ext in IMAGE_EXTENSIONS else (0, 0)
+        index[name] = [offset, len(data), w, h, ext[1:], hashlib.sha1(data).hexdigest()]
+        blobs.append(data)
+        offset += len(data)
+    index_bytes = json.dumps(index, separators=(",", ":")).encode("utf-8")
+
+    tmp = out_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(index_bytes)))
+        f.write(index_bytes)
+        for data in blobs:
+            f.write(data)
+    os.replace(tmp, out_path)
+    return len(index), PACK_HEADER.size + len(index_bytes) + offset
+
+
+def main():
+    count, size = build(config.ASSETS_DIR, config.ASSET_PACK_FILE)
+    print(f"Packed {count} files ({size / (1024 * 1024):.1f} MB) into {config.ASSET_PACK_FILE}")
+
+
+if __name__ == "__main__":
+    main()
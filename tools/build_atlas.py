@@ -0,0 +1,155 @@
+"""
+Pack skins, sprites, enemies and platform tiles into one atlas page per
+scale tier (see atlas.py for the runtime side).
+
+Run from the project root:
+    python tools/build_atlas.py [--force]
+
+The frames a tier needs are exactly the images the game's loaders ask
+for at that tier's scale factor: the loaders are run with a recording
+loader, then every request is decoded and scaled the way
+AssetManager.image() would (asset_manager.decode_scaled) and shelf-packed
+with 1px of transparent padding. A tier whose sources did not change is
+left alone unless --force is given.
+"""
+
+import os
+import sys
+import json
+import hashlib
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+import resources
+from asset_manager import decode_scaled, rgba_copy
+from asset_pack import asset_digest
+from atlas import tier_name, frame_key, file_stamp, file_sha1
+
+
+PADDING = 1
+MAX_PAGE_WIDTH = 4096
+
+
+class _RecordingLoader:
+    """Loader for the resources.* loaders: records requests, decodes nothing."""
+
+    def __init__(self):
+        self.requests = []
+
+    def image(self, path, scale=1.0, size=None, smooth=False):
+        request = (path, scale, tuple(size) if size is not None else None, smooth)
+        if request not in self.requests:
+            self.requests.append(request)
+        return None
+
+
+def scale_tiers():
+    return sorted({resources.compute_scale_factor(res) for res in config.SUPPORTED_RESOLUTIONS})
+
+
+def tier_requests(scale):
+    """(path, scale, size, smooth) for every image the atlas serves at `scale`."""
+    base = config.ASSETS_DIR
+    loader = _RecordingLoader()
+    for skin_dir in sorted(set(resources._skin_dirs(base).values())):
+        resources._load_skin(skin_dir, scale, loader=loader)
+    resources._load_sprites(base, scale, loader=loader)
+    resources._load_enemies(base, scale, loader=loader)
+    resources._load_platforms(base, scale, loader=loader)
+    return loader.requests
+
+
+def shelf_pack(sizes, width):
+    """Positions for `sizes` (tallest first, left to right) and the page height."""
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    positions = [None] * len(sizes)
+    x = y = shelf_h = 0
+    for i in order:
+        w, h = sizes[i]
+        if x + w > width:
+            x, y, shelf_h = 0, y + shelf_h + PADDING, 0
+        positions[i] = (x, y)
+        x += w + PADDING
+        shelf_h = max(shelf_h, h)
+    return positions, y + shelf_h
+
+
+def best_layout(sizes):
+    """Smallest-area (width, height, positions) over power-of-two widths."""
+    widest = max(w for w, _ in sizes)
+    best = None
+    width = 256
+    while width <= MAX_PAGE_WIDTH:
+        if width >= widest:
+            positions, height = shelf_pack(sizes, width)
+            if best is None or width * height < best[0] * best[1]:
+                best = (width, height, positions)
+        width *= 2
+    if best is None:
+        raise ValueError(f"a frame is wider than {MAX_PAGE_WIDTH}px")
+    return best
+
+
+def build_tier(scale, force=False):
+    """Write atlas/atlas_<scale>.png/.json; returns (frame count, page size) or None if current."""
+    requests = tier_requests(scale)
+    sources = {}
+    for path, _, _, _ in requests:
+        if path not in sources:
+            sources[path] = asset_digest(path) or file_sha1(path)
+
+    stem = os.path.join(config.ATLAS_DIR, tier_name(scale))
+    stamp = hashlib.sha1(json.dumps(
+        [[os.path.relpath(p, config.ASSETS_DIR), s, z, sm, sources[p]] for p, s, z, sm in requests]
+    ).encode("utf-8")).hexdigest()
+    if not force and os.path.exists(stem + ".png"):
+        try:
+            with open(stem + ".json", "r", encoding="utf-8") as f:
+                if json.load(f).get("stamp") == stamp:
+                    return None
+        except (OSError, ValueError):
+            pass
+
+    frames = [rgba_copy(decode_scaled(path, s, size, smooth)) for path, s, size, smooth in requests]
+    width, height, positions = best_layout([f.get_size() for f in frames])
+
+    page = pygame.Surface((width, height), pygame.SRCALPHA, 32)
+    page.fill((0, 0, 0, 0))
+    manifest = {"scale": scale, "size": [width, height], "stamp": stamp, "frames": {}}
+    for (path, s, size, smooth), img, pos in zip(requests, frames, positions):
+        # MAX over a cleared page copies RGBA exactly (a plain blit would blend)
+        page.blit(img, pos, special_flags=pygame.BLEND_RGBA_MAX)
+        rel = os.path.relpath(path, config.ASSETS_DIR).replace(os.sep, "/")
+        trim = img.get_bounding_rect()
+        manifest["frames"][frame_key(rel, s, size, smooth)] = {
+            "rect": [pos[0], pos[1], img.get_width(), img.get_height()],
+            "trim": [trim.x, trim.y, trim.w, trim.h],
+            "sha1": sources[path],
+            "stamp": file_stamp(path),
+        }
+
+    os.makedirs(config.ATLAS_DIR, exist_ok=True)
+    pygame.image.save(page, stem + ".tmp.png")
+    os.replace(stem + ".tmp.png", stem + ".png")
+    with open(stem + ".json.tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(stem + ".json.tmp", stem + ".json")
+    return len(frames), (width, height)
+
+
+def main():
+    force = "--force" in sys.argv[1:]
+    for scale in scale_tiers():
+        result = build_tier(scale, force)
+        if result is None:
+            print(f"[atlas] {tier_name(scale)} up to date")
+            continue
+        count, (w, h) = result
+        print(f"[atlas] {tier_name(scale)}: {count} frames on a {w}x{h} page")
+
+
+if __name__ == "__main__":
+    main()
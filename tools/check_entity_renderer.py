@@ -0,0 +1,49 @@
+"""
+Check that EntityRenderer does not keep drawn surfaces alive.
+
+Run from the project root:
+    python tools/check_entity_renderer.py
+
+Plain surfaces and atlas-style subsurfaces are queued and flushed,
+then every local reference is dropped; each one must be garbage
+collected and leave the renderer's caches. Exit status 1 otherwise.
+"""
+
+import gc
+import os
+import sys
+import weakref
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from entity_renderer import EntityRenderer
+
+COUNT = 200
+
+
+def main():
+    target = pygame.Surface((640, 360))
+    renderer = EntityRenderer()
+    renderer.begin(target.get_rect())
+
+    page = pygame.Surface((COUNT * 4, 4))
+    surfaces = [pygame.Surface((4, 4)) for _ in range(COUNT)]
+    surfaces += [page.subsurface((i * 4, 0, 4, 4)) for i in range(COUNT)]
+    for n, surf in enumerate(surfaces):
+        renderer.add("test", surf, pygame.Rect(n % 600, 10, 4, 4))
+    renderer.flush(target)
+
+    refs = [weakref.ref(surf) for surf in surfaces]
+    del surf, surfaces, page
+    gc.collect()
+
+    alive = sum(1 for ref in refs if ref() is not None)
+    cached = len(renderer._areas) + sum(len(slots) for slots in renderer._queues.values())
+    print(f"[renderer] {alive}/{len(refs)} surfaces still alive, {cached} cache entries")
+    return 1 if alive or cached else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+Check that level streaming brings every authored enemy on screen.
+
+Run from the project root:
+    python tools/check_level_stream.py [level ...]
+
+Each custom level (default: all of levels/custom/) is streamed at
+1920x1080 with the game's own build_level_stream / stream_update /
+update_enemies, scrolling at GAME_SPEED_BASE, until the camera has
+passed the last chunk. An enemy that is activated and then culled
+without ever overlapping the viewport is reported.
+
+Each level is also streamed a second time with a resolution change to
+960x540 halfway through (world.remap_state): everything activated after
+it must spawn at half the position and size of the first run, and the
+level grid must still find each new platform under a player standing
+on it. The exit status is 1 if any level fails either check.
+"""
+
+import os
+import sys
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from pygame import Rect
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from editor import editor_load_level
+from pools import make_entity_pools
+from levelgrid import LevelGrid
+from streaming import build_level_stream, stream_update, stream_grid_platform
+from world import reset_state, remap_state, update_enemies
+
+SCREEN_W, SCREEN_H = 1920, 1080
+DT = 1.0 / config.FPS
+
+
+def check_level(level):
+    """(activated, reached the viewport) enemy counts for one custom level."""
+    data = editor_load_level(level)
+    kinds = {e.get("kind", "walker") for e in data.get("enemies", [])}
+    stream = build_level_stream(data, (32, 32), {kind: (48, 48) for kind in kinds})
+    pools = make_entity_pools()
+    wstate = {"pools": pools, "platforms": [], "coins": [], "enemies": []}
+
+    viewport = Rect(0, 0, SCREEN_W, SCREEN_H)
+    player = Rect(int(SCREEN_W * 0.15), SCREEN_H // 2, 80, 80)
+    scroll = int(config.GAME_SPEED_BASE * DT)
+    end = (stream["chunks"][-1][0] + 2 * stream["chunk_w"]) if stream["chunks"] else 0
+
+    activated = reached = 0
+    pending = set()
+    while stream["camera_x"] < end:
+        before = {id(e) for e in wstate["enemies"]}
+        stream_update(stream, wstate, SCREEN_W, scroll)
+        for e in wstate["enemies"]:
+            if id(e) not in before:
+                activated += 1
+                pending.add(id(e))
+
+        wstate["enemies"] = update_enemies(
+            wstate["enemies"], DT, config.GAME_SPEED_BASE, 1.0, player, SCREEN_W, SCREEN_H,
+            pool=pools["enemy"],
+        )
+        live = set()
+        for e in wstate["enemies"]:
+            live.add(id(e))
+            if id(e) in pending and viewport.colliderect(e["rect"]):
+                pending.discard(id(e))
+                reached += 1
+        # Culled before ever being seen
+        pending &= live
+
+    return activated, reached
+
+
+def _stream_state(level, pools):
+    data = editor_load_level(level)
+    kinds = {e.get("kind", "walker") for e in data.get("enemies", [])}
+    wstate = reset_state(Rect(0, 0, 80, 80), 80, 3, pools=pools)
+    wstate["level_stream"] = build_level_stream(
+        data, (32, 32), {kind: (48, 48) for kind in kinds}, grid=LevelGrid.from_level(data)
+    )
+    return wstate
+
+
+def check_remap(level):
+    """Problems found streaming `level` across a halfway 2x downscale (empty if none)."""
+    full = _stream_state(level, make_entity_pools())
+    half = _stream_state(level, make_entity_pools())
+    stream = full["level_stream"]
+    end = (stream["chunks"][-1][0] + 2 * stream["chunk_w"]) if stream["chunks"] else 0
+    switch = (end // 4) * 2   # even, so the halved camera stays exact
+
+    # The lookahead is in screen px, so it would let the half-size run
+    # activate entities earlier; without it both runs go in lockstep
+    lookahead = config.LEVEL_STREAM_LOOKAHEAD
+    config.LEVEL_STREAM_LOOKAHEAD = 0
+    try:
+        return _compare_remap(full, half, end, switch)
+    finally:
+        config.LEVEL_STREAM_LOOKAHEAD = lookahead
+
+
+def _compare_remap(full, half, end, switch):
+    stream = full["level_stream"]
+    problems = []
+    scale = 1
+    while stream["camera_x"] < end:
+        if scale == 1 and stream["camera_x"] >= switch:
+            remap_state(half, 0.5, 0.5)
+            scale = 2
+        counts = {key: len(half[key]) for key in ("platforms", "coins", "enemies")}
+        stream_update(stream, full, SCREEN_W, 8)
+        stream_update(half["level_stream"], half, SCREEN_W // scale, 8 // scale)
+        if scale == 1:
+            continue
+
+        for key in counts:
+            a_list, b_list = full[key], half[key]
+            if len(a_list) != len(b_list):
+                problems.append(f"{key}: {len(b_list)} live after remap, expected {len(a_list)}")
+                return problems
+            for a, b in zip(a_list[counts[key]:], b_list[counts[key]:]):
+                a = a if isinstance(a, Rect) else a["rect"]
+                b = b if isinstance(b, Rect) else b["rect"]
+                if any(abs(av / 2 - bv) > 1 for av, bv in zip(
+                    (a.centerx, a.centery, a.w, a.h), (b.centerx, b.centery, b.w, b.h)
+                )):
+                    problems.append(f"{key}: spawned at {tuple(b)}, expected about half of {tuple(a)}")
+
+        for p in half["platforms"][counts["platforms"]:]:
+            r = p["rect"]
+            feet = Rect(0, 0, 40, 40)
+            feet.midbottom = r.midtop
+            found = stream_grid_platform(half["level_stream"], feet, 0, 0, 4)
+            if found is None or found["rect"].top != r.top:
+                problems.append(f"grid missed platform at {tuple(r)}")
+    return problems
+
+
+def main():
+    if sys.argv[1:]:
+        levels = [int(arg) for arg in sys.argv[1:]]
+    else:
+        custom = os.path.join("levels", "custom")
+        levels = sorted(
+            int(name[6:-5]) for name in os.listdir(custom)
+            if name.startswith("level_") and name.endswith(".json")
+        )
+
+    failed = 0
+    for level in levels:
+        authored = len(editor_load_level(level).get("enemies", []))
+        activated, reached = check_level(level)
+        problems = check_remap(level)
+        if reached < authored or problems:
+            failed += 1
+        if reached < authored:
+            print(f"[stream] level {level:02d}: {reached}/{authored} enemies reached the screen "
+                  f"({activated} activated)")
+        for problem in problems[:3]:
+            print(f"[stream] level {level:02d} after remap: {problem}")
+    print(f"[stream] {len(levels) - failed}/{len(levels)} levels show every enemy and survive a remap")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,14 +8,52 @@
 # - Text wrapping
 # - Skin preview box
 # - Generic toggles / cycle selectors
+# - Debug overlay
+# - Loading screen
+# - Widget log (what menu_redraw.py diffs for dirty rects)
 # ============================================================
 
 import pygame
 import time
 import math
+from collections import OrderedDict
 from pygame import Rect
 
+import config
 from config import WHITE, BLACK
+from asset_memory import registry
+
+
+# ------------------------------------------------------------
+# Widget log
+# ------------------------------------------------------------
+
+# While a list is set, buttons / selectors / toggles append
+# (rect, signature) to it; the signature changes whenever the widget
+# would look different.
+_widget_log = None
+
+
+def start_widget_log():
+    global _widget_log
+    _widget_log = []
+
+
+def stop_widget_log():
+    """Stop logging; returns the widgets drawn since start_widget_log()."""
+    global _widget_log
+    log, _widget_log = _widget_log or [], None
+    return log
+
+
+def _log_widget(rect, *signature):
+    if _widget_log is not None:
+        _widget_log.append((Rect(rect), signature))
+
+
+def pulse_step(t=None):
+    """Focused-button pulse frame: time quantized to MENU_PULSE_STEPS per second."""
+    return int((time.time() if t is None else t) * config.MENU_PULSE_STEPS)
 
 
 # ------------------------------------------------------------
@@ -104,10 +142,11 @@ def draw_button(surface, rect, text, font, primary=False, hovered=False, focused
                 min(255, base[2] + 25),
             )
 
+    step = None
     if focused and not disabled:
         # Soft pulse animation for focused buttons
-        t = time.time()
-        pulse = 0.5 + 0.5 * math.sin(t * 4.0)
+        step = pulse_step()
+        pulse = 0.5 + 0.5 * math.sin(step / config.MENU_PULSE_STEPS * 4.0)
         border = (
             min(255, int(200 + 55 * pulse)),
             min(255, int(200 + 55 * pulse)),
@@ -120,6 +159,7 @@ def draw_button(surface, rect, text, font, primary=False, hovered=False, focused
     if text:
         txt = font.render(text, True, text_c)
         surface.blit(txt, txt.get_rect(center=rect.center))
+    _log_widget(rect, "button", text, primary, hovered, disabled, step)
 
 
 def draw_panel(surface, rect, ui_scale, title=None, fonts=None):
@@ -184,10 +224,45 @@ def wrap_text(surface, text, font, color, x, y, max_width, line_spacing=0):
 # Skin preview
 # ------------------------------------------------------------
 
-def draw_skin_preview(surface, card_rect, skin_assets, ui_scale):
+# Scaled preview surfaces, LRU: (cache_key, card size) -> Surface
+_preview_cache = OrderedDict()
+
+
+def clear_preview_cache():
+    """Drop cached previews (skin frames were reloaded, or over budget)."""
+    _preview_cache.clear()
+
+
+registry.set_evictor("previews", clear_preview_cache)
+
+
+def _blit_preview(surface, card_rect, preview, ui_scale):
+    dest = preview.get_rect(center=(card_rect.centerx, card_rect.centery + int(10 * ui_scale)))
+    surface.blit(preview, dest)
+
+
+def draw_cached_skin_preview(surface, card_rect, ui_scale, cache_key):
+    """
+    Draws the preview cached for `cache_key` at this card size.
+    Returns False (drawing nothing) if there is none, so the caller
+    only fetches the skin's frames on a miss.
+    """
+    key = (cache_key, card_rect.size)
+    preview = _preview_cache.get(key)
+    if preview is None:
+        return False
+    _preview_cache.move_to_end(key)
+    registry.touch((preview,))
+    _blit_preview(surface, card_rect, preview, ui_scale)
+    return True
+
+
+def draw_skin_preview(surface, card_rect, skin_assets, ui_scale, cache_key=None):
     """
     Draws the slime preview using idle / run / jump frames from skin_assets.
     Expects skin_assets = {"idle":[...], "run":[...], "jump":surface or None}
+    With a `cache_key` (the skin name) the scaled preview is kept for
+    draw_cached_skin_preview() while the card size stays the same.
     """
     idle_frames = skin_assets.get("idle") or []
     run_frames = skin_assets.get("run") or []
@@ -209,9 +284,16 @@ def draw_skin_preview(surface, card_rect, skin_assets, ui_scale):
     scale = target_h / float(fh)
     target_w = int(fw * scale)
 
+    if frame.get_colorkey() is not None:
+        # Colorkeyed sprites: filter with real alpha so the key colour
+        # does not bleed into the edges
+        frame = frame.convert_alpha()
     preview = pygame.transform.smoothscale(frame, (target_w, target_h))
-    dest = preview.get_rect(center=(card_rect.centerx, card_rect.centery + int(10 * ui_scale)))
-    surface.blit(preview, dest)
+    if cache_key is not None:
+        _preview_cache[(cache_key, card_rect.size)] = registry.track(preview, "previews")
+        while len(_preview_cache) > config.SKIN_PREVIEW_CACHE_SIZE:
+            _preview_cache.popitem(last=False)
+    _blit_preview(surface, card_rect, preview, ui_scale)
 
 
 # ------------------------------------------------------------
@@ -226,6 +308,7 @@ def draw_cycle_selector(surface, label, value, fonts, x, y, w, h, focused=False)
 
     label_surf = fonts["normal"].render(f"{label}: {value}", True, WHITE)
     surface.blit(label_surf, (x + int(12 * (w / 300)), y + h // 4))
+    _log_widget(box, "cycle", label, value, focused)
 
 
 def draw_toggle_switch(surface, label, enabled, fonts, x, y, w, h, focused=False):
@@ -237,3 +320,57 @@ def draw_toggle_switch(surface, label, enabled, fonts, x, y, w, h, focused=False
     state = "ON" if enabled else "OFF"
     text = fonts["normal"].render(f"{label}: {state}", True, WHITE)
     surface.blit(text, (x + int(12 * (w / 300)), y + h // 4))
+    _log_widget(box, "toggle", label, enabled, focused)
+
+
+# ------------------------------------------------------------
+# Debug overlay (F3)
+# ------------------------------------------------------------
+
+def draw_debug_overlay(surface, lines, font, ui_scale):
+    """
+    Draw a block of monospaced debug lines in the lower-left corner.
+    """
+    if not lines:
+        return
+
+    pad = int(8 * ui_scale)
+    line_h = font.get_linesize()
+    width = max(font.size(line)[0] for line in lines) + pad * 2
+    height = line_h * len(lines) + pad * 2
+
+    box = Rect(pad, surface.get_height() - height - pad, width, height)
+    pygame.draw.rect(surface, (0, 0, 0), box)
+    pygame.draw.rect(surface, (120, 255, 200), box, 1)
+
+    y = box.top + pad
+    for line in lines:
+        surf = font.render(line, True, (200, 255, 200))
+        surface.blit(surf, (box.left + pad, y))
+        y += line_h
+
+
+# ------------------------------------------------------------
+# Loading screen
+# ------------------------------------------------------------
+
+def draw_loading_screen(surface, progress, fonts, ui_scale):
+    """
+    Title, "Loading..." and a progress bar (progress in 0..1).
+    """
+    sw, sh = surface.get_size()
+    surface.fill(BLACK)
+
+    title = fonts["title"].render("Slimey", True, WHITE)
+    surface.blit(title, title.get_rect(center=(sw // 2, int(sh * 0.4))))
+
+    bar_w = int(sw * 0.4)
+    bar_h = max(6, int(14 * ui_scale))
+    bar = Rect(sw // 2 - bar_w // 2, int(sh * 0.55), bar_w, bar_h)
+    fill = bar.copy()
+    fill.width = int(bar_w * max(0.0, min(1.0, progress)))
+    pygame.draw.rect(surface, (120, 255, 200), fill)
+    pygame.draw.rect(surface, WHITE, bar, max(1, int(2 * ui_scale)))
+
+    label = fonts["small"].render(f"Loading... {int(progress * 100):3d}%", True, WHITE)
+    surface.blit(label, label.get_rect(center=(sw // 2, bar.bottom + int(24 * ui_scale))))
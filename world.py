@@ -10,16 +10,24 @@ from config import (
     LEVELUP_PARTICLE_BASE_COUNT,
     COIN_PICKUP_PARTICLE_BASE_COUNT,
 )
+from pools import make_entity_pools, swap_remove
 
 
 # ============================================================
 #  CORE RUN STATE
 # ============================================================
 
-def reset_state(player_rect, player_height, max_health):
+def reset_state(player_rect, player_height, max_health, pools=None, previous=None):
     """
     Create the initial per-run state dictionary.
+    Pass the shared entity pools (and the state being replaced, if any)
+    so the previous run's entities are recycled instead of dropped.
     """
+    if pools is None:
+        pools = make_entity_pools()
+    if previous is not None:
+        release_state_entities(previous)
+
     return {
         # Player physics
         "player_vel_y": 0.0,
@@ -35,6 +43,8 @@ def reset_state(player_rect, player_height, max_health):
         "dust_particles": [],
         "spark_particles": [],
         "special_items": [],
+        "pools": pools,
+        "level_stream": None,   # custom level chunks, see streaming.py
 
         # Spawners: timestamps in ms
         "last_tree_spawn": 0,
@@ -73,6 +83,9 @@ def reset_state(player_rect, player_height, max_health):
         "dash_cooldown": 0.0,
         "dash_dir": 1,
 
+        # Player facing (1 right, -1 left)
+        "facing": 1,
+
         # Camera shake
         "shake_timer": 0.0,
 
@@ -88,11 +101,70 @@ def reset_state(player_rect, player_height, max_health):
     }
 
 
+def release_state_entities(wstate):
+    """
+    Hand every live entity of a run state back to its pool.
+    """
+    pools = wstate.get("pools")
+    if not pools:
+        return
+    pools["tree"].release_all(wstate.get("trees", []))
+    pools["coin"].release_all(wstate.get("coins", []))
+    pools["platform"].release_all(wstate.get("platforms", []))
+    pools["enemy"].release_all(wstate.get("enemies", []))
+    pools["particle"].release_all(wstate.get("dust_particles", []))
+    pools["particle"].release_all(wstate.get("spark_particles", []))
+
+
+def _scale_rect(r, sx, sy):
+    r.update(round(r.x * sx), round(r.y * sy), max(1, round(r.w * sx)), max(1, round(r.h * sy)))
+
+
+def _scale_size(size, sx, sy):
+    return max(1, round(size[0] * sx)), max(1, round(size[1] * sy))
+
+
+def remap_state(wstate, sx, sy):
+    """
+    Rescale every live entity of a run state in place after the screen
+    size changed by (sx, sy), so the run continues at the new resolution.
+    """
+    for r in wstate["trees"]:
+        _scale_rect(r, sx, sy)
+    for r in wstate["coins"]:
+        _scale_rect(r, sx, sy)
+    for p in wstate["platforms"]:
+        _scale_rect(p["rect"], sx, sy)
+    for e in wstate["enemies"]:
+        _scale_rect(e["rect"], sx, sy)
+        e["base_y"] *= sy
+    for p in wstate["dust_particles"] + wstate["spark_particles"]:
+        p["x"] *= sx
+        p["y"] *= sy
+        p["size"] = max(1, round(p["size"] * sx))
+
+    wstate["player_vel_y"] *= sy
+    wstate["ground_scroll_x"] *= sx
+    wstate["knockback_dx"] *= sx
+
+    # Custom level still streaming in: later chunks (and the level
+    # grid lookups) map authored px through the stream's scale
+    stream = wstate.get("level_stream")
+    if stream is not None:
+        stream["camera_x"] = round(stream["camera_x"] * sx)
+        stream["scale"][0] *= sx
+        stream["scale"][1] *= sy
+        stream["coin_size"] = _scale_size(stream["coin_size"], sx, sy)
+        stream["enemy_sizes"] = {
+            kind: _scale_size(size, sx, sy) for kind, size in stream["enemy_sizes"].items()
+        }
+
+
 # ============================================================
 #  SIMPLE SPAWN HELPERS: TREES / COINS / PLATFORMS
 # ============================================================
 
-def spawn_tree(tree_img, screen_w, screen_h, scale_factor):
+def spawn_tree(tree_img, screen_w, screen_h, scale_factor, pool=None):
     """
     Spawn a tree at ground level off the right side of the screen.
     """
@@ -104,10 +176,10 @@ def spawn_tree(tree_img, screen_w, screen_h, scale_factor):
 
     x = screen_w + random.randint(int(10 * scale_factor), int(120 * scale_factor))
     y = screen_h - h
-    return pygame.Rect(x, y, w, h)
+    return _acquire_rect(pool, x, y, w, h)
 
 
-def spawn_coin(screen_w, screen_h, coin_img, scale_factor, platform_rect=None):
+def spawn_coin(screen_w, screen_h, coin_img, scale_factor, platform_rect=None, pool=None):
     """
     Spawn a coin either above a platform or in midair.
     """
@@ -124,10 +196,10 @@ def spawn_coin(screen_w, screen_h, coin_img, scale_factor, platform_rect=None):
         x = screen_w + random.randint(int(40 * scale_factor), int(140 * scale_factor))
         y = random.randint(int(screen_h * 0.25), int(screen_h * 0.65))
 
-    return pygame.Rect(x, y, w, h)
+    return _acquire_rect(pool, x, y, w, h)
 
 
-def spawn_platform(screen_w, screen_h, scale_factor):
+def spawn_platform(screen_w, screen_h, scale_factor, pool=None):
     """
     Spawn a moving/static platform with a random type/height.
     Returns a dict describing the platform.
@@ -158,33 +230,90 @@ def spawn_platform(screen_w, screen_h, scale_factor):
     if ptype in ("normal", "bounce") and random.random() < 0.25:
         vx = random.choice([-1, 1]) * random.uniform(40.0, 80.0)
 
-    return {
-        "rect": pygame.Rect(x, y, width, height),
-        "type": ptype,
-        "vx": vx,
-        "vy": 0.0,
-        "fall_started": False,
-        "fall_timer": 0.0,
-        "fragile_hits": 0,
-        "depth": random.uniform(0.9, 1.1),
-    }
+    return make_platform(x, y, width, height, ptype, vx=vx, pool=pool)
+
+
+def make_platform(x, y, w, h, ptype, vx=0.0, pool=None):
+    """
+    Build (or recycle from `pool`) a platform dict with fresh state.
+    """
+    if pool is None:
+        return {
+            "rect": pygame.Rect(x, y, w, h),
+            "type": ptype,
+            "vx": vx,
+            "vy": 0.0,
+            "fall_started": False,
+            "fall_timer": 0.0,
+            "fragile_hits": 0,
+            "depth": random.uniform(0.9, 1.1),
+            "grid_id": -1,
+        }
+
+    p = pool.acquire()
+    p["rect"].update(x, y, w, h)
+    p["type"] = ptype
+    p["vx"] = vx
+    p["vy"] = 0.0
+    p["fall_started"] = False
+    p["fall_timer"] = 0.0
+    p["fragile_hits"] = 0
+    p["depth"] = random.uniform(0.9, 1.1)
+    p["grid_id"] = -1
+    return p
+
+
+def _acquire_rect(pool, x, y, w, h):
+    if pool is None:
+        return pygame.Rect(x, y, w, h)
+    r = pool.acquire()
+    r.update(x, y, w, h)
+    return r
 
 
 # ============================================================
 #  ENEMY SPAWNING
 # ============================================================
 
-def _make_enemy_rect(kind, enemy_sprites, scale_factor):
+def _enemy_size(kind, enemy_sprites, scale_factor):
     img = enemy_sprites.get(kind)
     if img is not None:
-        w, h = img.get_size()
-    else:
-        size = int(48 * scale_factor)
-        w = h = size
-    return pygame.Rect(0, 0, w, h)
+        return img.get_size()
+    size = int(48 * scale_factor)
+    return size, size
 
 
-def spawn_platform_enemy(plat_rect, enemy_sprite, scale_factor, kind="walker"):
+def make_enemy(kind, w, h, vx, state, pool=None):
+    """
+    Build (or recycle from `pool`) an enemy dict with a w x h rect at
+    the origin. Callers position the rect, then set base_y.
+    """
+    if pool is None:
+        return {
+            "kind": kind,
+            "rect": pygame.Rect(0, 0, w, h),
+            "vx": vx,
+            "vy": 0.0,
+            "t": 0.0,
+            "state": state,
+            "base_y": 0.0,
+        }
+
+    e = pool.acquire()
+    e["kind"] = kind
+    e["rect"].update(0, 0, w, h)
+    e["vx"] = vx
+    e["vy"] = 0.0
+    e["t"] = 0.0
+    e["state"] = state
+    e["base_y"] = 0.0
+    e["remove"] = False
+    # Behaviour-specific keys from a previous life must not leak over
+    e.pop("jump_cooldown", None)
+    return e
+
+
+def spawn_platform_enemy(plat_rect, enemy_sprite, scale_factor, kind="walker", pool=None):
     """
     Spawn a platform enemy of 'kind' standing on a platform rect.
     NOTE: slime_platformer passes enemy_sprites[kind] here as enemy_sprite.
@@ -198,21 +327,14 @@ def spawn_platform_enemy(plat_rect, enemy_sprite, scale_factor, kind="walker"):
         size = int(48 * scale_factor)
         w = h = size
 
-    r = pygame.Rect(0, 0, w, h)
+    e = make_enemy(kind, w, h, 0.0, "idle", pool)
+    r = e["rect"]
     r.midbottom = (plat_rect.centerx, plat_rect.top)
-
-    return {
-        "kind": kind,
-        "rect": r,
-        "vx": 0.0,
-        "vy": 0.0,
-        "t": 0.0,
-        "state": "idle",
-        "base_y": float(r.centery),
-    }
+    e["base_y"] = float(r.centery)
+    return e
 
 
-def spawn_air_enemy(kind, enemy_sprites, screen_w, screen_h, speed_mult, scale_factor):
+def spawn_air_enemy(kind, enemy_sprites, screen_w, screen_h, speed_mult, scale_factor, pool=None):
     """
     Spawn an air enemy (flyer).
     """
@@ -220,24 +342,18 @@ def spawn_air_enemy(kind, enemy_sprites, screen_w, screen_h, speed_mult, scale_f
     if cfg is None:
         return None
 
-    r = _make_enemy_rect(kind, enemy_sprites, scale_factor)
-    r.x = screen_w + random.randint(int(20 * scale_factor), int(120 * scale_factor))
-    r.y = random.randint(int(screen_h * 0.2), int(screen_h * 0.6))
-
     speed = cfg.get("speed", 160.0) * speed_mult
 
-    return {
-        "kind": kind,
-        "rect": r,
-        "vx": -speed,
-        "vy": 0.0,
-        "t": 0.0,
-        "state": "fly",
-        "base_y": float(r.centery),
-    }
+    w, h = _enemy_size(kind, enemy_sprites, scale_factor)
+    e = make_enemy(kind, w, h, -speed, "fly", pool)
+    r = e["rect"]
+    r.x = screen_w + random.randint(int(20 * scale_factor), int(120 * scale_factor))
+    r.y = random.randint(int(screen_h * 0.2), int(screen_h * 0.6))
+    e["base_y"] = float(r.centery)
+    return e
 
 
-def spawn_ground_enemy(kind, enemy_sprites, screen_w, screen_h, scale_factor):
+def spawn_ground_enemy(kind, enemy_sprites, screen_w, screen_h, scale_factor, pool=None):
     """
     Spawn a ground enemy
     """
@@ -245,76 +361,86 @@ def spawn_ground_enemy(kind, enemy_sprites, screen_w, screen_h, scale_factor):
     if cfg is None:
         return None
 
-    r = _make_enemy_rect(kind, enemy_sprites, scale_factor)
-    r.y = screen_h - r.height
-    r.x = screen_w + random.randint(int(30 * scale_factor), int(160 * scale_factor))
-
     speed = cfg.get("speed", 140.0)
 
-    return {
-        "kind": kind,
-        "rect": r,
-        "vx": -speed,
-        "vy": 0.0,
-        "t": 0.0,
-        "state": "run",
-        "base_y": float(r.centery),
-        "jump_cooldown": 0.0,
-    }
+    w, h = _enemy_size(kind, enemy_sprites, scale_factor)
+    e = make_enemy(kind, w, h, -speed, "run", pool)
+    r = e["rect"]
+    r.y = screen_h - r.height
+    r.x = screen_w + random.randint(int(30 * scale_factor), int(160 * scale_factor))
+    e["base_y"] = float(r.centery)
+    e["jump_cooldown"] = 0.0
+    return e
 
 
 # ============================================================
 #  PARTICLES
 # ============================================================
 
-def spawn_dust_particles(x, y, scale_factor, density="medium"):
-    base_count = {"low": 6, "medium": 10, "high": 16}.get(density, 10)
-    parts = []
-    for _ in range(base_count):
-        angle = random.uniform(-math.pi, 0)
-        speed = random.uniform(60, 160) * scale_factor
-        vx = math.cos(angle) * speed
-        vy = math.sin(angle) * speed * 0.4
-        size = random.randint(int(4 * scale_factor), int(8 * scale_factor))
-        parts.append({
+def _emit_particle(out, pool, x, y, vx, vy, size, color, max_life):
+    if pool is None:
+        out.append({
             "x": float(x),
             "y": float(y),
             "vx": vx,
             "vy": vy,
             "size": size,
-            "color": (200, 200, 200),
+            "color": color,
             "life": 0.0,
-            "max_life": random.uniform(0.35, 0.6),
+            "max_life": max_life,
         })
+        return
+
+    p = pool.acquire()
+    p["x"] = float(x)
+    p["y"] = float(y)
+    p["vx"] = vx
+    p["vy"] = vy
+    p["size"] = size
+    p["color"] = color
+    p["life"] = 0.0
+    p["max_life"] = max_life
+    out.append(p)
+
+
+DUST_COLOR = (200, 200, 200)
+SPARK_COLOR = (255, 230, 120)
+
+
+def spawn_dust_particles(x, y, scale_factor, density="medium", pool=None, out=None):
+    """
+    Emit a dust puff. Appends to `out` when given (the live particle
+    list) so no temporary list is built; returns the list either way.
+    """
+    base_count = {"low": 6, "medium": 10, "high": 16}.get(density, 10)
+    parts = out if out is not None else []
+    for _ in range(base_count):
+        angle = random.uniform(-math.pi, 0)
+        speed = random.uniform(60, 160) * scale_factor
+        vx = math.cos(angle) * speed
+        vy = math.sin(angle) * speed * 0.4
+        size = random.randint(int(4 * scale_factor), int(8 * scale_factor))
+        _emit_particle(parts, pool, x, y, vx, vy, size, DUST_COLOR, random.uniform(0.35, 0.6))
     return parts
 
 
-def spawn_spark_burst(x, y, scale_factor, density="medium", base_count=None):
+def spawn_spark_burst(x, y, scale_factor, density="medium", base_count=None, pool=None, out=None):
     mult = {"low": 0.7, "medium": 1.0, "high": 1.4}.get(density, 1.0)
     if base_count is None:
         base_count = COIN_PICKUP_PARTICLE_BASE_COUNT
     count = max(4, int(base_count * mult))
-    parts = []
+    parts = out if out is not None else []
     for _ in range(count):
         angle = random.uniform(0, 2 * math.pi)
         speed = random.uniform(140, 260) * scale_factor
         vx = math.cos(angle) * speed
         vy = math.sin(angle) * speed
         size = random.randint(int(3 * scale_factor), int(6 * scale_factor))
-        parts.append({
-            "x": float(x),
-            "y": float(y),
-            "vx": vx,
-            "vy": vy,
-            "size": size,
-            "color": (255, 230, 120),
-            "life": 0.0,
-            "max_life": random.uniform(0.4, 0.7),
-        })
+        _emit_particle(parts, pool, x, y, vx, vy, size, SPARK_COLOR, random.uniform(0.4, 0.7))
     return parts
 
 
-def spawn_levelup_burst(x, y, scale_factor, density="medium"):
+def spawn_levelup_burst(x, y, scale_factor, density="medium", pool=None, out=None):
     # Slightly denser burst for level-ups to feel special
     return spawn_spark_burst(
         x,
@@ -322,23 +448,31 @@ def spawn_levelup_burst(x, y, scale_factor, density="medium"):
         scale_factor,
         density=density,
         base_count=LEVELUP_PARTICLE_BASE_COUNT,
+        pool=pool,
+        out=out,
     )
 
 
-def update_particles(particles, dt, gravity, scale_factor):
+def update_particles(particles, dt, gravity, scale_factor, pool=None):
     """
     Integrate particles with simple gravity + fade.
+    Dead particles are swap-removed in place (and returned to `pool`);
+    the same list is returned.
     """
-    new_list = []
-    for p in particles:
+    i = 0
+    while i < len(particles):
+        p = particles[i]
         p["life"] += dt
         if p["life"] >= p["max_life"]:
+            if pool is not None:
+                pool.release(p)
+            swap_remove(particles, i)
             continue
         p["vy"] += gravity * 0.2 * dt
         p["x"] += p["vx"] * dt
         p["y"] += p["vy"] * dt
-        new_list.append(p)
-    return new_list
+        i += 1
+    return particles
 
 
 # ============================================================
@@ -423,14 +557,21 @@ def _update_enemy_behavior(enemy, dt, game_speed, scale_factor, player_rect, scr
         enemy["remove"] = True
 
 
-def update_enemies(enemies, dt, game_speed, scale_factor, player_rect, screen_w, screen_h):
+def update_enemies(enemies, dt, game_speed, scale_factor, player_rect, screen_w, screen_h, pool=None):
     """
     Update all enemies and cull off-screen ones.
+    Culled enemies are swap-removed in place (and returned to `pool`);
+    the same list is returned.
     """
-    updated = []
-    for e in enemies:
+    i = 0
+    while i < len(enemies):
+        e = enemies[i]
         e["remove"] = False
         _update_enemy_behavior(e, dt, game_speed, scale_factor, player_rect, screen_w, screen_h)
-        if not e.get("remove", False):
-            updated.append(e)
-    return updated
+        if e["remove"]:
+            if pool is not None:
+                pool.release(e)
+            swap_remove(enemies, i)
+            continue
+        i += 1
+    return enemies